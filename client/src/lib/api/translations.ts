@@ -24,6 +24,7 @@ export interface TranslationCreatePayload {
 }
 
 export interface TranslationPublishPayload {
+  content_type: string; // e.g., 'api.event'
   object_id: string;
   locale: 'sq' | 'en';
 }
@@ -6,14 +6,24 @@ from .models import (
     MenuCategory, MenuItem, MenuItemVariant, RestaurantSettings,
     # Phase 4 models
     FloorPlan, Table, TableAssignment, CustomerProfile, VIPMembership,
-    Offer, Waitlist, SMSNotification, OTPVerification, ProcessedImage
+    Offer, Waitlist, SMSNotification, ProcessedImage
 )
+from .services.search import search_queryset
+
+
+class SearchDocumentAdminMixin:
+    """Admin search through the indexed search_document (services/search.py)"""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_queryset(queryset, search_term), False
 
 
 # ============ EXISTING MODEL ADMINS ============
 
 @admin.register(Reservation)
-class ReservationAdmin(admin.ModelAdmin):
+class ReservationAdmin(SearchDocumentAdminMixin, admin.ModelAdmin):
     list_display = ['full_name', 'email', 'phone', 'date', 'time', 'party_size', 'status', 'created_at']
     list_filter = ['status', 'date', 'occasion']
     search_fields = ['first_name', 'last_name', 'email', 'phone']
@@ -191,7 +201,7 @@ class TableAssignmentAdmin(admin.ModelAdmin):
 
 
 @admin.register(CustomerProfile)
-class CustomerProfileAdmin(admin.ModelAdmin):
+class CustomerProfileAdmin(SearchDocumentAdminMixin, admin.ModelAdmin):
     list_display = ['email', 'phone', 'first_name', 'last_name', 'tier', 'points', 'lifetime_visits', 'is_vip']
     list_filter = ['tier', 'is_vip', 'is_blacklisted']
     search_fields = ['email', 'phone', 'first_name', 'last_name']
@@ -270,15 +280,6 @@ class SMSNotificationAdmin(admin.ModelAdmin):
     )
 
 
-@admin.register(OTPVerification)
-class OTPVerificationAdmin(admin.ModelAdmin):
-    list_display = ['phone', 'otp_code', 'is_verified', 'attempts', 'expires_at', 'created_at']
-    list_filter = ['is_verified']
-    search_fields = ['phone', 'otp_code']
-    ordering = ['-created_at']
-    readonly_fields = ['created_at']
-
-
 @admin.register(ProcessedImage)
 class ProcessedImageAdmin(admin.ModelAdmin):
     list_display = ['source_type', 'source_id', 'format', 'size', 'width', 'height', 'file_size', 'created_at']
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from .db_routers import connect_celery_routing
+        from .signals import connect_cache_invalidation, connect_slot_inventory
+        from .services.metrics import connect_celery_metrics
+        from .services.search import connect_search_index
+        connect_cache_invalidation()
+        connect_celery_metrics()
+        connect_celery_routing()
+        connect_slot_inventory()
+        connect_search_index()
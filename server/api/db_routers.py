@@ -0,0 +1,159 @@
+# server/api/db_routers.py
+"""
+Read-replica routing.
+
+Reads go to the primary unless the code runs inside read_from_replica()
+(a decorator and context manager for read-only views and reporting tasks).
+Even then the primary is used when:
+
+- the current request or task has already written to the primary,
+- the client wrote recently: ReplicaRoutingMiddleware sets a short-lived
+  cookie after any request that wrote, so a guest sees their reservation
+  right after creating it (read-your-writes),
+- every replica lags more than REPLICA_MAX_LAG_SECONDS behind the primary.
+
+Replicas are the aliases in settings.DATABASE_REPLICAS.
+"""
+
+import logging
+import random
+import time
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'default'
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+_use_replica = ContextVar('use_replica', default=False)
+_pinned = ContextVar('pinned_to_primary', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+# alias -> (checked_at, lag_seconds or None when the replica is unreachable)
+_lag_cache = {}
+
+# task_id -> primary_scope of the running Celery task
+_task_scopes = {}
+
+
+class read_from_replica(ContextDecorator):
+    """Route reads in this block (or decorated function) to a replica"""
+
+    def __enter__(self):
+        self._token = _use_replica.set(True)
+        return self
+
+    def __exit__(self, *exc_info):
+        _use_replica.reset(self._token)
+        return False
+
+
+class primary_scope(ContextDecorator):
+    """
+    Fresh routing state for one request or task. pinned=True sends every
+    read to the primary; wrote() reports whether anything was written.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+
+    def __enter__(self):
+        self._tokens = (_pinned.set(self.pinned), _wrote.set(False))
+        self._watcher = connections[PRIMARY].execute_wrapper(_watch_writes)
+        self._watcher.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._watcher.__exit__(None, None, None)
+        pinned_token, wrote_token = self._tokens
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
+        return False
+
+    def wrote(self):
+        return _wrote.get()
+
+
+def _watch_writes(execute, sql, params, many, context):
+    if not _wrote.get() and sql.lstrip()[:6].upper() in WRITE_STATEMENTS:
+        _wrote.set(True)
+    return execute(sql, params, many, context)
+
+
+def replica_lag(alias):
+    """Seconds the replica is behind the primary (0 on backends without replication)"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def healthy_replicas():
+    now = time.monotonic()
+    healthy = []
+    for alias in settings.DATABASE_REPLICAS:
+        checked_at, lag = _lag_cache.get(alias, (None, None))
+        if checked_at is None or now - checked_at > settings.REPLICA_LAG_CHECK_INTERVAL:
+            try:
+                lag = replica_lag(alias)
+            except DatabaseError as e:
+                logger.warning(f"Replica {alias} unavailable: {e}")
+                lag = None
+            _lag_cache[alias] = (now, lag)
+            if lag is not None and lag > settings.REPLICA_MAX_LAG_SECONDS:
+                logger.warning(f"Replica {alias} is {lag:.1f}s behind, reading from the primary")
+        if lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS:
+            healthy.append(alias)
+    return healthy
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or _pinned.get() or _wrote.get():
+            return PRIMARY
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def _task_prerun(task_id=None, **kwargs):
+    scope = primary_scope()
+    scope.__enter__()
+    _task_scopes[task_id] = scope
+
+
+def _task_postrun(task_id=None, **kwargs):
+    scope = _task_scopes.pop(task_id, None)
+    if scope is not None:
+        scope.__exit__(None, None, None)
+
+
+def connect_celery_routing():
+    """Give every Celery task its own routing state, like a request"""
+    try:
+        from celery.signals import task_postrun, task_prerun
+    except ImportError:  # pragma: no cover - optional dependency
+        return
+    task_prerun.connect(_task_prerun, weak=False, dispatch_uid='api.db_routers.task_prerun')
+    task_postrun.connect(_task_postrun, weak=False, dispatch_uid='api.db_routers.task_postrun')
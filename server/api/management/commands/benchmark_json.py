@@ -0,0 +1,82 @@
+"""
+Management command to benchmark JSON rendering and response compression
+for the largest public payloads (full public menu and events list).
+Run with: python manage.py benchmark_json [--iterations 50] [--locale en]
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Event, MenuCategory
+from api.renderers import ORJSONRenderer, ORJSON_AVAILABLE
+from api.serializers import LocalizedEventSerializer, LocalizedMenuCategorySerializer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def timed(func, iterations):
+    """Median wall time of func() in milliseconds, and its last result"""
+    samples = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks JSON rendering and gzip/brotli compression of public payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--locale', default='sq', choices=['sq', 'en'])
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        request = RequestFactory().get('/api/public/menu/', HTTP_HOST='localhost:8000')
+        context = {'request': request, 'locale': options['locale']}
+
+        payloads = {
+            'public menu': lambda: LocalizedMenuCategorySerializer(
+                MenuCategory.objects.filter(is_active=True).order_by('display_order'),
+                many=True, context=context
+            ).data,
+            'public events': lambda: LocalizedEventSerializer(
+                Event.objects.filter(is_active=True).order_by('display_order', 'start_date'),
+                many=True, context=context
+            ).data,
+        }
+
+        if not ORJSON_AVAILABLE:
+            self.stdout.write(self.style.WARNING('orjson is not installed; ORJSONRenderer falls back to json'))
+        if brotli is None:
+            self.stdout.write(self.style.WARNING('brotli is not installed; skipping brotli'))
+
+        for name, build in payloads.items():
+            serialize_ms, data = timed(build, max(1, iterations // 10))
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name} ({len(data)} objects)'))
+            self.stdout.write(f'  serialize (queries + serializers): {serialize_ms:8.2f} ms')
+
+            stock_ms, stock_bytes = timed(lambda: JSONRenderer().render(data), iterations)
+            fast_ms, fast_bytes = timed(lambda: ORJSONRenderer().render(data), iterations)
+            self.stdout.write(f'  render JSONRenderer:               {stock_ms:8.2f} ms  {len(stock_bytes):>9} bytes')
+            self.stdout.write(
+                f'  render ORJSONRenderer:             {fast_ms:8.2f} ms  {len(fast_bytes):>9} bytes'
+                f'  ({stock_ms / fast_ms if fast_ms else 0:.1f}x)'
+            )
+
+            gzip_ms, gzipped = timed(lambda: compress_string(fast_bytes), iterations)
+            self.stdout.write(f'  gzip:                              {gzip_ms:8.2f} ms  {len(gzipped):>9} bytes')
+            if brotli is not None:
+                br_ms, compressed = timed(lambda: brotli.compress(fast_bytes, quality=5), iterations)
+                self.stdout.write(f'  brotli (q5):                       {br_ms:8.2f} ms  {len(compressed):>9} bytes')
+
+        self.stdout.write(self.style.SUCCESS('\nBenchmark complete'))
@@ -0,0 +1,171 @@
+"""
+Management command to run micro-benchmarks of hot serializers and views and
+store or compare JSON baselines.
+Run with: python manage.py run_benchmarks [--iterations 20] [--save benchmarks/baselines/local.json]
+          python manage.py run_benchmarks --compare benchmarks/baselines/local.json [--tolerance 0.2]
+
+Seed data first (python manage.py seed_benchmark_data) so the numbers mean
+something. Views are called in-process through the test client with the
+public response cache disabled, so each iteration measures the real work.
+"""
+import json
+import platform
+import statistics
+import time
+from datetime import timedelta
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Event, MenuCategory
+from api.renderers import ORJSONRenderer
+from api.serializers import LocalizedEventSerializer, LocalizedMenuCategorySerializer
+from api.services.query_budget import QueryRecorder
+
+STAFF_USERNAME = 'bench-staff'
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks hot serializers and API views; saves or compares JSON baselines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--only', help='Comma-separated benchmark names to run')
+        parser.add_argument('--save', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Compare results with this JSON baseline')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Allowed median slowdown versus the baseline (0.2 = 20%%)'
+        )
+
+    def handle(self, *args, **options):
+        benchmarks = self.get_benchmarks()
+        if options['only']:
+            wanted = set(options['only'].split(','))
+            unknown = wanted - set(benchmarks)
+            if unknown:
+                raise CommandError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+            benchmarks = {name: func for name, func in benchmarks.items() if name in wanted}
+
+        results = {}
+        with override_settings(PUBLIC_CACHE_ENABLED=False, QUERY_BUDGET_ENABLED=False):
+            for name, func in benchmarks.items():
+                results[name] = self.measure(func, options['iterations'])
+                result = results[name]
+                self.stdout.write(
+                    f"  {name:<28} median {result['median_ms']:8.2f} ms  "
+                    f"p95 {result['p95_ms']:8.2f} ms  {result['queries']:>4} queries"
+                )
+
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'iterations': options['iterations'],
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'machine': platform.machine(),
+            },
+            'results': results,
+        }
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {options['save']}"))
+
+        if options['compare']:
+            self.compare(results, options['compare'], options['tolerance'])
+
+    def measure(self, func, iterations):
+        func()  # warm up caches, content types and lazy imports
+        samples = []
+        queries = 0
+        for _ in range(max(1, iterations)):
+            with QueryRecorder() as recorder:
+                start = time.perf_counter()
+                func()
+                samples.append((time.perf_counter() - start) * 1000)
+            queries = recorder.count
+        return {
+            'median_ms': round(statistics.median(samples), 3),
+            'p95_ms': round(percentile(samples, 0.95), 3),
+            'min_ms': round(min(samples), 3),
+            'queries': queries,
+        }
+
+    def compare(self, results, path, tolerance):
+        try:
+            with open(path) as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Could not read baseline {path}: {e}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nCompared with {path}'))
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                self.stdout.write(f'  {name:<28} (no baseline)')
+                continue
+            change = (result['median_ms'] - before['median_ms']) / before['median_ms'] if before['median_ms'] else 0
+            line = (
+                f"  {name:<28} {before['median_ms']:8.2f} -> {result['median_ms']:8.2f} ms ({change:+.0%})  "
+                f"queries {before['queries']} -> {result['queries']}"
+            )
+            if change > tolerance or result['queries'] > before['queries']:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Regressed: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def get_benchmarks(self):
+        request = RequestFactory().get('/api/public/menu/', HTTP_HOST='localhost')
+        context = {'request': request, 'locale': 'en'}
+        renderer = ORJSONRenderer()
+
+        anonymous = APIClient(HTTP_HOST='localhost')
+        staff = APIClient(HTTP_HOST='localhost')
+        staff_user, _ = User.objects.get_or_create(
+            username=STAFF_USERNAME, defaults={'is_staff': True, 'email': f'{STAFF_USERNAME}@example.com'}
+        )
+        staff.force_authenticate(staff_user)
+        tomorrow = (timezone.now().date() + timedelta(days=1)).isoformat()
+
+        def get(client, url, **params):
+            def run():
+                response = client.get(url, params)
+                if response.status_code != 200:
+                    raise CommandError(f'GET {url} returned {response.status_code}')
+            return run
+
+        return {
+            'serialize_public_menu': lambda: renderer.render(LocalizedMenuCategorySerializer(
+                MenuCategory.objects.filter(is_active=True).order_by('display_order'),
+                many=True, context=context
+            ).data),
+            'serialize_public_events': lambda: renderer.render(LocalizedEventSerializer(
+                Event.objects.filter(is_active=True).order_by('display_order', 'start_date'),
+                many=True, context=context
+            ).data),
+            'view_menu_categories_public': get(anonymous, '/api/menu/categories/public/'),
+            'view_menu_items_public': get(anonymous, '/api/menu/items/public/'),
+            'view_home_bundle': get(anonymous, '/api/public/home-bundle/', locale='en'),
+            'view_availability': get(staff, '/api/reservations/availability/', start_date=tomorrow),
+            'view_reservations_page': get(staff, '/api/reservations/', page_size=50),
+            'view_admin_conversations': get(staff, '/api/admin/client-conversations/', page_size=50),
+        }
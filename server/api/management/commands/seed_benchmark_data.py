@@ -0,0 +1,243 @@
+"""
+Management command to seed a large, realistic data set for benchmarks and load tests.
+Run with: python manage.py seed_benchmark_data [--scale 1] [--seed 42] [--flush]
+
+--scale 1 creates roughly 1,000 menu items, 10,000 reservations, 2,000
+customers, 500 client conversations (5,000 messages), 2,000 contact
+messages and English translations for the whole menu. The same --seed
+always produces the same data. Load-test client accounts are named
+bench-client-<n>@example.com with the password "benchmark".
+"""
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import (
+    ClientConversation, ClientMessage, ContactMessage, CustomerProfile,
+    MenuCategory, MenuItem, Reservation, Translation, UserProfile,
+)
+from api.services.booking import rebuild_slot_inventory
+from api.services.search import build_document
+
+BENCH_PREFIX = 'bench-'
+BENCH_PASSWORD = 'benchmark'
+BATCH_SIZE = 1000
+
+CATEGORY_TYPES = ['cocktails', 'beverages', 'wine', 'shisha', 'food']
+ITEM_WORDS = [
+    'Negroni', 'Spritz', 'Martini', 'Sour', 'Tonic', 'Mojito', 'Fizz', 'Mule',
+    'Burrata', 'Carpaccio', 'Tartare', 'Risotto', 'Tagliata', 'Tiramisu', 'Baklava', 'Byrek',
+]
+FLAVOURS = [
+    'smoked', 'citrus', 'truffle', 'fig', 'rosemary', 'honey', 'pistachio', 'espresso',
+    'ginger', 'basil', 'blood orange', 'walnut',
+]
+FIRST_NAMES = ['Arta', 'Besa', 'Drin', 'Elira', 'Gent', 'Ilir', 'Jona', 'Klea', 'Luan', 'Mira', 'Noa', 'Sara']
+LAST_NAMES = ['Hoxha', 'Krasniqi', 'Berisha', 'Gashi', 'Shala', 'Morina', 'Leka', 'Dervishi']
+CODE_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+
+
+class Command(BaseCommand):
+    help = 'Seeds a scalable, deterministic data set for benchmarks and load tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for all row counts')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded benchmark data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        scale = options['scale']
+        counts = {
+            'categories': max(1, int(20 * scale)),
+            'items': max(1, int(1000 * scale)),
+            'reservations': max(1, int(10000 * scale)),
+            'customers': max(1, int(2000 * scale)),
+            'conversations': max(1, int(500 * scale)),
+            'messages_per_conversation': 10,
+            'contact_messages': max(1, int(2000 * scale)),
+        }
+
+        with transaction.atomic():
+            if options['flush']:
+                self.flush()
+            categories = self.seed_menu(counts['categories'], counts['items'])
+            self.seed_reservations(counts['reservations'])
+            self.seed_customers(counts['customers'])
+            self.seed_conversations(counts['conversations'], counts['messages_per_conversation'])
+            self.seed_contact_messages(counts['contact_messages'])
+            self.seed_translations(categories)
+            # bulk_create skips Reservation.save(), so count the slots afterwards
+            rebuild_slot_inventory()
+
+        self.stdout.write(self.style.SUCCESS('Benchmark data seeded'))
+
+    def bulk(self, model, objects):
+        # bulk_create skips save(), which maintains the search documents
+        for obj in objects if hasattr(model, 'SEARCH_FIELDS') else ():
+            obj.search_document = build_document(*(getattr(obj, field) for field in model.SEARCH_FIELDS))
+        model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        self.stdout.write(f'  {model.__name__}: {len(objects)}')
+
+    def flush(self):
+        self.stdout.write('Removing previous benchmark data...')
+        categories = MenuCategory.objects.filter(name__startswith=BENCH_PREFIX)
+        object_ids = list(categories.values_list('id', flat=True)) + list(
+            MenuItem.objects.filter(category__in=categories).values_list('id', flat=True)
+        )
+        Translation.objects.filter(object_id__in=object_ids).delete()
+        categories.delete()
+        Reservation.objects.filter(email__startswith=BENCH_PREFIX).delete()
+        CustomerProfile.objects.filter(email__startswith=BENCH_PREFIX).delete()
+        ContactMessage.objects.filter(email__startswith=BENCH_PREFIX).delete()
+        User.objects.filter(username__startswith=BENCH_PREFIX).delete()
+
+    def person(self, index):
+        first = self.rng.choice(FIRST_NAMES)
+        last = self.rng.choice(LAST_NAMES)
+        email = f'{BENCH_PREFIX}{first.lower()}.{last.lower()}.{index}@example.com'
+        phone = f'+35569{index:07d}'
+        return first, last, email, phone
+
+    def seed_menu(self, category_count, item_count):
+        self.stdout.write('Seeding menu...')
+        categories = [
+            MenuCategory(
+                name=f'{BENCH_PREFIX}category-{index}',
+                description=f'Benchmark category {index}',
+                category_type=CATEGORY_TYPES[index % len(CATEGORY_TYPES)],
+                display_order=index,
+                is_active=True,
+            )
+            for index in range(category_count)
+        ]
+        self.bulk(MenuCategory, categories)
+
+        items = []
+        for index in range(item_count):
+            word = self.rng.choice(ITEM_WORDS)
+            flavour = self.rng.choice(FLAVOURS)
+            items.append(MenuItem(
+                category=categories[index % category_count],
+                name=f'{flavour.title()} {word} {index}',
+                description=f'{word} with {flavour}, {self.rng.choice(FLAVOURS)} and {self.rng.choice(FLAVOURS)}',
+                price=Decimal(self.rng.randrange(400, 4000)) / 100,
+                ingredients=', '.join(self.rng.sample(FLAVOURS, 3)),
+                is_featured=self.rng.random() < 0.05,
+                is_available=self.rng.random() < 0.95,
+                display_order=index // category_count,
+            ))
+        self.bulk(MenuItem, items)
+        return categories
+
+    def seed_reservations(self, count):
+        self.stdout.write('Seeding reservations...')
+        today = date.today()
+        statuses = [choice for choice, _ in Reservation.STATUS_CHOICES]
+        occasions = [choice for choice, _ in Reservation.OCCASION_CHOICES]
+        codes = set()
+        reservations = []
+        for index in range(count):
+            first, last, email, phone = self.person(index)
+            code = ''.join(self.rng.choices(CODE_CHARS, k=8))
+            while code in codes:
+                code = ''.join(self.rng.choices(CODE_CHARS, k=8))
+            codes.add(code)
+            reservations.append(Reservation(
+                first_name=first, last_name=last, email=email, phone=phone,
+                date=today + timedelta(days=self.rng.randint(-180, 60)),
+                time=time(self.rng.randint(17, 22), self.rng.choice([0, 30])),
+                party_size=self.rng.randint(1, 10),
+                occasion=self.rng.choice(occasions),
+                status=self.rng.choice(statuses),
+                verification_code=code,
+            ))
+        self.bulk(Reservation, reservations)
+
+    def seed_customers(self, count):
+        self.stdout.write('Seeding customers...')
+        tiers = [choice for choice, _ in CustomerProfile.TIER_CHOICES]
+        customers = []
+        for index in range(count):
+            first, last, email, phone = self.person(index)
+            customers.append(CustomerProfile(
+                first_name=first, last_name=last, email=email, phone=phone,
+                tier=self.rng.choice(tiers),
+                points=self.rng.randint(0, 5000),
+                lifetime_visits=self.rng.randint(0, 80),
+                lifetime_spent=Decimal(self.rng.randint(0, 500000)) / 100,
+            ))
+        self.bulk(CustomerProfile, customers)
+
+    def seed_conversations(self, count, messages_per_conversation):
+        self.stdout.write('Seeding client accounts and conversations...')
+        password = make_password(BENCH_PASSWORD)
+        users = [
+            User(
+                username=f'{BENCH_PREFIX}client-{index}@example.com',
+                email=f'{BENCH_PREFIX}client-{index}@example.com',
+                first_name=self.rng.choice(FIRST_NAMES),
+                password=password,
+            )
+            for index in range(count)
+        ]
+        self.bulk(User, users)
+        users = list(User.objects.filter(username__startswith=f'{BENCH_PREFIX}client-'))
+        self.bulk(UserProfile, [UserProfile(user=user) for user in users])
+
+        conversations = [
+            ClientConversation(user=user, subject='Support Chat', status=self.rng.choice(['open', 'closed']))
+            for user in users
+        ]
+        self.bulk(ClientConversation, conversations)
+
+        messages = []
+        for conversation in conversations:
+            for index in range(messages_per_conversation):
+                sender = 'client' if index % 2 == 0 else 'admin'
+                messages.append(ClientMessage(
+                    conversation=conversation,
+                    content=f'Benchmark message {index} about a table for {self.rng.randint(2, 8)}',
+                    sender_type=sender,
+                    sender_name='Staff' if sender == 'admin' else conversation.user.first_name,
+                    is_read=self.rng.random() < 0.7,
+                ))
+        self.bulk(ClientMessage, messages)
+
+    def seed_contact_messages(self, count):
+        self.stdout.write('Seeding contact messages...')
+        subjects = [choice for choice, _ in ContactMessage.SUBJECT_CHOICES]
+        messages = []
+        for index in range(count):
+            first, last, email, phone = self.person(index)
+            messages.append(ContactMessage(
+                name=f'{first} {last}', email=email, phone=phone,
+                subject=self.rng.choice(subjects),
+                message='Benchmark inquiry about availability and the private room.',
+            ))
+        self.bulk(ContactMessage, messages)
+
+    def seed_translations(self, categories):
+        self.stdout.write('Seeding English translations...')
+        translations = []
+        category_type = ContentType.objects.get_for_model(MenuCategory)
+        item_type = ContentType.objects.get_for_model(MenuItem)
+        for category in categories:
+            translations.append(Translation(
+                content_type=category_type, object_id=category.id, locale='en',
+                field_name='name', translated_text=category.name.upper(), status='published',
+            ))
+        for item in MenuItem.objects.filter(category__in=categories).only('id', 'name', 'description'):
+            for field_name in ('name', 'description'):
+                translations.append(Translation(
+                    content_type=item_type, object_id=item.id, locale='en',
+                    field_name=field_name, translated_text=f'[en] {getattr(item, field_name)}',
+                    status='published',
+                ))
+        self.bulk(Translation, translations)
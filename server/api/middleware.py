@@ -0,0 +1,367 @@
+# server/api/middleware.py
+"""
+Project middleware.
+"""
+
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.text import compress_sequence, compress_string
+
+from .db_routers import primary_scope
+from .services import metrics, public_cache
+from .services.profiling import Profiler, check_profile_token
+from .services.query_budget import QueryCounter, QueryRecorder
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class PublicResponseCacheMiddleware:
+    """
+    Cache anonymous GET responses of the public API.
+
+    Cached and fresh responses carry ETag and Last-Modified headers, and
+    conditional requests (If-None-Match / If-Modified-Since) get a 304.
+    Requests with an Authorization header always bypass the cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._is_cacheable_request(request):
+            return self.get_response(request)
+
+        tags = public_cache.tags_for_path(request.path)
+        if tags is None:
+            return self.get_response(request)
+
+        try:
+            origin = f"{request.scheme}://{request.get_host()}"
+            key = public_cache.cache_key(request.path, request.GET, tags, origin)
+            entry = public_cache.get_entry(key)
+        except Exception as e:
+            logger.warning(f"Public cache unavailable: {e}")
+            return self.get_response(request)
+
+        if entry is not None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            response['X-Cache'] = 'HIT'
+        else:
+            response = self.get_response(request)
+            if not self._is_cacheable_response(response):
+                return response
+            entry = public_cache.store_entry(
+                key, response.content, response['Content-Type'], settings.PUBLIC_CACHE_TIMEOUT
+            )
+            response['X-Cache'] = 'MISS'
+
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+
+        return get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=entry['last_modified'],
+            response=response,
+        )
+
+    def _is_cacheable_request(self, request):
+        return (
+            settings.PUBLIC_CACHE_ENABLED
+            and request.method in ('GET', 'HEAD')
+            and 'HTTP_AUTHORIZATION' not in request.META
+        )
+
+    def _is_cacheable_response(self, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.has_header('Set-Cookie')
+            and response.get('Content-Type', '').startswith('application/json')
+        )
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, negotiated via Accept-Encoding.
+
+    Brotli is preferred when the client accepts it and the brotli package is
+    installed. Responses smaller than COMPRESSION_MIN_SIZE bytes, or that
+    already have a Content-Encoding, are sent as they are.
+    """
+
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.brotli_quality = getattr(settings, 'BROTLI_QUALITY', 5)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header('Content-Encoding'):
+            return response
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        coding = self.select_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._compress_stream(coding, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed = self._compress(coding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # Compressed bytes differ from the original, so a strong ETag becomes weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding
+        return response
+
+    def select_encoding(self, header):
+        codings = parse_accept_encoding(header)
+        wildcard = codings.get('*', 0.0)
+        candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+        best, best_quality = None, 0.0
+        for coding in candidates:
+            quality = codings.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def _compress(self, coding, content):
+        if coding == 'br':
+            return brotli.compress(content, quality=self.brotli_quality)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+    def _compress_stream(self, coding, chunks):
+        if coding == 'gzip':
+            return compress_sequence(chunks, max_random_bytes=self.max_random_bytes)
+        return self._brotli_sequence(chunks)
+
+    def _brotli_sequence(self, chunks):
+        compressor = brotli.Compressor(quality=self.brotli_quality)
+        for chunk in chunks:
+            # Flush per chunk so streamed responses reach the client as they are produced
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class QueryBudgetMiddleware:
+    """
+    Record SQL query count, SQL time and repeated query shapes per request.
+
+    Adds a Server-Timing header (db and app durations) and logs one
+    structured line per request. Requests that run more than
+    QUERY_BUDGET_MAX_QUERIES queries, or the same query shape more than
+    QUERY_BUDGET_MAX_REPEATS times, are logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_BUDGET_ENABLED', settings.DEBUG)
+        self.max_queries = getattr(settings, 'QUERY_BUDGET_MAX_QUERIES', 50)
+        self.max_repeats = getattr(settings, 'QUERY_BUDGET_MAX_REPEATS', 5)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        response.headers['Server-Timing'] = ', '.join(filter(None, [
+            response.headers.get('Server-Timing'),
+            recorder.server_timing(),
+            f'app;dur={total_ms:.1f}',
+        ]))
+
+        summary = recorder.summary(self.max_repeats)
+        extra = {
+            'query_budget': {
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 1),
+                **summary,
+            }
+        }
+        over_budget = recorder.count > self.max_queries or summary['repeated']
+        if over_budget:
+            worst = summary['repeated'][0] if summary['repeated'] else None
+            logger.warning(
+                f"Query budget exceeded: {request.method} {request.path} ran {recorder.count} queries "
+                f"in {recorder.duration_ms:.1f}ms"
+                + (f", repeated {worst['count']}x: {worst['sql']}" if worst else ''),
+                extra=extra
+            )
+        else:
+            logger.debug(
+                f"{request.method} {request.path}: {recorder.count} queries "
+                f"in {recorder.duration_ms:.1f}ms",
+                extra=extra
+            )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency and SQL usage per view for /metrics.
+
+    Views are labelled by URL name (or dotted path of unnamed views) so the
+    label set stays bounded; unmatched paths share the "unmatched" label.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        # Count and time only: fingerprinting every statement is for the
+        # (development) query budget, not for every production request
+        with QueryCounter() as recorder:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view = self.view_label(request)
+        metrics.http_requests.inc(view=view, method=request.method, status=response.status_code)
+        metrics.http_latency.observe(duration, view=view, method=request.method)
+        metrics.db_queries.inc(recorder.count, view=view)
+        metrics.db_query_time.inc(recorder.duration_ms / 1000, view=view)
+
+        cache_status = response.get('X-Cache')
+        if cache_status:
+            metrics.public_cache_requests.inc(result=cache_status.lower())
+
+        metrics.publish_snapshot()
+        return response
+
+    def view_label(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            # Responses served by middleware (e.g. cache hits) never resolve
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                return 'unmatched'
+        return match.view_name or match._func_path
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sample of requests and store the traces for staff to download.
+
+    A PROFILING_SAMPLE_RATE share of requests is profiled at random; staff
+    can profile a specific request by sending a token from
+    /api/admin/profiles/token/ in the X-Profile-Token header or as
+    ?__profile=<token>. The saved trace name is returned in X-Profile-Trace.
+    Removed from the middleware chain entirely unless PROFILING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        with Profiler() as profiler:
+            response = self.get_response(request)
+
+        try:
+            response.headers['X-Profile-Trace'] = profiler.save(request)
+        except OSError as e:
+            logger.error(f"Could not save profile for {request.method} {request.path}: {e}")
+        return response
+
+    def should_profile(self, request):
+        token = request.headers.get('X-Profile-Token') or request.GET.get('__profile')
+        if token:
+            return check_profile_token(token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Read-your-writes for replica routing (see api/db_routers.py).
+
+    Requests that wrote to the primary get a REPLICA_PIN_COOKIE for
+    REPLICA_STICKY_SECONDS; while it is present, views marked
+    read_from_replica() read from the primary too.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.cookie_name = settings.REPLICA_PIN_COOKIE
+        self.sticky_seconds = settings.REPLICA_STICKY_SECONDS
+
+    def __call__(self, request):
+        with primary_scope(pinned=self.cookie_name in request.COOKIES) as scope:
+            response = self.get_response(request)
+            wrote = scope.wrote()
+
+        if wrote:
+            response.set_cookie(
+                self.cookie_name, '1', max_age=self.sticky_seconds,
+                httponly=True, samesite='Lax', secure=request.is_secure()
+            )
+        return response
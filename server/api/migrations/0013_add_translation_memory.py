@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:23
+
+import api.models
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_add_event_video_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homesection',
+            name='image_2',
+            field=models.ImageField(blank=True, null=True, upload_to=api.models.home_section_image_path),
+        ),
+        migrations.AddField(
+            model_name='homesection',
+            name='image_3',
+            field=models.ImageField(blank=True, null=True, upload_to=api.models.home_section_image_path),
+        ),
+        migrations.AddField(
+            model_name='homesection',
+            name='image_4',
+            field=models.ImageField(blank=True, null=True, upload_to=api.models.home_section_image_path),
+        ),
+        migrations.AlterField(
+            model_name='restaurantinfo',
+            name='name',
+            field=models.CharField(default='Sarajet Restaurant', max_length=200),
+        ),
+        migrations.CreateModel(
+            name='TranslationMemory',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source_locale', models.CharField(choices=[('sq', 'Albanian'), ('en', 'English')], max_length=5)),
+                ('target_locale', models.CharField(choices=[('sq', 'Albanian'), ('en', 'English')], max_length=5)),
+                ('source_hash', models.CharField(help_text='SHA-256 of the normalized source text', max_length=64)),
+                ('source_text', models.TextField()),
+                ('translated_text', models.TextField()),
+                ('provider', models.CharField(blank=True, help_text="Provider or 'human'", max_length=50)),
+                ('is_human', models.BooleanField(default=False, help_text='Came from an approved human translation')),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Translation Memory',
+                'verbose_name_plural': 'Translation Memory',
+                'unique_together': {('source_locale', 'target_locale', 'source_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_add_translation_memory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientconversation',
+            index=models.Index(fields=['-updated_at', '-id'], name='api_clientc_updated_a22eda_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientmessage',
+            index=models.Index(fields=['conversation', 'created_at'], name='api_clientm_convers_004fd5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientmessage',
+            index=models.Index(fields=['conversation', 'sender_type', 'is_read'], name='api_clientm_convers_3603b6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at', '-id'], name='api_contact_created_a1b7a1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['display_order', 'start_date', 'start_time', 'id'], name='api_event_display_f1f4ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryitem',
+            index=models.Index(fields=['display_order', '-created_at', 'id'], name='api_gallery_display_140e0f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menucategory',
+            index=models.Index(fields=['display_order', 'name', 'id'], name='api_menucat_display_528eab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(fields=['category', 'display_order', 'name'], name='api_menuite_categor_5fac5e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['-created_at', '-id'], name='api_reserva_created_85f4e6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['status', '-created_at'], name='api_reserva_status_36b35c_idx'),
+        ),
+    ]
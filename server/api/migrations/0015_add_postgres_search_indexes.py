@@ -0,0 +1,49 @@
+"""
+PostgreSQL-only indexes: GIN on the menu JSON lists (dietary_info__contains
+filters) and trigram GIN on the columns searched with icontains. Django
+compiles icontains to UPPER(col::text) LIKE UPPER(%s), so the trigram
+indexes are built on the same expression. Built CONCURRENTLY so running the
+migration does not block writes; skipped on SQLite.
+"""
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+INDEXES = [
+    ('api_menuitem_dietary_info_gin', 'api_menuitem', 'USING gin (dietary_info jsonb_path_ops)'),
+    ('api_menuitem_tags_gin', 'api_menuitem', 'USING gin (tags jsonb_path_ops)'),
+    ('api_menuitem_name_trgm', 'api_menuitem', 'USING gin ((UPPER(name::text)) gin_trgm_ops)'),
+    ('api_menuitem_description_trgm', 'api_menuitem', 'USING gin ((UPPER(description::text)) gin_trgm_ops)'),
+    ('api_menuitem_ingredients_trgm', 'api_menuitem', 'USING gin ((UPPER(ingredients::text)) gin_trgm_ops)'),
+    ('api_reservation_last_name_trgm', 'api_reservation', 'USING gin ((UPPER(last_name::text)) gin_trgm_ops)'),
+    ('api_reservation_email_trgm', 'api_reservation', 'USING gin ((UPPER(email::text)) gin_trgm_ops)'),
+    ('api_customerprofile_last_name_trgm', 'api_customerprofile', 'USING gin ((UPPER(last_name::text)) gin_trgm_ops)'),
+    ('api_customerprofile_email_trgm', 'api_customerprofile', 'USING gin ((UPPER(email::text)) gin_trgm_ops)'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, definition in INDEXES:
+        schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0014_add_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
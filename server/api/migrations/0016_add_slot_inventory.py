@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_add_postgres_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('slot_start', models.TimeField()),
+                ('version', models.PositiveIntegerField(default=0, help_text='Bumped on every booking in this slot')),
+            ],
+            options={
+                'verbose_name_plural': 'Slot inventory',
+            },
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='hold_expires_at',
+            field=models.DateTimeField(blank=True, help_text='Unverified guest bookings only hold their seats until this time', null=True),
+        ),
+        migrations.AddField(
+            model_name='restaurantsettings',
+            name='max_tables_per_slot',
+            field=models.IntegerField(default=5, help_text='Maximum number of reservations arriving in one slot'),
+        ),
+        migrations.AddField(
+            model_name='restaurantsettings',
+            name='slot_interval_minutes',
+            field=models.IntegerField(default=30, help_text='Length of a booking slot; reservations count against the slot they arrive in'),
+        ),
+        migrations.AddConstraint(
+            model_name='slotinventory',
+            constraint=models.UniqueConstraint(fields=('date', 'slot_start'), name='unique_slot_inventory'),
+        ),
+    ]
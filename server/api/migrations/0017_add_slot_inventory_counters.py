@@ -0,0 +1,55 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:05
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+ACTIVE_STATUSES = ('pending', 'confirmed', 'seated')
+
+
+def backfill_counters(apps, schema_editor):
+    Reservation = apps.get_model('api', 'Reservation')
+    RestaurantSettings = apps.get_model('api', 'RestaurantSettings')
+    SlotInventory = apps.get_model('api', 'SlotInventory')
+
+    restaurant = RestaurantSettings.objects.first()
+    interval = restaurant.slot_interval_minutes if restaurant else 30
+
+    counts = defaultdict(lambda: [0, 0])
+    rows = Reservation.objects.filter(status__in=ACTIVE_STATUSES).values('date', 'time').annotate(
+        tables=Count('id'), seats=Sum('party_size')
+    )
+    for row in rows:
+        at = datetime.combine(row['date'], row['time'].replace(second=0, microsecond=0))
+        start = (at - timedelta(minutes=(at.hour * 60 + at.minute) % interval)).time()
+        slot = counts[(row['date'], start)]
+        slot[0] += row['tables']
+        slot[1] += row['seats'] or 0
+
+    for (day, start), (tables, seats) in counts.items():
+        SlotInventory.objects.update_or_create(
+            date=day, slot_start=start, defaults={'tables_booked': tables, 'seats_booked': seats}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_add_slot_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slotinventory',
+            name='seats_booked',
+            field=models.IntegerField(default=0, help_text='Guests of those reservations'),
+        ),
+        migrations.AddField(
+            model_name='slotinventory',
+            name='tables_booked',
+            field=models.IntegerField(default=0, help_text='Active reservations arriving in this slot'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
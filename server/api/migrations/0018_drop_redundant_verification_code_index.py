@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_add_slot_inventory_counters'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='api_reserva_verific_2db779_idx',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:11
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_drop_redundant_verification_code_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='reservation',
+            name='email_otp_attempts',
+        ),
+        migrations.RemoveField(
+            model_name='reservation',
+            name='email_otp_code',
+        ),
+        migrations.RemoveField(
+            model_name='reservation',
+            name='email_otp_expires_at',
+        ),
+    ]
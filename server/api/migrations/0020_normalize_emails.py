@@ -0,0 +1,44 @@
+"""
+Store reservation and customer emails trimmed and lowercased (models
+normalize_email) so lookups are equality matches on the email indexes
+instead of iexact scans. Customer profiles whose normalized email already
+belongs to another profile are left unchanged and logged as warnings;
+CustomerProfile.save() keeps their stored email until they are merged.
+"""
+
+import logging
+
+from django.db import migrations
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
+
+logger = logging.getLogger(__name__)
+
+
+def not_normalized():
+    return ~Q(email=Lower(Trim('email')))
+
+
+def normalize_emails(apps, schema_editor):
+    Reservation = apps.get_model('api', 'Reservation')
+    CustomerProfile = apps.get_model('api', 'CustomerProfile')
+
+    Reservation.objects.filter(not_normalized()).update(email=Lower(Trim('email')))
+
+    for customer in CustomerProfile.objects.filter(not_normalized()).only('id', 'email'):
+        email = customer.email.strip().lower()
+        if CustomerProfile.objects.filter(email=email).exclude(pk=customer.pk).exists():
+            logger.warning(f"Customer {customer.pk}: {email} belongs to another profile, left as {customer.email!r}")
+            continue
+        CustomerProfile.objects.filter(pk=customer.pk).update(email=email)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_move_email_otp_to_otp_store'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+    ]
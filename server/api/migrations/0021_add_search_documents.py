@@ -0,0 +1,72 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:17
+
+"""
+search_document columns for reservations and customer profiles (see
+api.services.search), filled for existing rows in batches.
+"""
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+TOKEN_RE = re.compile(r'[0-9a-z]+')
+SEARCH_FIELDS = {
+    'Reservation': ('first_name', 'last_name', 'email', 'phone', 'verification_code'),
+    'CustomerProfile': ('first_name', 'last_name', 'email', 'phone'),
+}
+
+
+def fold(text):
+    decomposed = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower().strip()
+
+
+def build_document(*values):
+    """Same document as services.search.build_document() at the time of this migration"""
+    parts = []
+    for value in values:
+        folded = fold(value)
+        if not folded:
+            continue
+        parts.append(folded)
+        tokens = TOKEN_RE.findall(folded)
+        if tokens != [folded]:
+            parts.extend(tokens)
+    return ' '.join(dict.fromkeys(parts))
+
+
+def backfill_documents(apps, schema_editor):
+    for model_name, fields in SEARCH_FIELDS.items():
+        model = apps.get_model('api', model_name)
+        batch = []
+        for instance in model.objects.only('pk', *fields).iterator(chunk_size=BATCH_SIZE):
+            instance.search_document = build_document(*(getattr(instance, field) for field in fields))
+            batch.append(instance)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ['search_document'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['search_document'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_normalize_emails'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customerprofile',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Folded names, email and phone for admin search (services/search.py)'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Folded names, email, phone and code for admin search (services/search.py)'),
+        ),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
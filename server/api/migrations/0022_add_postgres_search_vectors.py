@@ -0,0 +1,45 @@
+"""
+PostgreSQL search index for reservations and customer profiles: a stored
+generated tsvector over search_document ('simple' configuration, no
+stemming, so prefixes of names, emails and phone numbers match) with a GIN
+index, built CONCURRENTLY. Adding the generated column rewrites the table
+once. SQLite uses FTS5 tables instead, created after migrate by
+api.services.search.ensure_search_index().
+"""
+
+from django.db import migrations
+
+TABLES = ['api_reservation', 'api_customerprofile']
+
+
+def create_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('simple', coalesce(search_document, ''))) STORED"
+        )
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_search_vector_gin ON {table} USING gin (search_vector)'
+        )
+
+
+def drop_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {table}_search_vector_gin')
+        schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0021_add_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vectors, drop_search_vectors),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_add_postgres_search_vectors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='hold_released_at',
+            field=models.DateTimeField(blank=True, help_text='When an expired guest hold was cancelled to free its seats; only such holds can still be verified', null=True),
+        ),
+    ]
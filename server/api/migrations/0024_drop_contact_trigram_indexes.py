@@ -0,0 +1,41 @@
+"""
+Drop the trigram indexes 0015 built on reservation and customer last_name
+and email. Searches on those models (API filters, type-ahead and the admin)
+go through search_document (services/search.py), so the indexes were only
+write overhead. The menu trigram and JSON indexes stay. PostgreSQL only.
+"""
+
+from django.db import migrations
+
+INDEXES = [
+    ('api_reservation_last_name_trgm', 'api_reservation', 'USING gin ((UPPER(last_name::text)) gin_trgm_ops)'),
+    ('api_reservation_email_trgm', 'api_reservation', 'USING gin ((UPPER(email::text)) gin_trgm_ops)'),
+    ('api_customerprofile_last_name_trgm', 'api_customerprofile', 'USING gin ((UPPER(last_name::text)) gin_trgm_ops)'),
+    ('api_customerprofile_email_trgm', 'api_customerprofile', 'USING gin ((UPPER(email::text)) gin_trgm_ops)'),
+]
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, definition in INDEXES:
+        schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0023_add_reservation_hold_released_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_indexes, create_indexes),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:52
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_drop_contact_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='OTPVerification',
+        ),
+    ]
@@ -1,11 +1,36 @@
 # server/api/models.py - UPDATED WITH FRONTEND COMPATIBILITY
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Prefetch
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 import uuid
 import os
+import secrets
+
+
+def normalize_email(value):
+    """
+    Canonical form stored for reservation and customer emails: trimmed and
+    lowercased, so lookups are plain equality matches on the indexed column.
+    """
+    return (value or '').strip().lower()
+
+
+def refresh_search_document(instance, save_kwargs):
+    """
+    Rebuild instance.search_document from its SEARCH_FIELDS. Saves limited
+    with update_fields also write the document when they touch those fields.
+    """
+    from .services.search import build_document
+
+    instance.search_document = build_document(*(getattr(instance, field) for field in instance.SEARCH_FIELDS))
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None and set(update_fields) & set(instance.SEARCH_FIELDS):
+        save_kwargs = {**save_kwargs, 'update_fields': [*update_fields, 'search_document']}
+    return save_kwargs
 
 
 # =============================================================================
@@ -59,10 +84,59 @@ class Translation(models.Model):
         return f"{self.content_type.model}:{self.field_name} ({self.locale})"
 
 
+class TranslationMemory(models.Model):
+    """
+    Previously translated strings, reused whenever the same source text is
+    translated again. Keyed by locale pair and a hash of the normalized text.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    source_locale = models.CharField(max_length=5, choices=Translation.LOCALE_CHOICES)
+    target_locale = models.CharField(max_length=5, choices=Translation.LOCALE_CHOICES)
+    source_hash = models.CharField(max_length=64, help_text="SHA-256 of the normalized source text")
+    source_text = models.TextField()
+    translated_text = models.TextField()
+
+    provider = models.CharField(max_length=50, blank=True, help_text="Provider or 'human'")
+    is_human = models.BooleanField(default=False, help_text="Came from an approved human translation")
+    hit_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Translation Memory'
+        verbose_name_plural = 'Translation Memory'
+        unique_together = ['source_locale', 'target_locale', 'source_hash']
+
+    def __str__(self):
+        return f"{self.source_locale}->{self.target_locale}: {self.source_text[:50]}"
+
+
+# Attribute that published_translations_prefetch() stores its results in
+PREFETCHED_TRANSLATIONS_ATTR = 'published_translations'
+
+
+def published_translations_prefetch(locale, lookup='translations'):
+    """
+    Prefetch published translations for a locale so get_translation() and
+    get_all_translations() are served from memory. Use lookup to prefetch
+    through a relation, e.g. 'category__translations'.
+    """
+    return Prefetch(
+        lookup,
+        queryset=Translation.objects.filter(locale=locale, status='published'),
+        to_attr=PREFETCHED_TRANSLATIONS_ATTR
+    )
+
+
 class TranslatableMixin(models.Model):
     """Abstract mixin for models that support translations"""
     translations = GenericRelation(Translation)
 
+    # Names of the text fields that have per-locale translations
+    TRANSLATABLE_FIELDS = []
+
     # Publication status
     is_published = models.BooleanField(default=False, help_text="Published to public site")
     published_at = models.DateTimeField(null=True, blank=True)
@@ -76,6 +150,13 @@ class TranslatableMixin(models.Model):
             # Return original field value for default locale
             return getattr(self, field_name, '')
 
+        prefetched = getattr(self, PREFETCHED_TRANSLATIONS_ATTR, None)
+        if prefetched is not None:
+            for translation in prefetched:
+                if translation.field_name == field_name and translation.locale == locale:
+                    return translation.translated_text
+            return getattr(self, field_name, '')
+
         translation = self.translations.filter(
             field_name=field_name,
             locale=locale,
@@ -90,6 +171,10 @@ class TranslatableMixin(models.Model):
 
     def get_all_translations(self, locale='sq'):
         """Get all translations for a specific locale as a dictionary"""
+        prefetched = getattr(self, PREFETCHED_TRANSLATIONS_ATTR, None)
+        if prefetched is not None:
+            return {t.field_name: t.translated_text for t in prefetched if t.locale == locale}
+
         translations_dict = {}
         for translation in self.translations.filter(locale=locale, status='published'):
             translations_dict[translation.field_name] = translation.translated_text
@@ -100,13 +185,12 @@ class TranslatableMixin(models.Model):
         return self.translations.filter(locale=locale, status='published').exists()
 
     def translation_status(self, locale):
-        """Get translation status for a locale"""
-        translations = self.translations.filter(locale=locale)
-        if not translations.exists():
-            return 'missing'
-        if translations.filter(status='published').count() == translations.count():
-            return 'complete'
-        return 'partial'
+        """
+        Get translation status for a locale. For many objects use
+        services.translation_coverage.translation_status_map instead.
+        """
+        from .services.translation_coverage import translation_status_map
+        return translation_status_map([self], locale)[self.pk]
 
 
 # =============================================================================
@@ -122,6 +206,8 @@ def home_section_image_path(instance, filename):
 
 class HomeSection(TranslatableMixin):
     """Model for managing homepage sections"""
+    TRANSLATABLE_FIELDS = ['title', 'subtitle', 'description', 'button_text', 'secondary_button_text']
+
     SECTION_TYPE_CHOICES = [
         ('hero', 'Hero Section'),
         ('story', 'Our Story'),
@@ -208,6 +294,11 @@ class HomeSection(TranslatableMixin):
 
 class StaticContent(TranslatableMixin):
     """Model for managing static page content"""
+    TRANSLATABLE_FIELDS = [
+        'page_title', 'page_subtitle', 'hero_title', 'hero_description',
+        'content', 'meta_title', 'meta_description',
+    ]
+
     PAGE_CHOICES = [
         ('contact', 'Contact Page'),
         ('about', 'About Page'),
@@ -250,6 +341,10 @@ class StaticContent(TranslatableMixin):
 
 class RestaurantInfo(TranslatableMixin):
     """Singleton model for restaurant information"""
+    TRANSLATABLE_FIELDS = [
+        'name', 'tagline', 'description', 'address_line1', 'address_line2', 'city', 'country',
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     # Basic info
@@ -389,10 +484,23 @@ class Reservation(models.Model):
         help_text="Public code for reservation lookup"
     )
     email_verified = models.BooleanField(default=False)
-    email_otp_code = models.CharField(max_length=6, blank=True, null=True)
-    email_otp_expires_at = models.DateTimeField(blank=True, null=True)
-    email_otp_attempts = models.IntegerField(default=0)
+    search_document = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Folded names, email, phone and code for admin search (services/search.py)"
+    )
     preferred_locale = models.CharField(max_length=5, default='sq')
+    hold_expires_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Unverified guest bookings only hold their seats until this time"
+    )
+    hold_released_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When an expired guest hold was cancelled to free its seats; only such holds can still be verified"
+    )
     user = models.ForeignKey(
         'auth.User',
         on_delete=models.SET_NULL,
@@ -408,7 +516,8 @@ class Reservation(models.Model):
             models.Index(fields=['email', 'phone']),
             models.Index(fields=['date', 'time']),
             models.Index(fields=['status']),
-            models.Index(fields=['verification_code']),
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status', '-created_at']),
         ]
 
     def __str__(self):
@@ -427,58 +536,98 @@ class Reservation(models.Model):
         )
         return reservation_datetime < timezone.now()
 
+    VERIFICATION_CODE_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'  # Excluding confusing chars
+    VERIFICATION_CODE_LENGTH = 8
+    VERIFICATION_CODE_ATTEMPTS = 5
+
     def generate_verification_code(self):
-        """Generate a unique verification code for reservation lookup"""
-        import random
-        import string
-        chars = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'  # Excluding confusing chars
-        while True:
-            code = ''.join(random.choices(chars, k=8))
-            if not Reservation.objects.filter(verification_code=code).exists():
-                self.verification_code = code
-                return code
+        """
+        Draw a verification code for reservation lookup: 40 random bits from
+        the OS CSPRNG. Uniqueness is left to the unique index; save() draws
+        again in the rare case the insert collides.
+        """
+        self.verification_code = ''.join(
+            secrets.choice(self.VERIFICATION_CODE_CHARS) for _ in range(self.VERIFICATION_CODE_LENGTH)
+        )
+        return self.verification_code
+
+    EMAIL_OTP_PURPOSE = 'reservation-email'
+    EMAIL_OTP_TTL = 15 * 60
+    EMAIL_OTP_MAX_ATTEMPTS = 5
 
     def generate_email_otp(self):
-        """Generate a 6-digit OTP for email verification"""
-        import random
-        from datetime import timedelta
-        self.email_otp_code = ''.join(random.choices('0123456789', k=6))
-        self.email_otp_expires_at = timezone.now() + timedelta(minutes=15)
-        self.email_otp_attempts = 0
-        return self.email_otp_code
+        """Issue a 6-digit OTP for email verification (replaces any earlier one)"""
+        from .services.otp_store import get_otp_store
+        issued = get_otp_store().issue(
+            self.EMAIL_OTP_PURPOSE, self.pk, ttl=self.EMAIL_OTP_TTL, max_attempts=self.EMAIL_OTP_MAX_ATTEMPTS
+        )
+        return issued.code
 
     def verify_email_otp(self, otp_code):
-        """Verify the OTP code"""
-        if self.email_otp_attempts >= 5:
+        """
+        Check (and use up) the OTP code. email_verified is set by
+        services.booking.confirm_hold, together with the confirmation.
+        """
+        from .services import otp_store
+
+        outcome = otp_store.get_otp_store().verify(self.EMAIL_OTP_PURPOSE, self.pk, otp_code)
+        if outcome == otp_store.LOCKED:
             return False, 'Too many attempts. Please request a new code.'
+        if outcome == otp_store.MISSING:
+            return False, 'No valid OTP code found. Please request a new code.'
+        if outcome == otp_store.INVALID:
+            return False, 'Invalid OTP code.'
+        return True, 'Email verified successfully.'
 
-        self.email_otp_attempts += 1
-        self.save(update_fields=['email_otp_attempts'])
-
-        if not self.email_otp_code or not self.email_otp_expires_at:
-            return False, 'No OTP code found. Please request a new code.'
-
-        if timezone.now() > self.email_otp_expires_at:
-            return False, 'OTP code has expired. Please request a new code.'
+    SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'phone', 'verification_code')
 
-        if self.email_otp_code != otp_code:
-            return False, 'Invalid OTP code.'
+    # Fields that decide which slot a reservation occupies and how much of it
+    BOOKING_FIELDS = ('date', 'time', 'party_size', 'status')
+    ACTIVE_STATUSES = ('pending', 'confirmed', 'seated')
 
-        # Success - mark as verified
-        self.email_verified = True
-        self.email_otp_code = None
-        self.email_otp_expires_at = None
-        self.save(update_fields=['email_verified', 'email_otp_code', 'email_otp_expires_at'])
-        return True, 'Email verified successfully.'
+    def booking_footprint(self):
+        """(date, time, party_size) counted in SlotInventory, or None when not active"""
+        if self.status not in self.ACTIVE_STATUSES:
+            return None
+        return (self.date, self.time, self.party_size)
 
     def save(self, *args, **kwargs):
+        from .services.booking import lock_reservation, move_booking
+
+        self.email = normalize_email(self.email)
         # Generate verification code if not set
-        if not self.verification_code:
+        generated_code = not self.verification_code
+        if generated_code:
             self.generate_verification_code()
+        kwargs = refresh_search_document(self, kwargs)
         # Auto-confirm reservations when email is verified
         if self.status == 'pending' and self.email_verified:
             self.status = 'confirmed'
-        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not set(update_fields) & set(self.BOOKING_FIELDS):
+            super().save(*args, **kwargs)
+            return
+
+        # Keep the slot counters in step with the reservation row. The seats
+        # to move come from the stored row, locked, not from this instance:
+        # another request may have changed the reservation since it was loaded.
+        footprint = self.booking_footprint()
+        for attempt in range(1, self.VERIFICATION_CODE_ATTEMPTS + 1):
+            try:
+                with transaction.atomic():
+                    stored = None if self._state.adding else lock_reservation(self.pk)
+                    booked = stored.booking_footprint() if stored is not None else None
+                    super().save(*args, **kwargs)
+                    if booked != footprint:
+                        move_booking(booked, footprint)
+                break
+            except IntegrityError as e:
+                # Only a freshly drawn code that is already taken is retried
+                retry = generated_code and self._state.adding and 'verification_code' in str(e)
+                if not retry or attempt == self.VERIFICATION_CODE_ATTEMPTS:
+                    raise
+                self.generate_verification_code()
 
 
 class ContactMessage(models.Model):
@@ -524,6 +673,9 @@ class ContactMessage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.get_subject_display()}"
@@ -531,6 +683,8 @@ class ContactMessage(models.Model):
 
 class GalleryItem(TranslatableMixin):
     """Model for gallery images and descriptions"""
+    TRANSLATABLE_FIELDS = ['title', 'description']
+
     CATEGORY_CHOICES = [
         ('food', 'Food & Drinks'),
         ('interior', 'Interior Design'),
@@ -571,6 +725,7 @@ class GalleryItem(TranslatableMixin):
             models.Index(fields=['is_active', 'display_order']),
             models.Index(fields=['category', 'is_active']),
             models.Index(fields=['is_featured', 'is_active']),
+            models.Index(fields=['display_order', '-created_at', 'id']),
         ]
     
     def __str__(self):
@@ -592,6 +747,8 @@ def menu_image_path(instance, filename):
 
 class MenuCategory(TranslatableMixin):
     """Model for menu categories with subcategory support"""
+    TRANSLATABLE_FIELDS = ['name', 'description']
+
     CATEGORY_CHOICES = [
         ('cocktails', 'Cocktails'),
         ('wine', 'Wine'),
@@ -640,6 +797,9 @@ class MenuCategory(TranslatableMixin):
 
     class Meta:
         ordering = ['display_order', 'name']
+        indexes = [
+            models.Index(fields=['display_order', 'name', 'id']),
+        ]
         verbose_name = 'Menu Category'
         verbose_name_plural = 'Menu Categories'
 
@@ -666,6 +826,8 @@ class MenuCategory(TranslatableMixin):
 
 class MenuItem(TranslatableMixin):
     """Model for menu items"""
+    TRANSLATABLE_FIELDS = ['name', 'description', 'ingredients']
+
     DIETARY_CHOICES = [
         ('vegetarian', 'Vegetarian'),
         ('vegan', 'Vegan'),
@@ -773,6 +935,7 @@ class MenuItem(TranslatableMixin):
             models.Index(fields=['category', 'is_available']),
             models.Index(fields=['is_featured', 'is_available']),
             models.Index(fields=['display_order']),
+            models.Index(fields=['category', 'display_order', 'name']),
         ]
     
     def __str__(self):
@@ -857,6 +1020,8 @@ class MenuItemVariant(models.Model):
     
 class Event(TranslatableMixin):
     """Model for restaurant events - Compatible with frontend expectations"""
+    TRANSLATABLE_FIELDS = ['title', 'description', 'location', 'special_notes']
+
     EVENT_TYPE_CHOICES = [
         ('featured', 'Featured Event'),
         ('regular', 'Regular Event'),
@@ -1073,6 +1238,7 @@ class Event(TranslatableMixin):
             models.Index(fields=['is_featured', 'is_active']),
             models.Index(fields=['start_date', 'is_active']),
             models.Index(fields=['status', 'is_active']),
+            models.Index(fields=['display_order', 'start_date', 'start_time', 'id']),
         ]
     
     def __str__(self):
@@ -1145,6 +1311,8 @@ class Event(TranslatableMixin):
 
 class EventType(TranslatableMixin):
     """Model for different types of events the restaurant offers"""
+    TRANSLATABLE_FIELDS = ['title', 'description']
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=200, help_text="Event type title")
     description = models.TextField(help_text="Description of this event type")
@@ -1176,6 +1344,8 @@ class EventType(TranslatableMixin):
 
 class VenueSpace(TranslatableMixin):
     """Model for different venue spaces available for events"""
+    TRANSLATABLE_FIELDS = ['name', 'description']
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200, help_text="Venue space name")
     description = models.TextField(help_text="Description of the venue space")
@@ -1225,15 +1395,33 @@ class RestaurantSettings(models.Model):
     max_party_size = models.IntegerField(default=20)
     advance_booking_days = models.IntegerField(default=90)
     cancellation_hours = models.IntegerField(default=2)
+    slot_interval_minutes = models.IntegerField(
+        default=30,
+        help_text="Length of a booking slot; reservations count against the slot they arrive in"
+    )
+    max_tables_per_slot = models.IntegerField(
+        default=5,
+        help_text="Maximum number of reservations arriving in one slot"
+    )
     
     class Meta:
         verbose_name = "Restaurant Settings"
         verbose_name_plural = "Restaurant Settings"
     
     def save(self, *args, **kwargs):
+        from .services.booking import rebuild_slot_inventory
+
         # Ensure only one instance exists
         self.pk = 1
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = RestaurantSettings.objects.select_for_update().filter(pk=1).values_list(
+                'slot_interval_minutes', flat=True
+            ).first()
+            super().save(*args, **kwargs)
+            if previous is not None and previous != self.slot_interval_minutes:
+                # SlotInventory is keyed by slot start: re-key upcoming slots
+                # in the same transaction so bookings never see the old keys
+                rebuild_slot_inventory(start_date=timezone.localdate())
     
     @classmethod
     def get_settings(cls):
@@ -1241,6 +1429,29 @@ class RestaurantSettings(models.Model):
         return obj
 
 
+class SlotInventory(models.Model):
+    """
+    Booked tables and seats per slot, kept up to date by Reservation.save()
+    and delete (rebuild with the reconcile_slot_inventory command). Bookings
+    lock the row (select_for_update) so concurrent requests for the same slot
+    check capacity one at a time.
+    """
+    date = models.DateField()
+    slot_start = models.TimeField()
+    tables_booked = models.IntegerField(default=0, help_text="Active reservations arriving in this slot")
+    seats_booked = models.IntegerField(default=0, help_text="Guests of those reservations")
+    version = models.PositiveIntegerField(default=0, help_text="Bumped on every booking in this slot")
+
+    class Meta:
+        verbose_name_plural = "Slot inventory"
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'slot_start'], name='unique_slot_inventory'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.slot_start}"
+
+
 # Phase 4: Database Schema Extensions - ADD THESE TO models.py
 
 
@@ -1322,6 +1533,12 @@ class CustomerProfile(models.Model):
     phone = models.CharField(max_length=20, unique=True)
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
+    search_document = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Folded names, email and phone for admin search (services/search.py)"
+    )
 
     # Loyalty
     tier = models.CharField(max_length=20, choices=TIER_CHOICES, default='regular')
@@ -1350,6 +1567,23 @@ class CustomerProfile(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.tier})"
 
+    SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'phone')
+
+    def save(self, *args, **kwargs):
+        email = normalize_email(self.email)
+        if email != self.email and self.email_taken(email):
+            if self._state.adding or not CustomerProfile.objects.filter(pk=self.pk, email=self.email).exists():
+                raise ValidationError({'email': 'A customer with this email already exists.'})
+            # A duplicate left unmerged by migration 0020 keeps its stored email
+        else:
+            self.email = email
+        kwargs = refresh_search_document(self, kwargs)
+        super().save(*args, **kwargs)
+
+    def email_taken(self, email):
+        """Another profile already stores this (normalized) email"""
+        return CustomerProfile.objects.filter(email=email).exclude(pk=self.pk).exists()
+
 
 class VIPMembership(models.Model):
     """Model for VIP memberships"""
@@ -1461,23 +1695,6 @@ class SMSNotification(models.Model):
         return f"{self.notification_type} to {self.recipient_phone} - {self.status}"
 
 
-class OTPVerification(models.Model):
-    """Model for OTP verification"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    phone = models.CharField(max_length=20)
-    otp_code = models.CharField(max_length=6)
-    is_verified = models.BooleanField(default=False)
-    expires_at = models.DateTimeField()
-    attempts = models.IntegerField(default=0)
-    created_at = models.DateTimeField(auto_now_add=True)
-
-    class Meta:
-        ordering = ['-created_at']
-
-    def __str__(self):
-        return f"OTP for {self.phone} - {'Verified' if self.is_verified else 'Pending'}"
-
-
 class ProcessedImage(models.Model):
     """Model for processed/optimized images"""
     FORMAT_CHOICES = [
@@ -1639,6 +1856,9 @@ class ClientConversation(models.Model):
 
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['-updated_at', '-id']),
+        ]
         verbose_name = 'Client Conversation'
         verbose_name_plural = 'Client Conversations'
 
@@ -1680,6 +1900,10 @@ class ClientMessage(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at']),
+            models.Index(fields=['conversation', 'sender_type', 'is_read']),
+        ]
         verbose_name = 'Client Message'
         verbose_name_plural = 'Client Messages'
 
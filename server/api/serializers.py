@@ -3,14 +3,39 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.db import models
 from django.utils import timezone
 from .models import (
     Reservation, ContactMessage, GalleryItem, Event, EventType, VenueSpace,
     MenuCategory, MenuItem, MenuItemVariant, FloorPlan, Table, TableAssignment,
     CustomerProfile, VIPMembership, Offer, Waitlist, SMSNotification,
-    OTPVerification, ProcessedImage, Translation, HomeSection, StaticContent,
-    RestaurantInfo, Moment
+    ProcessedImage, Translation, HomeSection, StaticContent,
+    RestaurantInfo, Moment, normalize_email
 )
+from .services.translation_coverage import translation_status_map
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets.
+
+    Pass fields=[...] to keep only those fields, or omit=[...] to drop
+    some. Dropped method fields and nested serializers are never evaluated.
+    Views pass these from ?fields= / ?omit= (see SparseFieldsetMixin).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+        if omit:
+            for field_name in set(omit) & set(self.fields):
+                self.fields.pop(field_name)
+
 
 class ReservationSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
@@ -52,7 +77,7 @@ class MenuItemVariantSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class MenuItemSerializer(serializers.ModelSerializer):
+class MenuItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     formatted_price = serializers.ReadOnlyField()
     image_url = serializers.SerializerMethodField()
     variants = MenuItemVariantSerializer(many=True, read_only=True)
@@ -98,7 +123,7 @@ class MenuItemSerializer(serializers.ModelSerializer):
         return value
 
 
-class PublicMenuItemSerializer(serializers.ModelSerializer):
+class PublicMenuItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for public menu display (limited fields)"""
     formatted_price = serializers.ReadOnlyField()
     image_url = serializers.SerializerMethodField()
@@ -140,7 +165,7 @@ class SubcategorySerializer(serializers.ModelSerializer):
         return obj.menu_items.filter(is_available=True).count()
 
 
-class MenuCategorySerializer(serializers.ModelSerializer):
+class MenuCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     menu_items = MenuItemSerializer(many=True, read_only=True)
     subcategories = SubcategorySerializer(many=True, read_only=True)
     items_count = serializers.SerializerMethodField()
@@ -199,7 +224,7 @@ class PublicSubcategorySerializer(serializers.ModelSerializer):
         return data
 
 
-class PublicMenuCategorySerializer(serializers.ModelSerializer):
+class PublicMenuCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for public menu display (limited fields)"""
     menu_items = PublicMenuItemSerializer(many=True, read_only=True)
     subcategories = PublicSubcategorySerializer(many=True, read_only=True)
@@ -257,7 +282,7 @@ class ContactMessageSerializer(serializers.ModelSerializer):
         return value
 
 
-class GalleryItemSerializer(serializers.ModelSerializer):
+class GalleryItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
     
     class Meta:
@@ -290,7 +315,7 @@ class GalleryItemSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class PublicGalleryItemSerializer(serializers.ModelSerializer):
+class PublicGalleryItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for public gallery display (limited fields)"""
     image_url = serializers.SerializerMethodField()
     
@@ -310,7 +335,7 @@ class PublicGalleryItemSerializer(serializers.ModelSerializer):
         return None
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
     video_original_url = serializers.SerializerMethodField()
     video_webm_url = serializers.SerializerMethodField()
@@ -457,7 +482,7 @@ class EventSerializer(serializers.ModelSerializer):
         return data
 
 
-class PublicEventSerializer(serializers.ModelSerializer):
+class PublicEventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for public event display (limited fields)"""
     image_url = serializers.SerializerMethodField()
     video_webm_url = serializers.SerializerMethodField()
@@ -645,7 +670,13 @@ class CustomerProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def validate_email(self, value):
-        return value.lower()
+        if self.instance is not None and value == self.instance.email:
+            # Unchanged, including duplicates migration 0020 could not normalize
+            return value
+        email = normalize_email(value)
+        if (self.instance or CustomerProfile()).email_taken(email):
+            raise serializers.ValidationError('A customer with this email already exists.')
+        return email
 
 
 class VIPMembershipSerializer(serializers.ModelSerializer):
@@ -717,14 +748,6 @@ class SMSNotificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'sent_at', 'created_at']
 
 
-class OTPVerificationSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = OTPVerification
-        fields = ['id', 'phone', 'otp_code', 'is_verified', 'expires_at',
-                 'attempts', 'created_at']
-        read_only_fields = ['id', 'created_at']
-
-
 class ProcessedImageSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
 
@@ -766,7 +789,82 @@ class TranslationSerializer(serializers.ModelSerializer):
         return f"{obj.content_type.app_label}.{obj.content_type.model}"
 
 
-class HomeSectionSerializer(serializers.ModelSerializer):
+class ContentTypeField(serializers.CharField):
+    """An 'app_label.model' string, resolved to its ContentType"""
+    default_error_messages = {
+        'invalid_content_type': 'Invalid content_type format. Use app_label.model',
+    }
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            app_label, model = value.split('.')
+            return ContentType.objects.get_by_natural_key(app_label, model)
+        except (ValueError, ContentType.DoesNotExist):
+            self.fail('invalid_content_type')
+
+    def to_representation(self, value):
+        return f"{value.app_label}.{value.model}"
+
+
+class TranslationItemSerializer(serializers.Serializer):
+    """One row of a bulk translation upsert"""
+    content_type = ContentTypeField()
+    object_id = serializers.UUIDField()
+    field_name = serializers.CharField(max_length=100)
+    translated_text = serializers.CharField(allow_blank=True, trim_whitespace=False, default='')
+
+
+class TranslationBulkUpsertSerializer(serializers.Serializer):
+    locale = serializers.ChoiceField(choices=Translation.LOCALE_CHOICES)
+    status = serializers.ChoiceField(choices=Translation.STATUS_CHOICES, default='draft')
+    translations = TranslationItemSerializer(many=True, allow_empty=False)
+
+
+class TranslationPublishSerializer(serializers.Serializer):
+    content_type = ContentTypeField()
+    object_id = serializers.UUIDField()
+    locale = serializers.ChoiceField(choices=Translation.LOCALE_CHOICES)
+
+
+class TranslationBulkStatusSerializer(serializers.Serializer):
+    content_type = ContentTypeField()
+    object_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+    locale = serializers.ChoiceField(choices=Translation.LOCALE_CHOICES)
+    status = serializers.ChoiceField(choices=Translation.STATUS_CHOICES)
+    fields = serializers.ListField(child=serializers.CharField(max_length=100), required=False)
+
+
+class IdListSerializer(serializers.Serializer):
+    """Body of the bulk publish / unpublish actions: {"ids": [...]}"""
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+
+class TranslationStatusListSerializer(serializers.ListSerializer):
+    """
+    Computes translation_status_en for the whole list in one query
+    and hands it to the child serializer through the context.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        iterable = list(iterable)
+        if 'translation_status_en' in self.child.fields:
+            self.context['translation_status_en'] = translation_status_map(iterable, 'en')
+        return super().to_representation(iterable)
+
+
+class TranslationStatusMixin:
+    """Serializer mixin for the admin translation_status_en field"""
+
+    def get_translation_status_en(self, obj):
+        statuses = self.context.get('translation_status_en')
+        if statuses and obj.pk in statuses:
+            return statuses[obj.pk]
+        return obj.translation_status('en')
+
+
+class HomeSectionSerializer(DynamicFieldsMixin, TranslationStatusMixin, serializers.ModelSerializer):
     """Admin serializer for HomeSection"""
     image_url = serializers.SerializerMethodField()
     background_image_url = serializers.SerializerMethodField()
@@ -782,6 +880,7 @@ class HomeSectionSerializer(serializers.ModelSerializer):
             'display_order', 'translation_status_en', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = TranslationStatusListSerializer
 
     def get_image_url(self, obj):
         if obj.image:
@@ -799,11 +898,8 @@ class HomeSectionSerializer(serializers.ModelSerializer):
             return obj.background_image.url
         return None
 
-    def get_translation_status_en(self, obj):
-        return obj.translation_status('en')
-
 
-class LocalizedHomeSectionSerializer(serializers.ModelSerializer):
+class LocalizedHomeSectionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Public serializer for HomeSection with locale support"""
     image_url = serializers.SerializerMethodField()
     background_image_url = serializers.SerializerMethodField()
@@ -856,7 +952,7 @@ class LocalizedHomeSectionSerializer(serializers.ModelSerializer):
         return None
 
 
-class StaticContentSerializer(serializers.ModelSerializer):
+class StaticContentSerializer(DynamicFieldsMixin, TranslationStatusMixin, serializers.ModelSerializer):
     """Admin serializer for StaticContent"""
     translation_status_en = serializers.SerializerMethodField()
 
@@ -869,9 +965,7 @@ class StaticContentSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-
-    def get_translation_status_en(self, obj):
-        return obj.translation_status('en')
+        list_serializer_class = TranslationStatusListSerializer
 
 
 class RestaurantInfoSerializer(serializers.ModelSerializer):
@@ -890,7 +984,7 @@ class RestaurantInfoSerializer(serializers.ModelSerializer):
 
 # ============ LOCALIZED PUBLIC SERIALIZERS ============
 
-class LocalizedEventSerializer(serializers.ModelSerializer):
+class LocalizedEventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Public event serializer with locale support"""
     image_url = serializers.SerializerMethodField()
     price_formatted = serializers.ReadOnlyField()
@@ -936,7 +1030,7 @@ class LocalizedEventSerializer(serializers.ModelSerializer):
         return None
 
 
-class LocalizedGalleryItemSerializer(serializers.ModelSerializer):
+class LocalizedGalleryItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Public gallery serializer with locale support"""
     image_url = serializers.SerializerMethodField()
     title = serializers.SerializerMethodField()
@@ -964,7 +1058,7 @@ class LocalizedGalleryItemSerializer(serializers.ModelSerializer):
         return None
 
 
-class LocalizedMenuItemSerializer(serializers.ModelSerializer):
+class LocalizedMenuItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Public menu item serializer with locale support"""
     formatted_price = serializers.ReadOnlyField()
     image_url = serializers.SerializerMethodField()
@@ -1007,7 +1101,7 @@ class LocalizedMenuItemSerializer(serializers.ModelSerializer):
         return None
 
 
-class LocalizedMenuCategorySerializer(serializers.ModelSerializer):
+class LocalizedMenuCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Public menu category serializer with locale support"""
     menu_items = serializers.SerializerMethodField()
     items_count = serializers.SerializerMethodField()
@@ -1062,7 +1156,7 @@ class MomentSerializer(serializers.ModelSerializer):
         return None
 
 
-class PublicMomentSerializer(serializers.ModelSerializer):
+class PublicMomentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Public serializer for Moment model (limited fields)"""
     image_url = serializers.SerializerMethodField()
 
@@ -0,0 +1,316 @@
+# server/api/services/booking.py
+"""
+Capacity-checked reservation booking.
+
+Every reservation counts against the slot it arrives in (RestaurantSettings
+.slot_interval_minutes; changing it re-keys the upcoming SlotInventory rows
+with rebuild_slot_inventory() in the same transaction). SlotInventory keeps the booked tables and seats of
+each slot: Reservation.save() and deletes move a reservation's seats between
+slots with move_booking(), in the same transaction as the row change, using
+the footprint of the locked stored row (lock_reservation()) so stale copies
+of a reservation cannot move its seats twice. A booking locks its slot's
+inventory row for the rest of its transaction and
+checks the counters before saving, so concurrent requests for one slot
+cannot overbook it. Limits are RestaurantSettings.max_tables_per_slot
+reservations and max_capacity seats per slot.
+
+Unverified guest reservations hold their seats until hold_expires_at
+(RESERVATION_HOLD_MINUTES). Expired holds are cancelled, freeing their
+seats, by the periodic release task and by the next booking in their slot,
+and marked with hold_released_at; verifying an expired hold re-checks
+capacity. Reservations cancelled any other way cannot be verified back.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from ..models import Reservation, RestaurantSettings, SlotInventory
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = Reservation.ACTIVE_STATUSES
+
+
+class HoldClosed(Exception):
+    """The reservation is not an unconfirmed guest hold (any more)"""
+
+
+class SlotUnavailable(Exception):
+    """The requested slot does not have room for the party"""
+
+    def __init__(self, message, tables_left=0, seats_left=0):
+        super().__init__(message)
+        self.tables_left = tables_left
+        self.seats_left = seats_left
+
+
+def slot_bounds(day, at, interval_minutes):
+    """Start and end (None past midnight) of the slot containing `at`"""
+    minutes = at.hour * 60 + at.minute
+    start = datetime.combine(day, at.replace(second=0, microsecond=0)) - timedelta(
+        minutes=minutes % interval_minutes
+    )
+    end = start + timedelta(minutes=interval_minutes)
+    return start.time(), (end.time() if end.date() == day else None)
+
+
+def slot_reservations(day, start, end):
+    """Active reservations arriving in a slot"""
+    queryset = Reservation.objects.filter(date=day, time__gte=start, status__in=ACTIVE_STATUSES)
+    if end is not None:
+        queryset = queryset.filter(time__lt=end)
+    return queryset
+
+
+def slot_usage(day, restaurant=None):
+    """{slot_start: {'tables': n, 'seats': n}} for every booked slot of a day"""
+    return {
+        row['slot_start']: {'tables': row['tables_booked'], 'seats': row['seats_booked']}
+        for row in SlotInventory.objects.filter(date=day).values('slot_start', 'tables_booked', 'seats_booked')
+    }
+
+
+def move_booking(old, new, restaurant=None):
+    """
+    Move a reservation's seats between slot counters. old and new are
+    Reservation.booking_footprint() values: (date, time, party_size) or None.
+    """
+    from .reservation_calendar import invalidate_month
+
+    restaurant = restaurant or RestaurantSettings.get_settings()
+    for footprint, sign in ((old, -1), (new, 1)):
+        if footprint is None:
+            continue
+        day, at, party_size = footprint
+        start, _ = slot_bounds(day, at, restaurant.slot_interval_minutes)
+        slot = SlotInventory.objects.filter(date=day, slot_start=start)
+        changes = {
+            'tables_booked': F('tables_booked') + sign,
+            'seats_booked': F('seats_booked') + sign * party_size,
+            'version': F('version') + 1,
+        }
+        if not slot.update(**changes):
+            SlotInventory.objects.get_or_create(date=day, slot_start=start)
+            slot.update(**changes)
+        invalidate_month(day)
+
+
+def lock_slot(day, start):
+    """
+    Lock the slot's inventory row (created on first use) until the
+    transaction ends. The version bump comes first so SQLite, which has no
+    row locks, takes its database write lock before anything is read.
+    """
+    slot = SlotInventory.objects.filter(date=day, slot_start=start)
+    if not slot.update(version=F('version') + 1):
+        SlotInventory.objects.get_or_create(date=day, slot_start=start)
+    return slot.select_for_update().get()
+
+
+def lock_reservation(pk):
+    """
+    Lock a reservation row until the transaction ends and return it as
+    stored (None if it does not exist). On SQLite, which has no row locks, a
+    no-op update takes the database write lock before anything is read.
+    """
+    rows = Reservation.objects.select_for_update().filter(pk=pk)
+    if connections[rows.db].vendor == 'sqlite':
+        rows.update(hold_expires_at=F('hold_expires_at'))
+    return rows.first()
+
+
+def release_hold(pk):
+    """
+    Cancel one guest hold if, once its row is locked, it is still an
+    unconfirmed hold past its expiry. Returns whether it was released.
+    """
+    with transaction.atomic():
+        reservation = lock_reservation(pk)
+        if (reservation is None or reservation.status != 'pending'
+                or reservation.hold_expires_at is None or reservation.hold_expires_at > timezone.now()):
+            return False
+        reservation.status = 'cancelled'
+        reservation.hold_released_at = timezone.now()
+        reservation.save(update_fields=['status', 'hold_released_at', 'updated_at'])
+    return True
+
+
+def release_slot_holds(day, start, end):
+    """Cancel the expired holds of one slot; call with the slot locked"""
+    holds = slot_reservations(day, start, end).filter(status='pending', hold_expires_at__lte=timezone.now())
+    for pk in holds.values_list('pk', flat=True):
+        release_hold(pk)
+
+
+def check_capacity(day, at, party_size, current=None, restaurant=None):
+    """
+    Lock the slot and raise SlotUnavailable unless it has room for
+    party_size more guests. current is the footprint of the reservation
+    being moved or resized; its own seats do not count against it.
+    """
+    restaurant = restaurant or RestaurantSettings.get_settings()
+    if party_size > restaurant.max_party_size:
+        raise SlotUnavailable(f'Parties larger than {restaurant.max_party_size} need to contact us directly.')
+
+    interval = restaurant.slot_interval_minutes
+    start, end = slot_bounds(day, at, interval)
+    lock_slot(day, start)
+    release_slot_holds(day, start, end)
+    inventory = SlotInventory.objects.get(date=day, slot_start=start)
+
+    tables, seats = inventory.tables_booked, inventory.seats_booked
+    if current is not None and current[0] == day and slot_bounds(current[0], current[1], interval)[0] == start:
+        tables, seats = tables - 1, seats - current[2]
+
+    tables_left = restaurant.max_tables_per_slot - tables
+    seats_left = restaurant.max_capacity - seats
+    if tables_left < 1 or seats_left < party_size:
+        raise SlotUnavailable(
+            'This time slot is fully booked. Please choose another time.',
+            tables_left=max(tables_left, 0), seats_left=max(seats_left, 0)
+        )
+
+
+def book_reservation(serializer, hold=False, **save_kwargs):
+    """
+    Save a validated ReservationSerializer if its slot has room.
+    hold=True books an unverified guest reservation that only keeps its
+    seats for RESERVATION_HOLD_MINUTES.
+    """
+    data = serializer.validated_data
+    instance = serializer.instance
+    day = data.get('date', getattr(instance, 'date', None))
+    at = data.get('time', getattr(instance, 'time', None))
+    party_size = data.get('party_size', getattr(instance, 'party_size', None))
+    reservation_status = save_kwargs.get('status', data.get('status', getattr(instance, 'status', 'pending')))
+
+    if hold:
+        save_kwargs['hold_expires_at'] = timezone.now() + timedelta(minutes=settings.RESERVATION_HOLD_MINUTES)
+
+    # Read before the transaction: on SQLite nothing may be read in it
+    # before lock_slot() / lock_reservation() take the write lock
+    restaurant = RestaurantSettings.get_settings()
+    with transaction.atomic():
+        # Edits that leave an active reservation in its slot with the same
+        # party size do not need a seat of their own. What it holds now is
+        # read from the locked row, not the instance the serializer loaded.
+        stored = lock_reservation(instance.pk) if instance is not None else None
+        current = stored.booking_footprint() if stored is not None else None
+        if reservation_status in ACTIVE_STATUSES and (day, at, party_size) != current:
+            check_capacity(day, at, party_size, current=current, restaurant=restaurant)
+        return serializer.save(**save_kwargs)
+
+
+def can_confirm_hold(reservation):
+    """
+    Pending holds, and holds cancelled only because they expired, can be
+    verified. Reservations cancelled by the guest or staff stay cancelled.
+    """
+    return reservation.status == 'pending' or (
+        reservation.status == 'cancelled' and reservation.hold_released_at is not None
+    )
+
+
+def confirm_hold(reservation):
+    """
+    Turn a guest hold whose OTP was checked into a booking and return it as
+    saved. The email is marked verified in the same transaction, so a hold
+    that cannot be confirmed can still be sent a new code. An expired (or
+    released) hold has to win its seats back, so capacity is checked again.
+    Raises HoldClosed when the reservation is no longer a hold.
+    """
+    restaurant = RestaurantSettings.get_settings()
+    with transaction.atomic():
+        stored = lock_reservation(reservation.pk)
+        if stored is None or not can_confirm_hold(stored):
+            raise HoldClosed('This reservation can no longer be confirmed.')
+
+        expired = stored.hold_expires_at is not None and stored.hold_expires_at <= timezone.now()
+        if stored.status == 'pending' and expired:
+            # Give up the lapsed hold's seats before competing for them again
+            stored.status = 'cancelled'
+            stored.save(update_fields=['status', 'updated_at'])
+        if stored.status == 'cancelled':
+            check_capacity(stored.date, stored.time, stored.party_size, restaurant=restaurant)
+
+        stored.status = 'confirmed'
+        stored.email_verified = True
+        stored.hold_expires_at = None
+        stored.hold_released_at = None
+        stored.save(update_fields=[
+            'status', 'email_verified', 'hold_expires_at', 'hold_released_at', 'updated_at'
+        ])
+    return stored
+
+
+def release_expired_holds():
+    """Cancel guest reservations whose hold ran out before they were confirmed"""
+    expired = Reservation.objects.filter(status='pending', hold_expires_at__lte=timezone.now())
+    # Each hold is checked again under its row lock: it may have been
+    # verified since this list was read
+    released = sum(release_hold(pk) for pk in list(expired.values_list('pk', flat=True)))
+    if released:
+        logger.info(f"Released {released} expired reservation holds")
+    return released
+
+
+def rebuild_slot_inventory(start_date=None, end_date=None, dry_run=False):
+    """
+    Recount the SlotInventory counters from the reservations and fix the
+    slots that drifted (bulk imports, queryset updates, manual SQL, a new
+    slot interval). Rows that no longer start a slot are deleted.
+    Returns (date, slot_start, (tables, seats) stored, (tables, seats) counted)
+    for every slot that was off.
+    """
+    interval = RestaurantSettings.get_settings().slot_interval_minutes
+    reservations = Reservation.objects.filter(status__in=ACTIVE_STATUSES)
+    inventory = SlotInventory.objects.all()
+    if start_date:
+        reservations = reservations.filter(date__gte=start_date)
+        inventory = inventory.filter(date__gte=start_date)
+    if end_date:
+        reservations = reservations.filter(date__lte=end_date)
+        inventory = inventory.filter(date__lte=end_date)
+
+    counted = defaultdict(lambda: (0, 0))
+    for row in reservations.values('date', 'time').annotate(tables=Count('id'), seats=Sum('party_size')):
+        key = (row['date'], slot_bounds(row['date'], row['time'], interval)[0])
+        tables, seats = counted[key]
+        counted[key] = (tables + row['tables'], seats + (row['seats'] or 0))
+    stored = {
+        (row['date'], row['slot_start']): (row['tables_booked'], row['seats_booked'])
+        for row in inventory.values('date', 'slot_start', 'tables_booked', 'seats_booked')
+    }
+
+    drifted = []
+    for key in sorted(set(counted) | set(stored)):
+        before, after = stored.get(key, (0, 0)), counted.get(key, (0, 0))
+        if before != after:
+            drifted.append((*key, before, after))
+    if dry_run:
+        return drifted
+
+    for day, start, _, _ in drifted:
+        if slot_bounds(day, start, interval)[0] != start:
+            # Keyed by an earlier slot_interval_minutes; its reservations
+            # are counted in the slot that now contains them
+            SlotInventory.objects.filter(date=day, slot_start=start).delete()
+            continue
+        with transaction.atomic():
+            lock_slot(day, start)
+            # Count again under the lock so bookings made meanwhile are included
+            totals = slot_reservations(day, start, slot_bounds(day, start, interval)[1]).aggregate(
+                tables=Count('id'), seats=Sum('party_size')
+            )
+            SlotInventory.objects.filter(date=day, slot_start=start).update(
+                tables_booked=totals['tables'], seats_booked=totals['seats'] or 0
+            )
+    if drifted:
+        logger.info(f"Reconciled {len(drifted)} slot inventory rows")
+    return drifted
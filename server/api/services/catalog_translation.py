@@ -0,0 +1,226 @@
+# server/api/services/catalog_translation.py
+"""
+Bulk auto-translation of the whole translatable catalog.
+
+Finds every missing or stale translation for a target locale, translates
+each distinct source string once, and upserts the resulting Translation
+rows in batches.
+
+Strings no provider could translate (the copy fallback returned the source
+text, or every provider failed) are not written, so they stay pending for
+the next run. Hits on human translation memory entries are written as
+human rows ('memory:human'), which are never treated as stale.
+Re-translated rows keep their review status: new rows are drafts, and
+published rows that were refreshed are counted in 'published_updated' and
+invalidate the public cache.
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.contrib.contenttypes.models import ContentType
+
+from ..models import (
+    Translation, MenuItem, MenuCategory, Event, GalleryItem,
+    HomeSection, StaticContent, RestaurantInfo
+)
+from ..signals import notify_content_changed
+from .translation_memory import HUMAN_PROVIDER, MEMORY_PROVIDER
+from .translation_service import get_translation_service
+
+logger = logging.getLogger(__name__)
+
+# Models covered by catalog-wide auto-translation, keyed by model name
+CATALOG_MODELS = {
+    model._meta.model_name: model
+    for model in [
+        MenuItem, MenuCategory, Event, GalleryItem,
+        HomeSection, StaticContent, RestaurantInfo,
+    ]
+}
+
+TRANSLATION_UNIQUE_FIELDS = ['content_type', 'object_id', 'locale', 'field_name']
+TRANSLATION_UPDATE_FIELDS = [
+    'translated_text', 'status', 'is_auto_translated', 'translated_by', 'updated_at'
+]
+
+# Providers that hand back the source text instead of a translation
+UNTRANSLATED_PROVIDERS = {'copy_fallback', 'none'}
+
+
+def is_auto_translation(translated_by: str) -> bool:
+    """Translations written by a provider are marked 'auto:<provider>'"""
+    return (translated_by or '').startswith('auto:')
+
+
+def is_untranslated(result: Dict) -> bool:
+    """No provider produced a translation for this result"""
+    return bool(result.get('error')) or result['provider'] in UNTRANSLATED_PROVIDERS
+
+
+def translated_by(result: Dict) -> str:
+    """'auto:<provider>' for machine output, 'memory:human' for reviewed memory hits"""
+    if result['provider'] == MEMORY_PROVIDER and not result['is_auto_translated']:
+        return f"{MEMORY_PROVIDER}:{HUMAN_PROVIDER}"
+    return f"auto:{result['provider']}"
+
+
+def find_pending_fields(model, target_locale: str, include_stale: bool = True) -> List[Dict]:
+    """
+    List the fields of `model` that need an auto-translation into `target_locale`.
+
+    A field is pending when it has source text and either has no translation,
+    holds an untranslated copy of the source from a provider outage, or
+    (with include_stale) its auto-translation is older than the source
+    object. Human-written translations are never treated as stale.
+    """
+    fields = model.TRANSLATABLE_FIELDS
+    if not fields:
+        return []
+
+    content_type = ContentType.objects.get_for_model(model)
+    existing = {
+        (row['object_id'], row['field_name']): row
+        for row in Translation.objects.filter(
+            content_type=content_type, locale=target_locale
+        ).values('object_id', 'field_name', 'updated_at', 'translated_by', 'is_auto_translated', 'status')
+    }
+
+    pending = []
+    for obj in model.objects.values('pk', 'updated_at', *fields).iterator():
+        for field_name in fields:
+            text = obj[field_name]
+            if not text or not str(text).strip():
+                continue
+            translation = existing.get((obj['pk'], field_name))
+            auto = translation is not None and is_auto_translation(translation['translated_by'])
+            if translation is None:
+                reason = 'missing'
+            elif auto and not translation['is_auto_translated']:
+                reason = 'untranslated'
+            elif include_stale and auto and translation['updated_at'] < obj['updated_at']:
+                reason = 'stale'
+            else:
+                continue
+            pending.append({
+                'content_type': content_type,
+                'object_id': obj['pk'],
+                'field_name': field_name,
+                'text': text,
+                'reason': reason,
+                'status': translation['status'] if translation is not None else 'draft',
+            })
+    return pending
+
+
+def upsert_translations(rows: Iterable[Translation], batch_size: int = 500) -> int:
+    """Insert or update Translation rows with a single upsert per batch"""
+    rows = list(rows)
+    if rows:
+        Translation.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=TRANSLATION_UNIQUE_FIELDS,
+            update_fields=TRANSLATION_UPDATE_FIELDS,
+        )
+    return len(rows)
+
+
+def translate_catalog(
+    target_locale: str,
+    source_locale: str = 'sq',
+    model_names: Optional[List[str]] = None,
+    include_stale: bool = True,
+    batch_size: int = 50,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict:
+    """
+    Auto-translate every pending field of the catalog into `target_locale`.
+
+    Identical source strings are translated once and the result is reused
+    for every field that shares it. `progress(done, total)` is called after
+    each provider batch, where total is the number of distinct strings.
+    """
+    models = [CATALOG_MODELS[name] for name in (model_names or CATALOG_MODELS)]
+
+    pending = []
+    by_model = {}
+    for model in models:
+        model_pending = find_pending_fields(model, target_locale, include_stale)
+        by_model[model._meta.model_name] = len(model_pending)
+        pending.extend(model_pending)
+
+    # Group pending fields by source text so each string is translated once
+    fields_by_text: Dict[str, List[Dict]] = {}
+    for item in pending:
+        fields_by_text.setdefault(item['text'], []).append(item)
+    unique_texts = list(fields_by_text)
+
+    total = len(unique_texts)
+    if progress:
+        progress(0, total)
+
+    service = get_translation_service()
+    providers = set()
+    written = 0
+    published_updated = 0
+    untranslated = 0
+
+    for start in range(0, total, batch_size):
+        chunk = unique_texts[start:start + batch_size]
+        results = service.translate_texts(chunk, source_locale, target_locale)
+
+        rows = []
+        published = []
+        for text, result in zip(chunk, results):
+            providers.add(result['provider'])
+            if is_untranslated(result):
+                # No provider translated it; leave the fields pending
+                untranslated += 1
+                continue
+            for item in fields_by_text[text]:
+                if item['status'] == 'published':
+                    published.append(item)
+                rows.append(Translation(
+                    content_type=item['content_type'],
+                    object_id=item['object_id'],
+                    locale=target_locale,
+                    field_name=item['field_name'],
+                    translated_text=result['translated_text'],
+                    status=item['status'],
+                    is_auto_translated=result['is_auto_translated'],
+                    translated_by=translated_by(result),
+                ))
+        written += upsert_translations(rows)
+
+        if published:
+            published_updated += len(published)
+            notify_content_changed(
+                Translation,
+                [item['content_type'].model_class() for item in published],
+                object_ids=[item['object_id'] for item in published],
+                locales=[target_locale],
+            )
+
+        if progress:
+            progress(min(start + batch_size, total), total)
+
+    logger.info(
+        f"Catalog auto-translation to {target_locale}: "
+        f"{written} fields from {total} distinct strings"
+    )
+    if untranslated:
+        logger.warning(f"{untranslated} strings could not be translated to {target_locale} and stay pending")
+
+    return {
+        'target_locale': target_locale,
+        'source_locale': source_locale,
+        'pending_fields': len(pending),
+        'unique_texts': total,
+        'translations_written': written,
+        'published_updated': published_updated,
+        'untranslated_texts': untranslated,
+        'by_model': by_model,
+        'providers': sorted(providers),
+    }
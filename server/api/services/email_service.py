@@ -10,6 +10,8 @@ from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from typing import Optional
 
+from .metrics import track_notification
+
 logger = logging.getLogger(__name__)
 
 BRAND_COLOR = '#1a1a1a'
@@ -300,20 +302,22 @@ def _reminder_content(name: str, date: str, time: str, party_size: int, locale:
 def _send_html_email(subject: str, html_body: str, plain_body: str, to_email: str) -> bool:
     """Send an email with HTML and plain-text fallback."""
     from_email = f'{FROM_NAME} <{settings.EMAIL_HOST_USER}>'
-    try:
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=plain_body,
-            from_email=from_email,
-            to=[to_email],
-        )
-        msg.attach_alternative(html_body, 'text/html')
-        msg.send(fail_silently=False)
-        logger.info(f"Email '{subject}' sent to {to_email}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send email to {to_email}: {e}")
-        return False
+    with track_notification('email') as outcome:
+        try:
+            msg = EmailMultiAlternatives(
+                subject=subject,
+                body=plain_body,
+                from_email=from_email,
+                to=[to_email],
+            )
+            msg.attach_alternative(html_body, 'text/html')
+            msg.send(fail_silently=False)
+            logger.info(f"Email '{subject}' sent to {to_email}")
+            outcome['ok'] = True
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email to {to_email}: {e}")
+            return False
 
 
 def get_site_url():
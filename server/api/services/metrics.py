@@ -0,0 +1,348 @@
+# server/api/services/metrics.py
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Metrics are kept in a small thread-safe registry in each process. Web
+workers, Celery workers and FFmpeg conversions all run in different
+processes, so each process periodically publishes a snapshot of its
+registry to the Django cache; the /metrics view renders its own live
+registry merged with the snapshots of every other process. With the Redis
+cache backend this gives totals across all processes; with the local
+memory cache each process only reports itself.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+SNAPSHOT_KEY_PREFIX = 'metrics:process'
+SNAPSHOT_INDEX_KEY = 'metrics:processes'
+SNAPSHOT_TIMEOUT = 60 * 60
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    def _copy(self, value):
+        return value
+
+    def merge_into(self, values, other):
+        for key, value in other.items():
+            values[key] = values.get(key, 0) + value
+
+    def render(self, values):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        for key in sorted(values):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_number(values[key])}')
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def merge_into(self, values, other):
+        # A gauge is a current reading; prefer this process's own value
+        for key, value in other.items():
+            values.setdefault(key, value)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _copy(self, value):
+        return (list(value[0]), value[1])
+
+    def merge_into(self, values, other):
+        for key, (counts, total) in other.items():
+            current_counts, current_total = values.get(key) or ([0] * len(self.buckets), 0.0)
+            values[key] = ([a + b for a, b in zip(current_counts, counts)], current_total + total)
+
+    def render(self, values):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        for key in sorted(values):
+            counts, total = values[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, [('le', _format_number(float(bound)))])
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_number(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def render(self, snapshots=()):
+        lines = []
+        for name, metric in self._metrics.items():
+            values = metric.snapshot()
+            for snapshot in snapshots:
+                metric.merge_into(values, snapshot.get(name, {}))
+            lines.extend(metric.render(values))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.register(Counter(
+    'http_requests_total', 'HTTP requests by view, method and status code.',
+    ('view', 'method', 'status')
+))
+http_latency = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by view.', ('view', 'method')
+))
+db_queries = REGISTRY.register(Counter(
+    'db_queries_total', 'SQL queries executed while serving requests.', ('view',)
+))
+db_query_time = REGISTRY.register(Counter(
+    'db_query_seconds_total', 'Time spent in SQL while serving requests.', ('view',)
+))
+public_cache_requests = REGISTRY.register(Counter(
+    'public_cache_requests_total', 'Public API response cache lookups by result.', ('result',)
+))
+celery_queue_length = REGISTRY.register(Gauge(
+    'celery_queue_length', 'Messages waiting in a Celery broker queue.', ('queue',)
+))
+celery_tasks = REGISTRY.register(Counter(
+    'celery_tasks_total', 'Finished Celery tasks by task name and state.', ('task', 'state')
+))
+celery_task_duration = REGISTRY.register(Histogram(
+    'celery_task_duration_seconds', 'Celery task run time.', ('task',), buckets=SLOW_BUCKETS
+))
+ffmpeg_wall = REGISTRY.register(Histogram(
+    'ffmpeg_conversion_wall_seconds', 'Wall-clock time of FFmpeg conversions.', ('result',),
+    buckets=SLOW_BUCKETS
+))
+ffmpeg_cpu = REGISTRY.register(Counter(
+    'ffmpeg_conversion_cpu_seconds_total', 'User+system CPU time used by FFmpeg conversions.', ('result',)
+))
+notifications = REGISTRY.register(Counter(
+    'notifications_sent_total', 'Email and SMS deliveries by channel and result.', ('channel', 'result')
+))
+notification_duration = REGISTRY.register(Histogram(
+    'notification_send_duration_seconds', 'Time to hand an email or SMS to its provider.', ('channel',)
+))
+
+
+# =============================================================================
+# RECORDING HELPERS
+# =============================================================================
+
+def children_cpu_seconds():
+    """CPU time used by finished child processes of this process"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+@contextmanager
+def track_notification(channel):
+    """
+    Time an email/SMS delivery. The body sets outcome['ok'] to the result;
+    exceptions count as failures.
+    """
+    outcome = {'ok': False}
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        notification_duration.observe(time.perf_counter() - start, channel=channel)
+        notifications.inc(channel=channel, result='success' if outcome['ok'] else 'failure')
+        publish_snapshot()
+
+
+# =============================================================================
+# CROSS-PROCESS SNAPSHOTS
+# =============================================================================
+
+_process_key = None
+_last_published = 0.0
+
+
+def process_key():
+    global _process_key
+    if _process_key is None:
+        _process_key = f'{SNAPSHOT_KEY_PREFIX}:{socket.gethostname()}:{os.getpid()}'
+    return _process_key
+
+
+def publish_snapshot(force=False):
+    """Store this process's metrics in the cache, at most every METRICS_PUBLISH_INTERVAL seconds"""
+    global _last_published
+    now = time.monotonic()
+    interval = getattr(settings, 'METRICS_PUBLISH_INTERVAL', 15)
+    if not force and now - _last_published < interval:
+        return
+    _last_published = now
+
+    key = process_key()
+    try:
+        cache.set(key, REGISTRY.snapshot(), SNAPSHOT_TIMEOUT)
+        keys = cache.get(SNAPSHOT_INDEX_KEY) or []
+        if key not in keys:
+            cache.set(SNAPSHOT_INDEX_KEY, keys + [key], None)
+    except Exception as e:
+        logger.warning(f"Could not publish metrics snapshot: {e}")
+
+
+def other_process_snapshots():
+    """Snapshots published by other live processes"""
+    try:
+        keys = [key for key in cache.get(SNAPSHOT_INDEX_KEY) or [] if key != process_key()]
+        snapshots = cache.get_many(keys)
+    except Exception as e:
+        logger.warning(f"Could not read metrics snapshots: {e}")
+        return []
+
+    expired = [key for key in keys if key not in snapshots]
+    if expired:
+        live = [key for key in cache.get(SNAPSHOT_INDEX_KEY) or [] if key not in expired]
+        cache.set(SNAPSHOT_INDEX_KEY, live, None)
+    return list(snapshots.values())
+
+
+# =============================================================================
+# CELERY
+# =============================================================================
+
+def update_queue_lengths():
+    """Read Celery queue lengths straight from a Redis broker"""
+    broker_url = getattr(settings, 'CELERY_BROKER_URL', '') or ''
+    if not broker_url.startswith(('redis://', 'rediss://')):
+        return
+    try:
+        import redis
+        client = redis.Redis.from_url(broker_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        for queue in getattr(settings, 'METRICS_CELERY_QUEUES', ['celery']):
+            celery_queue_length.set(client.llen(queue), queue=queue)
+    except Exception as e:
+        logger.debug(f"Could not read Celery queue lengths: {e}")
+
+
+_task_starts = {}
+
+
+def _task_prerun(task_id=None, **kwargs):
+    _task_starts[task_id] = time.perf_counter()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    start = _task_starts.pop(task_id, None)
+    name = getattr(task, 'name', 'unknown')
+    if start is not None:
+        celery_task_duration.observe(time.perf_counter() - start, task=name)
+    celery_tasks.inc(task=name, state=state or 'UNKNOWN')
+    publish_snapshot(force=True)
+
+
+def connect_celery_metrics():
+    """Record task durations and outcomes from Celery's task signals"""
+    try:
+        from celery.signals import task_postrun, task_prerun
+    except ImportError:  # pragma: no cover - optional dependency
+        return
+    task_prerun.connect(_task_prerun, weak=False, dispatch_uid='api.metrics.task_prerun')
+    task_postrun.connect(_task_postrun, weak=False, dispatch_uid='api.metrics.task_postrun')
+
+
+def render_metrics():
+    update_queue_lengths()
+    return REGISTRY.render(other_process_snapshots())
@@ -0,0 +1,216 @@
+# server/api/services/otp_store.py
+"""
+One-time passcodes for the email (guest reservation) and SMS (phone login)
+flows.
+
+Codes live outside the database: Redis in production, a process-local
+dictionary for tests and single-process development (OTP_STORE). Only an
+HMAC of each code is stored, keyed by purpose and subject (reservation id,
+phone number), and the entry expires on its own after its TTL.
+
+Issuing and verifying are one Lua script each, so a verification is a
+single round trip: the attempt counter is incremented atomically before
+the code is compared, and a correct code deletes the entry so it cannot be
+replayed.
+"""
+
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'otp'
+CODE_DIGITS = 6
+
+# verify() outcomes
+VERIFIED = 'verified'
+INVALID = 'invalid'
+MISSING = 'missing'
+LOCKED = 'locked'
+
+
+class OTPCooldown(Exception):
+    """A code was issued for this subject too recently to send another"""
+
+
+@dataclass
+class IssuedOTP:
+    code: str
+    expires_at: datetime
+
+
+def generate_code():
+    return ''.join(secrets.choice('0123456789') for _ in range(CODE_DIGITS))
+
+
+def code_digest(purpose, subject, code):
+    message = f"{purpose}:{subject}:{code}".encode('utf-8')
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+def store_key(purpose, subject):
+    return f"{KEY_PREFIX}:{purpose}:{hashlib.sha256(str(subject).encode('utf-8')).hexdigest()[:32]}"
+
+
+class OTPStore:
+    """
+    issue() replaces any earlier code of the subject; with cooldown it
+    refuses (OTPCooldown) while the previous code is younger than that.
+    verify() returns one of VERIFIED, INVALID, MISSING (never issued,
+    expired or already used) and LOCKED (max_attempts exceeded).
+    """
+
+    def issue(self, purpose, subject, ttl, max_attempts, cooldown=0):
+        code = generate_code()
+        stored = self._issue(
+            store_key(purpose, subject), code_digest(purpose, subject, code),
+            int(ttl), int(max_attempts), int(cooldown)
+        )
+        if not stored:
+            raise OTPCooldown('Please wait before requesting a new code')
+        return IssuedOTP(code=code, expires_at=timezone.now() + timedelta(seconds=ttl))
+
+    def verify(self, purpose, subject, code):
+        return self._verify(store_key(purpose, subject), code_digest(purpose, subject, str(code).strip()))
+
+    def discard(self, purpose, subject):
+        self._discard(store_key(purpose, subject))
+
+    def _issue(self, key, digest, ttl, max_attempts, cooldown):
+        raise NotImplementedError
+
+    def _verify(self, key, digest):
+        raise NotImplementedError
+
+    def _discard(self, key):
+        raise NotImplementedError
+
+
+class MemoryOTPStore(OTPStore):
+    """Process-local store for tests and single-process development"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry is not None and entry['expires'] <= now:
+            del self._entries[key]
+            entry = None
+        return entry
+
+    def _issue(self, key, digest, ttl, max_attempts, cooldown):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if cooldown and entry is not None and now - entry['issued_at'] < cooldown:
+                return False
+            self._entries[key] = {
+                'digest': digest, 'max': max_attempts, 'attempts': 0,
+                'issued_at': now, 'expires': now + ttl,
+            }
+        return True
+
+    def _verify(self, key, digest):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            if entry is None:
+                return MISSING
+            entry['attempts'] += 1
+            if entry['attempts'] > entry['max']:
+                return LOCKED
+            if not hmac.compare_digest(entry['digest'], digest):
+                return INVALID
+            del self._entries[key]
+        return VERIFIED
+
+    def _discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# KEYS[1] entry; ARGV: digest, max attempts, ttl, now, cooldown
+ISSUE_SCRIPT = """
+local cooldown = tonumber(ARGV[5])
+if cooldown > 0 then
+    local issued = redis.call('HGET', KEYS[1], 'issued_at')
+    if issued and tonumber(ARGV[4]) - tonumber(issued) < cooldown then
+        return 0
+    end
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'digest', ARGV[1], 'max', ARGV[2], 'attempts', 0, 'issued_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# KEYS[1] entry; ARGV: digest. 1 verified, 0 invalid, -1 missing, -2 locked
+VERIFY_SCRIPT = """
+local entry = redis.call('HMGET', KEYS[1], 'digest', 'max')
+if not entry[1] then
+    return -1
+end
+if redis.call('HINCRBY', KEYS[1], 'attempts', 1) > tonumber(entry[2]) then
+    return -2
+end
+if entry[1] == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+return 0
+"""
+
+VERIFY_OUTCOMES = {1: VERIFIED, 0: INVALID, -1: MISSING, -2: LOCKED}
+
+
+class RedisOTPStore(OTPStore):
+
+    def __init__(self, url):
+        if redis is None:  # pragma: no cover - optional dependency
+            raise RuntimeError('OTP_STORE=redis needs the redis package')
+        self.client = redis.Redis.from_url(url)
+        self._issue_script = self.client.register_script(ISSUE_SCRIPT)
+        self._verify_script = self.client.register_script(VERIFY_SCRIPT)
+
+    def _issue(self, key, digest, ttl, max_attempts, cooldown):
+        return bool(self._issue_script(keys=[key], args=[digest, max_attempts, ttl, int(time.time()), cooldown]))
+
+    def _verify(self, key, digest):
+        return VERIFY_OUTCOMES[int(self._verify_script(keys=[key], args=[digest]))]
+
+    def _discard(self, key):
+        self.client.delete(key)
+
+
+_store = None
+_store_config = None
+
+
+def get_otp_store():
+    """The configured store, created once per process (and per configuration)"""
+    global _store, _store_config
+    config = (settings.OTP_STORE, settings.OTP_REDIS_URL)
+    if _store is None or _store_config != config:
+        if settings.OTP_STORE == 'redis':
+            _store = RedisOTPStore(settings.OTP_REDIS_URL)
+        elif settings.OTP_STORE == 'memory':
+            _store = MemoryOTPStore()
+        else:
+            raise ValueError(f"Unknown OTP_STORE: {settings.OTP_STORE}")
+        _store_config = config
+    return _store
@@ -0,0 +1,135 @@
+# server/api/services/profiling.py
+"""
+Sampled request profiling.
+
+ProfilingMiddleware profiles a random PROFILING_SAMPLE_RATE share of
+requests, plus any request that carries a profiling token issued to a
+staff member (see make_profile_token). Traces are written to PROFILING_DIR:
+cProfile stats as .prof files (open with snakeviz or pstats) or, with
+pyinstrument installed and PROFILING_ENGINE=pyinstrument, HTML reports.
+The oldest traces are removed once the directory grows past
+PROFILING_MAX_BYTES.
+"""
+
+import cProfile
+import logging
+import os
+import re
+import time
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - optional dependency
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = 'api.profiling'
+TRACE_NAME = re.compile(r'^[\w.-]+\.(prof|html)$')
+
+
+def make_profile_token(user):
+    """Signed token that lets a staff member profile their own requests"""
+    return signing.dumps({'user': user.pk}, salt=TOKEN_SALT)
+
+
+def check_profile_token(token):
+    try:
+        signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class Profiler:
+    """Run one request under cProfile or pyinstrument and save the trace"""
+
+    def __init__(self, engine=None):
+        engine = engine or settings.PROFILING_ENGINE
+        if engine == 'pyinstrument' and pyinstrument is None:
+            logger.warning('pyinstrument is not installed, falling back to cProfile')
+            engine = 'cprofile'
+        self.engine = engine
+        self.profiler = pyinstrument.Profiler() if engine == 'pyinstrument' else cProfile.Profile()
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        if self.engine == 'pyinstrument':
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.engine == 'pyinstrument':
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        return False
+
+    def save(self, request):
+        """Write the trace to PROFILING_DIR and return its file name"""
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        slug = re.sub(r'[^\w]+', '-', request.path).strip('-')[:80] or 'root'
+        stamp = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+        extension = 'html' if self.engine == 'pyinstrument' else 'prof'
+        name = f'{stamp}-{request.method}-{slug}-{self.duration_ms:.0f}ms.{extension}'
+
+        if self.engine == 'pyinstrument':
+            (directory / name).write_text(self.profiler.output_html(), encoding='utf-8')
+        else:
+            self.profiler.dump_stats(directory / name)
+
+        enforce_size_cap(directory, settings.PROFILING_MAX_BYTES)
+        return name
+
+
+def enforce_size_cap(directory, max_bytes):
+    """Delete the oldest traces until the directory fits in max_bytes"""
+    traces = sorted(
+        (entry for entry in os.scandir(directory) if TRACE_NAME.match(entry.name)),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    total = sum(entry.stat().st_size for entry in traces)
+    for entry in traces:
+        if total <= max_bytes:
+            break
+        total -= entry.stat().st_size
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def list_traces():
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.is_dir():
+        return []
+    traces = []
+    for entry in os.scandir(directory):
+        if not TRACE_NAME.match(entry.name):
+            continue
+        stat = entry.stat()
+        traces.append({
+            'name': entry.name,
+            'size': stat.st_size,
+            'created_at': datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc).isoformat(),
+        })
+    return sorted(traces, key=lambda trace: trace['created_at'], reverse=True)
+
+
+def trace_path(name):
+    """Path of a stored trace, or None for unknown or unsafe names"""
+    if not TRACE_NAME.match(name):
+        return None
+    path = Path(settings.PROFILING_DIR) / name
+    return path if path.is_file() else None
@@ -0,0 +1,122 @@
+# server/api/services/public_cache.py
+"""
+Response cache for the public read-only API.
+
+Entries are keyed by scheme and host (bodies contain absolute media URLs),
+path, normalized query params and locale, and store
+the rendered bytes together with a content-hash ETag. Each cached route
+depends on one or more tags (model names). Invalidating a tag bumps its
+version, which is part of every dependent cache key, so stale entries are
+simply never read again and expire on their own.
+
+Tag versions live in the default cache, so invalidation only reaches every
+process when that cache is shared (Redis). PUBLIC_CACHE_ENABLED therefore
+defaults to USE_REDIS_CACHE.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'public-cache'
+DEFAULT_LOCALE = 'sq'
+LOCALES = ('sq', 'en')
+
+MENU_TAGS = ['menucategory', 'menuitem', 'menuitemvariant']
+EVENT_TAGS = ['event', 'eventtype', 'venuespace']
+
+# (path regex, tags) for every cached public endpoint
+PUBLIC_CACHE_ROUTES = [
+    (r'^/api/public/events/', EVENT_TAGS),
+    (r'^/api/public/gallery/', ['galleryitem']),
+    (r'^/api/public/menu/', MENU_TAGS),
+    (r'^/api/public/home-sections/', ['homesection']),
+    (r'^/api/public/moments/', ['moment']),
+    (r'^/api/public/info/$', ['restaurantinfo']),
+    (r'^/api/public/pages/[^/]+/$', ['staticcontent']),
+    (r'^/api/public/home-bundle/$', [
+        'homesection', 'moment', 'galleryitem', 'restaurantinfo', *EVENT_TAGS, *MENU_TAGS
+    ]),
+    (r'^/api/events/(upcoming|featured|public|types)/$', EVENT_TAGS),
+    (r'^/api/gallery/(public|categories)/$', ['galleryitem']),
+    (r'^/api/menu/categories/(public|main_categories)/$', MENU_TAGS),
+    (r'^/api/menu/items/(public|by_category)/$', MENU_TAGS),
+]
+_COMPILED_ROUTES = [(re.compile(pattern), tags) for pattern, tags in PUBLIC_CACHE_ROUTES]
+
+
+def tags_for_path(path: str) -> Optional[List[str]]:
+    """Tags of the cached route matching `path`, or None if it is not cached"""
+    for pattern, tags in _COMPILED_ROUTES:
+        if pattern.match(path):
+            return tags
+    return None
+
+
+def normalized_query(query_dict) -> str:
+    """Sorted query string with the locale always present"""
+    params = sorted(
+        (key, value)
+        for key in query_dict
+        for value in query_dict.getlist(key)
+        if key != 'locale'
+    )
+    locale = query_dict.get('locale')
+    params.append(('locale', locale if locale in LOCALES else DEFAULT_LOCALE))
+    return '&'.join(f"{key}={value}" for key, value in params)
+
+
+def _tag_key(tag: str) -> str:
+    return f"{KEY_PREFIX}:tag:{tag}"
+
+
+def _tag_versions(tags: List[str]) -> List[str]:
+    """Current version of each tag, creating missing versions"""
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: str(time.time_ns()) for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def cache_key(path: str, query_dict, tags: List[str], origin: str = '') -> str:
+    """origin is '<scheme>://<host>' of the request"""
+    raw = f"{origin}{path}?{normalized_query(query_dict)}|{','.join(_tag_versions(tags))}"
+    return f"{KEY_PREFIX}:entry:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+def compute_etag(content: bytes) -> str:
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def get_entry(key: str) -> Optional[Dict]:
+    return cache.get(key)
+
+
+def store_entry(key: str, content: bytes, content_type: str, timeout: int) -> Dict:
+    entry = {
+        'content': content,
+        'content_type': content_type,
+        'etag': compute_etag(content),
+        'last_modified': int(time.time()),
+    }
+    cache.set(key, entry, timeout)
+    return entry
+
+
+def invalidate_tags(tags) -> None:
+    """Invalidate every cached response depending on any of `tags`"""
+    tags = set(tags)
+    if not tags:
+        return
+    version = str(time.time_ns())
+    cache.set_many({_tag_key(tag): version for tag in tags}, timeout=None)
+    logger.debug(f"Invalidated public cache tags: {', '.join(sorted(tags))}")
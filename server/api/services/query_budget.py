@@ -0,0 +1,105 @@
+# server/api/services/query_budget.py
+"""
+SQL query recording for per-request budgets and N+1 detection.
+
+QueryRecorder hooks every database connection with an execute wrapper and
+records the number of queries, total SQL time and how often each query
+"shape" ran. A shape (fingerprint) is the SQL with literals and parameter
+lists collapsed, so the same per-row query with different ids counts as
+one repeated shape.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.db import connections
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN \((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so queries differing only in literals compare equal"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class QueryCounter:
+    """
+    Context manager counting and timing queries on all configured databases.
+
+        with QueryCounter() as counter:
+            ...
+        counter.count, counter.duration_ms
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        return False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration_ms += (time.perf_counter() - start) * 1000
+            self.count += 1
+
+
+class QueryRecorder(QueryCounter):
+    """
+    QueryCounter that also fingerprints every statement to find repeats.
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.duration_ms, recorder.repeated(5)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        try:
+            return super().__call__(execute, sql, params, many, context)
+        finally:
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        """(fingerprint, count) pairs that ran more than threshold times, worst first"""
+        return [
+            (shape, count) for shape, count in self.fingerprints.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self):
+        """Server-Timing header value for the recorded queries"""
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"'
+
+    def summary(self, threshold):
+        return {
+            'queries': self.count,
+            'sql_ms': round(self.duration_ms, 1),
+            'repeated': [
+                {'sql': shape[:200], 'count': count}
+                for shape, count in self.repeated(threshold)
+            ],
+        }
@@ -0,0 +1,164 @@
+# server/api/services/reservation_calendar.py
+"""
+Month view of reservation availability.
+
+A month is computed from its SlotInventory rows in one query: every arrival
+slot between opening and closing time is checked against the same limits the
+booking path enforces (services/booking.py), and each day gets a level from
+the share of its slots that still fit the party.
+
+Days outside today .. today + advance_booking_days are 'unavailable'.
+RestaurantInfo.opening_hours may close or re-time single weekdays:
+{"monday": "closed", "friday": {"open": "17:00", "close": "01:00"}}; other
+days use RestaurantSettings.opening_time / closing_time.
+
+Results are cached per (month, party size, today). Every booking change
+bumps its month's version once the transaction commits, and saving the
+restaurant settings or info bumps a version shared by all months.
+"""
+
+import calendar
+import logging
+import time as time_module
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import RestaurantInfo, RestaurantSettings, SlotInventory
+from .booking import slot_bounds
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'reservation-calendar'
+SETTINGS_VERSION = 'settings'
+WEEKDAYS = [name.lower() for name in calendar.day_name]
+
+# Share of a day's slots still open from which it counts as 'available'
+AVAILABLE_SHARE = 0.5
+
+
+def _version_key(name):
+    return f"{KEY_PREFIX}:version:{name}"
+
+
+def _versions(names):
+    keys = [_version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    missing = {key: str(time_module.time_ns()) for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate_month(day):
+    """Drop the cached calendar of day's month once the transaction commits"""
+    month = f"{day:%Y-%m}"
+    transaction.on_commit(lambda: cache.set(_version_key(month), str(time_module.time_ns()), timeout=None))
+
+
+def invalidate_all(**kwargs):
+    """Drop every cached month (opening hours or booking limits changed)"""
+    transaction.on_commit(
+        lambda: cache.set(_version_key(SETTINGS_VERSION), str(time_module.time_ns()), timeout=None)
+    )
+
+
+def _parse_time(value):
+    return datetime.strptime(value, '%H:%M').time()
+
+
+def opening_hours(restaurant, info):
+    """{weekday: (open, close) or None when closed} for Monday .. Sunday"""
+    overrides = (info.opening_hours if info else None) or {}
+    hours = {}
+    for weekday, name in enumerate(WEEKDAYS):
+        override = overrides.get(name, overrides.get(name[:3]))
+        if override in ('closed', False) or (isinstance(override, dict) and override.get('closed')):
+            hours[weekday] = None
+            continue
+        opens, closes = restaurant.opening_time, restaurant.closing_time
+        if isinstance(override, dict):
+            try:
+                opens = _parse_time(override['open']) if override.get('open') else opens
+                closes = _parse_time(override['close']) if override.get('close') else closes
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring invalid opening hours for {name}: {override}")
+        hours[weekday] = (opens, closes)
+    return hours
+
+
+def arrival_slots(day, opens, closes, interval_minutes):
+    """Slot starts from opening until closing time (or midnight when closing after it)"""
+    start = datetime.combine(day, opens)
+    end = datetime.combine(day, closes) if closes > opens else datetime.combine(day + timedelta(days=1), time.min)
+    slots = []
+    while start < end:
+        slots.append(start.time())
+        start += timedelta(minutes=interval_minutes)
+    return slots
+
+
+def day_level(open_slots, total_slots):
+    if not total_slots:
+        return 'closed'
+    if not open_slots:
+        return 'full'
+    return 'available' if open_slots / total_slots >= AVAILABLE_SHARE else 'limited'
+
+
+def build_month(year, month, party_size, restaurant=None, today=None):
+    """[{'date', 'level', 'slots_open', 'slots_total'}] for every day of the month"""
+    restaurant = restaurant or RestaurantSettings.get_settings()
+    today = today or timezone.localdate()
+    last_bookable = today + timedelta(days=restaurant.advance_booking_days)
+    hours = opening_hours(restaurant, RestaurantInfo.objects.first())
+
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    booked = {
+        (row['date'], row['slot_start']): (row['tables_booked'], row['seats_booked'])
+        for row in SlotInventory.objects.filter(
+            date__range=(max(first, today), min(last, last_bookable))
+        ).values('date', 'slot_start', 'tables_booked', 'seats_booked')
+    }
+
+    days = []
+    for offset in range((last - first).days + 1):
+        day = first + timedelta(days=offset)
+        entry = {'date': day.isoformat(), 'level': 'unavailable', 'slots_open': 0, 'slots_total': 0}
+        if today <= day <= last_bookable:
+            day_hours = hours[day.weekday()]
+            slots = arrival_slots(day, *day_hours, restaurant.slot_interval_minutes) if day_hours else []
+            if day == today:
+                now = timezone.localtime().time()
+                slots = [slot for slot in slots if slot > now]
+            open_slots = 0
+            for slot in slots:
+                start, _ = slot_bounds(day, slot, restaurant.slot_interval_minutes)
+                tables, seats = booked.get((day, start), (0, 0))
+                if tables < restaurant.max_tables_per_slot and restaurant.max_capacity - seats >= party_size:
+                    open_slots += 1
+            entry.update(
+                level=day_level(open_slots, len(slots)) if day_hours else 'closed',
+                slots_open=open_slots, slots_total=len(slots)
+            )
+        days.append(entry)
+    return days
+
+
+def month_calendar(year, month, party_size):
+    """Cached build_month() for today's booking window"""
+    today = timezone.localdate()
+    month_name = f"{year:04d}-{month:02d}"
+    versions = ','.join(_versions([month_name, SETTINGS_VERSION]))
+    key = f"{KEY_PREFIX}:{month_name}:{party_size}:{today.isoformat()}:{versions}"
+
+    days = cache.get(key)
+    if days is None:
+        days = build_month(year, month, party_size, today=today)
+        cache.set(key, days, settings.RESERVATION_CALENDAR_CACHE_SECONDS)
+    return days
@@ -0,0 +1,200 @@
+# server/api/services/search.py
+"""
+Ranked prefix search over reservations and customer profiles.
+
+Each searchable model keeps a search_document column: names, email (whole
+and split at punctuation), phone digits and verification code, accent-folded
+and lowercased. Reservation.save() and CustomerProfile.save() maintain it.
+
+The document is indexed per database:
+
+- PostgreSQL: a generated tsvector column (search_vector, 'simple'
+  configuration) with a GIN index, created by migration 0022.
+- SQLite: an FTS5 external-content table (<table>_fts) kept in sync by
+  triggers. SQLite rebuilds tables on many schema changes, dropping the
+  triggers, so ensure_search_index() re-creates and rebuilds them after
+  every migrate (connect_search_index).
+- Anything else: LIKE on search_document, one column instead of four.
+
+Every query term is matched as a token prefix and all terms must match, so
+"ana lek" finds Ana Leka. Type-ahead results are ranked (ts_rank / bm25)
+among the first SEARCH_CANDIDATES matches, which keeps a one-letter query
+as cheap as a precise one.
+"""
+
+import logging
+import re
+import unicodedata
+
+from django.db import connections, router
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CANDIDATES = 2000
+MAX_TERMS = 6
+TYPEAHEAD_LIMIT = 10
+
+_TOKEN_RE = re.compile(r'[0-9a-z]+')
+
+
+def fold(text):
+    """Lowercase and strip accents (ë -> e, ç -> c)"""
+    decomposed = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower().strip()
+
+
+def build_document(*values):
+    """search_document for the given field values"""
+    parts = []
+    for value in values:
+        folded = fold(value)
+        if not folded:
+            continue
+        parts.append(folded)
+        tokens = _TOKEN_RE.findall(folded)
+        if tokens != [folded]:
+            parts.extend(tokens)
+    return ' '.join(dict.fromkeys(parts))
+
+
+def query_terms(query):
+    return _TOKEN_RE.findall(fold(query))[:MAX_TERMS]
+
+
+def _fts_table(model):
+    return f"{model._meta.db_table}_fts"
+
+
+def _fts5_query(terms):
+    return ' AND '.join(f'"{term}"*' for term in terms)
+
+
+def _tsquery(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def search_queryset(queryset, query):
+    """queryset narrowed to rows matching every term of query (ordering kept)"""
+    terms = query_terms(query)
+    if not terms:
+        return queryset.none()
+    model = queryset.model
+    table = model._meta.db_table
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        match = RawSQL(
+            f'"{table}"."search_vector" @@ to_tsquery(\'simple\', %s)', [_tsquery(terms)],
+            output_field=BooleanField()
+        )
+        return queryset.filter(match)
+    if vendor == 'sqlite':
+        fts = _fts_table(model)
+        match = RawSQL(
+            f'"{table}".rowid IN (SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH %s)', [_fts5_query(terms)],
+            output_field=BooleanField()
+        )
+        return queryset.filter(match)
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(search_document__contains=term)
+    return queryset.filter(condition)
+
+
+def ranked_ids(model, query, limit=TYPEAHEAD_LIMIT):
+    """Primary keys of the best matches for query, best first"""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    table = model._meta.db_table
+    pk = model._meta.pk.column
+    db = connections[router.db_for_read(model)]
+    vendor = db.vendor
+
+    if vendor == 'postgresql':
+        sql = (
+            f'SELECT "{pk}" FROM ('
+            f'  SELECT "{pk}", "search_vector" FROM "{table}"'
+            f'  WHERE "search_vector" @@ to_tsquery(\'simple\', %s) LIMIT %s'
+            f') candidates ORDER BY ts_rank("search_vector", to_tsquery(\'simple\', %s)) DESC LIMIT %s'
+        )
+        params = [_tsquery(terms), SEARCH_CANDIDATES, _tsquery(terms), limit]
+    elif vendor == 'sqlite':
+        fts = _fts_table(model)
+        sql = (
+            f'SELECT t."{pk}" FROM ('
+            f'  SELECT rowid, rank FROM "{fts}" WHERE "{fts}" MATCH %s LIMIT %s'
+            f') candidates JOIN "{table}" t ON t.rowid = candidates.rowid ORDER BY candidates.rank LIMIT %s'
+        )
+        params = [_fts5_query(terms), SEARCH_CANDIDATES, limit]
+    else:
+        return list(search_queryset(model.objects.all(), query).values_list('pk', flat=True)[:limit])
+
+    with db.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [model._meta.pk.to_python(row[0]) for row in cursor.fetchall()]
+
+
+def typeahead(queryset, query, limit=TYPEAHEAD_LIMIT):
+    """The best matches as model instances (from queryset, e.g. with only()), best first"""
+    ids = ranked_ids(queryset.model, query, limit)
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+def _searchable_models():
+    from ..models import CustomerProfile, Reservation
+    return [Reservation, CustomerProfile]
+
+
+def ensure_search_index(using=None, rebuild=True, **kwargs):
+    """
+    Create the SQLite FTS5 tables and sync triggers if they are missing and
+    rebuild them from search_document. A no-op on other databases.
+    """
+    db = connections[using or 'default']
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        for model in _searchable_models():
+            table = model._meta.db_table
+            fts = _fts_table(model)
+            columns = {column.name for column in db.introspection.get_table_description(cursor, table)}
+            if 'search_document' not in columns:
+                # Migrated back to before search existed
+                continue
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5('
+                f'search_document, content="{table}", content_rowid="rowid", prefix=\'2 3 4\')'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS "{fts}_insert" AFTER INSERT ON "{table}" BEGIN '
+                f'INSERT INTO "{fts}"(rowid, search_document) VALUES (new.rowid, new.search_document); END'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS "{fts}_delete" AFTER DELETE ON "{table}" BEGIN '
+                f'INSERT INTO "{fts}"("{fts}", rowid, search_document) '
+                f"VALUES ('delete', old.rowid, old.search_document); END"
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS "{fts}_update" AFTER UPDATE OF search_document ON "{table}" BEGIN '
+                f'INSERT INTO "{fts}"("{fts}", rowid, search_document) '
+                f"VALUES ('delete', old.rowid, old.search_document); "
+                f'INSERT INTO "{fts}"(rowid, search_document) VALUES (new.rowid, new.search_document); END'
+            )
+            if rebuild:
+                cursor.execute(f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')')
+
+
+def connect_search_index():
+    """Keep the SQLite search tables in place after every migrate"""
+    from django.apps import apps
+    from django.db.models.signals import post_migrate
+
+    post_migrate.connect(
+        ensure_search_index, sender=apps.get_app_config('api'),
+        dispatch_uid='api.search.ensure_search_index'
+    )
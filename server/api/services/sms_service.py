@@ -1,10 +1,14 @@
 # server/api/services/sms_service.py
 from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta
-import random
-import string
-from ..models import SMSNotification, OTPVerification
+from ..models import SMSNotification
+from . import otp_store
+from .metrics import track_notification
+from .otp_store import OTPCooldown, get_otp_store
+
+OTP_PURPOSE = 'sms'
+OTP_MAX_ATTEMPTS = 3
+OTP_RESEND_COOLDOWN = 60
 
 
 class SMSService:
@@ -55,6 +59,14 @@ class SMSService:
             status='pending'
         )
 
+        with track_notification('sms') as outcome:
+            self._deliver(notification, phone, message)
+            outcome['ok'] = notification.status == 'sent'
+
+        return notification
+
+    def _deliver(self, notification, phone, message):
+        """Send a pending notification and record the result on it"""
         if not self.twilio_enabled:
             # Development mode: just mark as sent
             notification.status = 'sent'
@@ -62,7 +74,7 @@ class SMSService:
             notification.twilio_sid = f'DEV_{notification.id}'
             notification.save()
             print(f'[DEV MODE] SMS to {phone}: {message}')
-            return notification
+            return
 
         try:
             # Send via Twilio
@@ -84,8 +96,6 @@ class SMSService:
             notification.error_message = str(e)
             notification.save()
 
-        return notification
-
     def send_reservation_confirmation(self, reservation):
         """
         Send reservation confirmation SMS
@@ -150,39 +160,29 @@ class SMSService:
             reservation=reservation
         )
 
-    def generate_otp(self, phone, expires_in_minutes=10):
+    def generate_otp(self, phone, expires_in_minutes=10, cooldown_seconds=0):
         """
         Generate and send OTP code
 
         Args:
             phone: Phone number to send OTP to
             expires_in_minutes: How long the OTP is valid (default: 10 minutes)
+            cooldown_seconds: Refuse if the previous code is younger than this
 
         Returns:
-            OTPVerification object
+            IssuedOTP (code, expires_at); any previous code stops working
         """
-        # Generate 6-digit OTP
-        otp_code = ''.join(random.choices(string.digits, k=6))
-
-        # Set expiration time
-        expires_at = timezone.now() + timedelta(minutes=expires_in_minutes)
-
-        # Invalidate any previous OTPs for this phone
-        OTPVerification.objects.filter(
-            phone=phone,
-            is_verified=False
-        ).update(is_verified=True)  # Mark as verified to prevent reuse
-
-        # Create new OTP
-        otp = OTPVerification.objects.create(
-            phone=phone,
-            otp_code=otp_code,
-            expires_at=expires_at
-        )
+        try:
+            otp = get_otp_store().issue(
+                OTP_PURPOSE, phone, ttl=expires_in_minutes * 60,
+                max_attempts=OTP_MAX_ATTEMPTS, cooldown=cooldown_seconds
+            )
+        except OTPCooldown as e:
+            raise ValueError(str(e))
 
         # Send OTP via SMS
         message = (
-            f"Your Sarajet Restaurant verification code is: {otp_code}. "
+            f"Your Sarajet Restaurant verification code is: {otp.code}. "
             f"Valid for {expires_in_minutes} minutes. "
             f"Do not share this code with anyone."
         )
@@ -204,40 +204,16 @@ class SMSService:
             otp_code: OTP code to verify
 
         Returns:
-            tuple: (success: bool, message: str, otp: OTPVerification or None)
+            tuple: (success: bool, message: str)
         """
-        try:
-            # Find the most recent unverified OTP for this phone
-            otp = OTPVerification.objects.filter(
-                phone=phone,
-                is_verified=False
-            ).order_by('-created_at').first()
-
-            if not otp:
-                return False, 'No OTP found for this phone number', None
-
-            # Check if OTP has expired
-            if timezone.now() > otp.expires_at:
-                return False, 'OTP has expired', None
-
-            # Check if too many attempts
-            if otp.attempts >= 3:
-                return False, 'Too many verification attempts', None
-
-            # Increment attempts
-            otp.attempts += 1
-            otp.save()
-
-            # Verify code
-            if otp.otp_code == otp_code:
-                otp.is_verified = True
-                otp.save()
-                return True, 'OTP verified successfully', otp
-            else:
-                return False, 'Invalid OTP code', None
-
-        except Exception as e:
-            return False, f'Verification error: {str(e)}', None
+        outcome = get_otp_store().verify(OTP_PURPOSE, phone, otp_code)
+        if outcome == otp_store.MISSING:
+            return False, 'No valid OTP found for this phone number'
+        if outcome == otp_store.LOCKED:
+            return False, 'Too many verification attempts'
+        if outcome == otp_store.INVALID:
+            return False, 'Invalid OTP code'
+        return True, 'OTP verified successfully'
 
     def resend_otp(self, phone):
         """
@@ -247,19 +223,10 @@ class SMSService:
             phone: Phone number
 
         Returns:
-            OTPVerification object
+            IssuedOTP (code, expires_at)
         """
-        # Check for recent OTPs to prevent spam
-        recent_otp = OTPVerification.objects.filter(
-            phone=phone,
-            created_at__gte=timezone.now() - timedelta(minutes=1)
-        ).first()
-
-        if recent_otp:
-            raise ValueError('Please wait before requesting a new OTP')
-
-        # Generate new OTP
-        return self.generate_otp(phone)
+        # One code per minute to prevent spam
+        return self.generate_otp(phone, cooldown_seconds=OTP_RESEND_COOLDOWN)
 
     def get_notification_history(self, phone=None, reservation=None, limit=10):
         """
@@ -0,0 +1,124 @@
+# server/api/services/translation_coverage.py
+"""
+Set-based translation completeness for translatable models.
+
+Statuses and coverage are computed for a whole queryset with one query
+over Translation instead of several queries per object. A field is
+required when it is declared in the model's TRANSLATABLE_FIELDS and has
+source text; it is covered when a published translation exists for it.
+"""
+
+from typing import Dict, Iterable, List
+
+from django.contrib.contenttypes.models import ContentType
+
+from ..models import Translation
+
+
+def _required_fields(obj, fields: List[str]) -> List[str]:
+    """Declared translatable fields that have source text"""
+    required = []
+    for field_name in fields:
+        value = obj[field_name] if isinstance(obj, dict) else getattr(obj, field_name, None)
+        if value and str(value).strip():
+            required.append(field_name)
+    return required
+
+
+def _translated_fields(model, locale: str, fields: List[str], object_ids=None) -> Dict:
+    """{object_id: {field_name: status}} of the model's translations, in one query"""
+    translations = Translation.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), locale=locale, field_name__in=fields
+    )
+    if object_ids is not None:
+        translations = translations.filter(object_id__in=object_ids)
+    translated: Dict = {}
+    for row in translations.values('object_id', 'field_name', 'status'):
+        translated.setdefault(row['object_id'], {})[row['field_name']] = row['status']
+    return translated
+
+
+def _status(required: List[str], existing: Dict[str, str]) -> str:
+    """Status from which required fields are translated and published"""
+    if all(existing.get(field_name) == 'published' for field_name in required):
+        return 'complete'
+    if not any(field_name in existing for field_name in required):
+        return 'missing'
+    return 'partial'
+
+
+def translation_status_map(objects: Iterable, locale: str) -> Dict:
+    """
+    Translation status ('missing', 'partial' or 'complete') for every object,
+    keyed by primary key. All objects must be instances of the same model.
+    """
+    objects = list(objects)
+    if not objects:
+        return {}
+
+    model = type(objects[0])
+    fields = model.TRANSLATABLE_FIELDS
+    translated = _translated_fields(model, locale, fields, [obj.pk for obj in objects])
+    return {
+        obj.pk: _status(_required_fields(obj, fields), translated.get(obj.pk, {}))
+        for obj in objects
+    }
+
+
+def missing_fields_report(model, locale: str) -> List[Dict]:
+    """
+    List the objects of `model` whose required fields are not all published
+    in `locale`, with the missing and unpublished field names.
+    """
+    fields = model.TRANSLATABLE_FIELDS
+    if not fields:
+        return []
+
+    translated = _translated_fields(model, locale, fields)
+
+    report = []
+    for obj in model.objects.values('pk', *fields).iterator():
+        existing = translated.get(obj['pk'], {})
+        missing, unpublished = [], []
+        for field_name in _required_fields(obj, fields):
+            field_status = existing.get(field_name)
+            if field_status is None:
+                missing.append(field_name)
+            elif field_status != 'published':
+                unpublished.append(field_name)
+        if missing or unpublished:
+            report.append({
+                'object_id': str(obj['pk']),
+                'missing': missing,
+                'unpublished': unpublished,
+            })
+    return report
+
+
+def coverage_summary(model, locale: str) -> Dict:
+    """
+    Object statuses and field coverage for one model and locale. Only
+    published translations of an object's required fields count.
+    """
+    fields = model.TRANSLATABLE_FIELDS
+    translated = _translated_fields(model, locale, fields) if fields else {}
+
+    counts = {'complete': 0, 'partial': 0, 'missing': 0}
+    objects = required = published = 0
+    for obj in model.objects.values('pk', *fields).iterator():
+        objects += 1
+        obj_required = _required_fields(obj, fields)
+        existing = translated.get(obj['pk'], {})
+        counts[_status(obj_required, existing)] += 1
+        required += len(obj_required)
+        published += sum(existing.get(field_name) == 'published' for field_name in obj_required)
+
+    return {
+        'model': model._meta.model_name,
+        'locale': locale,
+        'objects': objects,
+        **counts,
+        'required_fields': required,
+        'published_fields': published,
+        'coverage': round(published / required * 100, 1) if required else 100.0,
+    }
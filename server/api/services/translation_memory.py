@@ -0,0 +1,153 @@
+# server/api/services/translation_memory.py
+"""
+Translation memory: a store of previously translated strings.
+
+Source text is normalized (unicode NFC, collapsed whitespace) and hashed so
+repeated strings such as ingredient lists or event boilerplate are only
+sent to a provider once per locale pair. Approved human translations are
+written back into the memory and take precedence over machine output.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+
+from ..models import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+HUMAN_PROVIDER = 'human'
+MEMORY_PROVIDER = 'memory'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normalize source text for memory lookups. Case is preserved."""
+    text = unicodedata.normalize('NFC', str(text))
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class TranslationMemoryStore:
+    """Database-backed translation memory"""
+
+    def lookup(self, texts: List[str], source_locale: str, target_locale: str) -> Dict[str, TranslationMemory]:
+        """
+        Find memory entries for `texts` with a single query.
+        Returns a dict of source hash -> TranslationMemory.
+        """
+        hashes = {source_hash(text) for text in texts}
+        if not hashes:
+            return {}
+
+        entries = {
+            entry.source_hash: entry
+            for entry in TranslationMemory.objects.filter(
+                source_locale=source_locale,
+                target_locale=target_locale,
+                source_hash__in=hashes,
+            )
+        }
+        if entries:
+            TranslationMemory.objects.filter(
+                pk__in=[entry.pk for entry in entries.values()]
+            ).update(hit_count=F('hit_count') + 1)
+        return entries
+
+    def store(self, pairs: Iterable[tuple], source_locale: str, target_locale: str, provider: str):
+        """
+        Remember machine translations given as (source_text, translated_text)
+        pairs. Existing entries, including human ones, are left untouched.
+        """
+        entries = self._build_entries(pairs, source_locale, target_locale, provider, is_human=False)
+        if entries:
+            TranslationMemory.objects.bulk_create(entries, ignore_conflicts=True)
+
+    def store_human(self, pairs: Iterable[tuple], source_locale: str, target_locale: str):
+        """Remember approved human translations, replacing any machine entry"""
+        entries = self._build_entries(pairs, source_locale, target_locale, HUMAN_PROVIDER, is_human=True)
+        if entries:
+            TranslationMemory.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=['source_locale', 'target_locale', 'source_hash'],
+                update_fields=['translated_text', 'provider', 'is_human', 'updated_at'],
+            )
+
+    def _build_entries(self, pairs, source_locale, target_locale, provider, is_human) -> List[TranslationMemory]:
+        entries = {}
+        for source_text, translated_text in pairs:
+            if not source_text or not str(source_text).strip() or not translated_text:
+                continue
+            key = source_hash(source_text)
+            entries[key] = TranslationMemory(
+                source_locale=source_locale,
+                target_locale=target_locale,
+                source_hash=key,
+                source_text=normalize_text(source_text),
+                translated_text=translated_text,
+                provider=provider,
+                is_human=is_human,
+            )
+        return list(entries.values())
+
+
+def _source_objects(translations) -> Dict[tuple, object]:
+    """{(content_type_id, str(object_id)): object}, one query per content type"""
+    ids_by_type = defaultdict(set)
+    for translation in translations:
+        ids_by_type[translation.content_type_id].add(translation.object_id)
+
+    objects = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        for pk, obj in model._base_manager.in_bulk(object_ids).items():
+            objects[(content_type_id, str(pk))] = obj
+    return objects
+
+
+def learn_from_translations(translations: Iterable, source_locale: str = 'sq') -> int:
+    """
+    Feed approved or published human translations back into the memory.
+
+    The source text is read from the translated object's field. Auto
+    translations and drafts are ignored. Returns the number of entries written.
+    """
+    translations = [
+        translation for translation in translations
+        if translation.status in ('approved', 'published')
+        and not (translation.translated_by or '').startswith('auto:')
+        and translation.locale != source_locale
+    ]
+    objects = _source_objects(translations)
+
+    pairs_by_locale: Dict[str, List[tuple]] = {}
+    for translation in translations:
+        obj = objects.get((translation.content_type_id, str(translation.object_id)))
+        if obj is None:
+            continue
+        source_text = getattr(obj, translation.field_name, None)
+        if not isinstance(source_text, str):
+            continue
+        pairs_by_locale.setdefault(translation.locale, []).append(
+            (source_text, translation.translated_text)
+        )
+
+    store = TranslationMemoryStore()
+    written = 0
+    for locale, pairs in pairs_by_locale.items():
+        store.store_human(pairs, source_locale, locale)
+        written += len(pairs)
+    return written
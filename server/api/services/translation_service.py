@@ -2,20 +2,129 @@
 """
 Translation service for auto-translate functionality.
 Supports multiple providers with fallback to copy mode.
+
+Provider health is probed lazily and cached for a short TTL, and a simple
+circuit breaker stops hammering a provider that keeps failing. HTTP calls
+go through a pooled keep-alive session.
+
+Before any provider is called the translation memory is consulted, and
+successful provider translations are stored back into it.
 """
 
 import os
+import time
+import threading
 import requests
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 
+def _result(text, is_auto_translated, needs_review, provider, error=None) -> Dict:
+    """Build a translation result dict in the shape used by all providers"""
+    return {
+        'translated_text': text,
+        'is_auto_translated': is_auto_translated,
+        'needs_review': needs_review,
+        'provider': provider,
+        'error': error
+    }
+
+
+def build_http_session(pool_size: int = 10) -> requests.Session:
+    """Create a requests session with a keep-alive connection pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class ProviderHealth:
+    """
+    Cached provider availability with a circuit breaker.
+
+    - A successful probe is trusted for `ttl` seconds.
+    - Failed probes and failed calls count towards the breaker. After
+      `failure_threshold` consecutive failures the circuit opens and the
+      provider is reported unavailable for `cooldown` seconds without any
+      network calls. After the cooldown one probe is allowed through.
+    """
+
+    def __init__(self, ttl: float = 60, failure_threshold: int = 3, cooldown: float = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._available = None
+        self._checked_at = 0.0
+        self._failures = 0
+        self._opened_at = None
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._is_open()
+
+    def _is_open(self) -> bool:
+        if self._opened_at is None:
+            return False
+        return self._clock() - self._opened_at < self.cooldown
+
+    def check(self, probe: Callable[[], bool]) -> bool:
+        """Return cached availability, probing only when the cache is stale"""
+        with self._lock:
+            if self._is_open():
+                return False
+            now = self._clock()
+            if self._available and now - self._checked_at < self.ttl:
+                return True
+
+        ok = probe()
+
+        with self._lock:
+            self._available = ok
+            self._checked_at = self._clock()
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+            else:
+                self._register_failure()
+        return ok
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._available = True
+            self._checked_at = self._clock()
+
+    def record_failure(self):
+        with self._lock:
+            self._register_failure()
+
+    def _register_failure(self):
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            self._available = False
+            self._checked_at = self._opened_at
+            logger.warning(
+                f"Translation provider circuit opened after {self._failures} failures"
+            )
+
+
 class TranslationProvider(ABC):
     """Abstract base class for translation providers"""
 
+    name = 'none'
+
     @abstractmethod
     def translate(self, text: str, source_lang: str, target_lang: str) -> Dict:
         """
@@ -37,6 +146,13 @@ class TranslationProvider(ABC):
         """Check if the provider is configured and available"""
         pass
 
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[Dict]:
+        """
+        Translate several texts. Providers that support batching in a single
+        request override this; the default translates one by one.
+        """
+        return [self.translate(text, source_lang, target_lang) for text in texts]
+
 
 class LibreTranslateProvider(TranslationProvider):
     """
@@ -44,33 +160,48 @@ class LibreTranslateProvider(TranslationProvider):
     See: https://github.com/LibreTranslate/LibreTranslate
     """
 
-    def __init__(self, url: str, api_key: Optional[str] = None):
+    name = 'libretranslate'
+
+    def __init__(self, url: str, api_key: Optional[str] = None,
+                 session: Optional[requests.Session] = None,
+                 health: Optional[ProviderHealth] = None,
+                 probe_timeout: float = 5, translate_timeout: float = 30):
         self.url = url.rstrip('/')
         self.api_key = api_key
+        self.session = session or build_http_session()
+        self.health = health or ProviderHealth()
+        self.probe_timeout = probe_timeout
+        self.translate_timeout = translate_timeout
 
-    def is_available(self) -> bool:
-        if not self.url:
-            return False
+    def _probe(self) -> bool:
         try:
-            response = requests.get(f"{self.url}/languages", timeout=5)
+            response = self.session.get(f"{self.url}/languages", timeout=self.probe_timeout)
             return response.status_code == 200
         except Exception as e:
             logger.warning(f"LibreTranslate not available: {e}")
             return False
 
+    def is_available(self) -> bool:
+        if not self.url:
+            return False
+        return self.health.check(self._probe)
+
     def translate(self, text: str, source_lang: str, target_lang: str) -> Dict:
         if not text or not text.strip():
-            return {
-                'translated_text': text,
-                'is_auto_translated': False,
-                'needs_review': False,
-                'provider': 'none',
-                'error': None
-            }
+            return _result(text, False, False, 'none')
+        return self.translate_batch([text], source_lang, target_lang)[0]
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[Dict]:
+        """Translate all texts in a single /translate request"""
+        if not texts:
+            return []
+
+        def failed(error):
+            return [_result(text, False, True, self.name, error) for text in texts]
 
         try:
             payload = {
-                'q': text,
+                'q': texts if len(texts) > 1 else texts[0],
                 'source': source_lang,
                 'target': target_lang,
                 'format': 'text'
@@ -78,49 +209,38 @@ class LibreTranslateProvider(TranslationProvider):
             if self.api_key:
                 payload['api_key'] = self.api_key
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.url}/translate",
                 json=payload,
-                timeout=30
+                timeout=self.translate_timeout
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'translated_text': data.get('translatedText', text),
-                    'is_auto_translated': True,
-                    'needs_review': True,
-                    'provider': 'libretranslate',
-                    'error': None
-                }
-            else:
+            if response.status_code != 200:
                 logger.error(f"LibreTranslate error: {response.status_code} - {response.text}")
-                return {
-                    'translated_text': text,
-                    'is_auto_translated': False,
-                    'needs_review': True,
-                    'provider': 'libretranslate',
-                    'error': f"API error: {response.status_code}"
-                }
+                if response.status_code >= 500:
+                    self.health.record_failure()
+                return failed(f"API error: {response.status_code}")
+
+            translated = response.json().get('translatedText')
+            if not isinstance(translated, list):
+                translated = [translated]
+            if len(translated) != len(texts):
+                return failed('Unexpected response from translation API')
+
+            self.health.record_success()
+            return [
+                _result(out if out is not None else text, True, True, self.name)
+                for text, out in zip(texts, translated)
+            ]
 
         except requests.exceptions.Timeout:
             logger.error("LibreTranslate timeout")
-            return {
-                'translated_text': text,
-                'is_auto_translated': False,
-                'needs_review': True,
-                'provider': 'libretranslate',
-                'error': 'Translation timeout'
-            }
+            self.health.record_failure()
+            return failed('Translation timeout')
         except Exception as e:
             logger.error(f"LibreTranslate error: {e}")
-            return {
-                'translated_text': text,
-                'is_auto_translated': False,
-                'needs_review': True,
-                'provider': 'libretranslate',
-                'error': str(e)
-            }
+            self.health.record_failure()
+            return failed(str(e))
 
 
 class CopyFallbackProvider(TranslationProvider):
@@ -129,79 +249,162 @@ class CopyFallbackProvider(TranslationProvider):
     Useful for development or when translation service is unavailable.
     """
 
+    name = 'copy_fallback'
+
     def is_available(self) -> bool:
         return True  # Always available as fallback
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> Dict:
-        return {
-            'translated_text': text,
-            'is_auto_translated': False,
-            'needs_review': True,
-            'provider': 'copy_fallback',
-            'error': None
-        }
+        return _result(text, False, True, self.name)
 
 
 class TranslationService:
     """Main translation service that manages providers"""
 
-    def __init__(self):
+    # Translation memory store; None disables memory lookups
+    memory = None
+
+    # Normalize language codes
+    LANG_MAP = {
+        'sq': 'sq',  # Albanian
+        'en': 'en',  # English
+    }
+
+    def __init__(self, use_memory: bool = True):
         self.providers = []
         self._initialize_providers()
+        if use_memory and os.environ.get('TRANSLATION_MEMORY_ENABLED', 'true').lower() != 'false':
+            from .translation_memory import TranslationMemoryStore
+            self.memory = TranslationMemoryStore()
 
     def _initialize_providers(self):
-        """Initialize available translation providers"""
+        """
+        Register configured translation providers.
+        Availability is not probed here; it is checked lazily on first use.
+        """
 
         # Check for LibreTranslate
         libre_url = os.environ.get('LIBRETRANSLATE_URL', os.environ.get('SELF_HOSTED_TRANSLATE_URL'))
         libre_key = os.environ.get('LIBRETRANSLATE_API_KEY')
 
         if libre_url:
-            provider = LibreTranslateProvider(libre_url, libre_key)
-            if provider.is_available():
-                self.providers.append(provider)
-                logger.info(f"LibreTranslate provider initialized: {libre_url}")
+            health = ProviderHealth(
+                ttl=float(os.environ.get('TRANSLATION_HEALTH_TTL', 60)),
+                failure_threshold=int(os.environ.get('TRANSLATION_FAILURE_THRESHOLD', 3)),
+                cooldown=float(os.environ.get('TRANSLATION_CIRCUIT_COOLDOWN', 30)),
+            )
+            self.providers.append(LibreTranslateProvider(libre_url, libre_key, health=health))
+            logger.info(f"LibreTranslate provider registered: {libre_url}")
 
         # Always add copy fallback as last resort
         self.providers.append(CopyFallbackProvider())
 
+    def _normalize(self, lang: str) -> str:
+        return self.LANG_MAP.get(lang, lang)
+
     def translate(self, text: str, source_lang: str, target_lang: str) -> Dict:
         """
         Translate text using available providers.
         Falls back to next provider if one fails.
         """
         if not text or not text.strip():
-            return {
-                'translated_text': text,
-                'is_auto_translated': False,
-                'needs_review': False,
-                'provider': 'none',
-                'error': None
-            }
+            return _result(text, False, False, 'none')
+        return self._translate_many([text], source_lang, target_lang)[0]
+
+    def _translate_many(self, texts: List[str], source_lang: str, target_lang: str) -> List[Dict]:
+        """
+        Translate non-empty texts. Memory hits are served without a provider
+        call; the rest are sent to the providers in one batch per provider.
+        """
+        source = self._normalize(source_lang)
+        target = self._normalize(target_lang)
 
-        # Normalize language codes
-        lang_map = {
-            'sq': 'sq',  # Albanian
-            'en': 'en',  # English
-        }
-        source = lang_map.get(source_lang, source_lang)
-        target = lang_map.get(target_lang, target_lang)
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending = list(range(len(texts)))
+
+        if self.memory is not None:
+            pending = self._apply_memory(texts, pending, results, source, target)
+        memory_misses = list(pending)
 
         for provider in self.providers:
-            if provider.is_available():
-                result = provider.translate(text, source, target)
-                if not result.get('error'):
-                    return result
-                logger.warning(f"Provider {result.get('provider')} failed: {result.get('error')}")
-
-        # Should never reach here as CopyFallbackProvider always works
-        return {
-            'translated_text': text,
-            'is_auto_translated': False,
-            'needs_review': True,
-            'provider': 'none',
-            'error': 'No translation providers available'
-        }
+            if not pending:
+                break
+            if not provider.is_available():
+                continue
+            batch = provider.translate_batch([texts[i] for i in pending], source, target)
+            still_pending = []
+            for index, result in zip(pending, batch):
+                if result.get('error'):
+                    logger.warning(f"Provider {result.get('provider')} failed: {result.get('error')}")
+                    still_pending.append(index)
+                else:
+                    results[index] = result
+            pending = still_pending
+
+        # Should never happen as CopyFallbackProvider always works
+        for index in pending:
+            results[index] = _result(
+                texts[index], False, True, 'none', 'No translation providers available'
+            )
+
+        if self.memory is not None:
+            self._remember(texts, memory_misses, results, source, target)
+        return results
+
+    def _apply_memory(self, texts, pending, results, source, target) -> List[int]:
+        """Fill results from translation memory, returning indexes still pending"""
+        from .translation_memory import source_hash, MEMORY_PROVIDER
+        try:
+            entries = self.memory.lookup([texts[i] for i in pending], source, target)
+        except Exception as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+            return pending
+
+        still_pending = []
+        for index in pending:
+            entry = entries.get(source_hash(texts[index]))
+            if entry is None:
+                still_pending.append(index)
+            else:
+                # Human entries are already reviewed
+                results[index] = _result(
+                    entry.translated_text, not entry.is_human, not entry.is_human, MEMORY_PROVIDER
+                )
+        return still_pending
+
+    def _remember(self, texts, indexes, results, source, target):
+        """Store successful machine translations in translation memory"""
+        by_provider: Dict[str, List[tuple]] = {}
+        for index in indexes:
+            result = results[index]
+            if result['is_auto_translated'] and not result.get('error'):
+                by_provider.setdefault(result['provider'], []).append(
+                    (texts[index], result['translated_text'])
+                )
+        try:
+            for provider, pairs in by_provider.items():
+                self.memory.store(pairs, source, target, provider)
+        except Exception as e:
+            logger.warning(f"Translation memory store failed: {e}")
+
+    def translate_texts(self, texts: List[str], source_lang: str, target_lang: str) -> List[Dict]:
+        """
+        Translate a list of texts, batching the non-empty ones into as few
+        provider calls as possible. Results are returned in input order.
+        """
+        results: List[Optional[Dict]] = [None] * len(texts)
+        indexes = []
+        for index, text in enumerate(texts):
+            if not text or not str(text).strip():
+                results[index] = _result(text, False, False, 'none')
+            else:
+                indexes.append(index)
+
+        if indexes:
+            translated = self._translate_many([texts[i] for i in indexes], source_lang, target_lang)
+            for index, result in zip(indexes, translated):
+                results[index] = result
+        return results
 
     def translate_fields(
         self,
@@ -211,6 +414,7 @@ class TranslationService:
     ) -> Dict[str, Dict]:
         """
         Translate multiple fields at once.
+        All non-empty fields are sent to the provider in a single batch.
 
         Args:
             fields: Dictionary of field_name -> text
@@ -220,29 +424,30 @@ class TranslationService:
         Returns:
             Dictionary of field_name -> translation result
         """
-        results = {}
-        for field_name, text in fields.items():
-            results[field_name] = self.translate(text, source_lang, target_lang)
-        return results
+        field_names = list(fields)
+        translated = self.translate_texts(
+            [fields[name] for name in field_names], source_lang, target_lang
+        )
+        return dict(zip(field_names, translated))
 
     def get_active_provider(self) -> Optional[str]:
         """Get the name of the first available provider"""
         for provider in self.providers:
             if provider.is_available():
-                if isinstance(provider, LibreTranslateProvider):
-                    return 'libretranslate'
-                elif isinstance(provider, CopyFallbackProvider):
-                    return 'copy_fallback'
+                return provider.name
         return None
 
 
 # Singleton instance
 _translation_service = None
+_translation_service_lock = threading.Lock()
 
 
 def get_translation_service() -> TranslationService:
     """Get or create the translation service singleton"""
     global _translation_service
     if _translation_service is None:
-        _translation_service = TranslationService()
+        with _translation_service_lock:
+            if _translation_service is None:
+                _translation_service = TranslationService()
     return _translation_service
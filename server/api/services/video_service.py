@@ -7,9 +7,12 @@ import subprocess
 import logging
 import uuid
 import json
+import time
 from pathlib import Path
 from django.conf import settings
 
+from .metrics import children_cpu_seconds, ffmpeg_cpu, ffmpeg_wall
+
 logger = logging.getLogger(__name__)
 
 
@@ -203,12 +206,24 @@ def convert_mp4_to_webm(input_path, output_path, quality='medium'):
 
         logger.info(f"Starting video conversion: {input_path} -> {output_path}")
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        outcome = 'error'
+        wall_start = time.perf_counter()
+        cpu_start = children_cpu_seconds()
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            outcome = 'success' if result.returncode == 0 else 'failure'
+        except subprocess.TimeoutExpired:
+            outcome = 'timeout'
+            raise
+        finally:
+            # Wall and CPU time of this FFmpeg run (CPU from the child's rusage)
+            ffmpeg_wall.observe(time.perf_counter() - wall_start, result=outcome)
+            ffmpeg_cpu.inc(max(children_cpu_seconds() - cpu_start, 0.0), result=outcome)
 
         if result.returncode != 0:
             error_msg = result.stderr or "Unknown conversion error"
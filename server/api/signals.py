@@ -0,0 +1,120 @@
+# server/api/signals.py
+"""
+Application signals.
+
+content_changed is sent once per batch of content changes (publishing,
+translation upserts, ...) so caches can be invalidated per batch rather
+than per row. Single-row saves and deletes of public content invalidate
+the public response cache through post_save / post_delete.
+
+Deleting a reservation gives its seats back to SlotInventory through
+post_delete, in the transaction of the delete; restaurant settings and
+info saves drop the cached availability calendar.
+"""
+
+from django.db import transaction
+from django.dispatch import Signal
+
+# Arguments: models (list of model classes), object_ids (list or None),
+# locales (list or None). None means "any".
+content_changed = Signal()
+
+
+def notify_content_changed(sender, models, object_ids=None, locales=None):
+    """Send a single content_changed event once the current transaction commits"""
+    models = list(dict.fromkeys(models))
+    object_ids = [str(pk) for pk in object_ids] if object_ids is not None else None
+
+    transaction.on_commit(lambda: content_changed.send(
+        sender=sender,
+        models=models,
+        object_ids=object_ids,
+        locales=locales,
+    ))
+
+
+def _cached_models():
+    from .models import (
+        Event, EventType, VenueSpace, GalleryItem, MenuCategory, MenuItem,
+        MenuItemVariant, HomeSection, Moment, RestaurantInfo, StaticContent
+    )
+    return [
+        Event, EventType, VenueSpace, GalleryItem, MenuCategory, MenuItem,
+        MenuItemVariant, HomeSection, Moment, RestaurantInfo, StaticContent
+    ]
+
+
+def invalidate_public_cache_for_instance(sender, instance, **kwargs):
+    """Invalidate cached public responses after a content row changes"""
+    from .models import Translation
+    from .services.public_cache import invalidate_tags
+
+    if isinstance(instance, Translation):
+        tags = [instance.content_type.model]
+    else:
+        tags = [sender._meta.model_name]
+    transaction.on_commit(lambda: invalidate_tags(tags))
+
+
+def invalidate_public_cache_for_batch(sender, models, **kwargs):
+    """Invalidate cached public responses once per content_changed batch"""
+    from .services.public_cache import invalidate_tags
+    invalidate_tags(model._meta.model_name for model in models)
+
+
+def connect_cache_invalidation():
+    from django.db.models.signals import post_save, post_delete
+    from .models import Translation
+
+    for model in _cached_models() + [Translation]:
+        post_save.connect(
+            invalidate_public_cache_for_instance, sender=model,
+            dispatch_uid=f'public_cache_save_{model._meta.model_name}'
+        )
+        post_delete.connect(
+            invalidate_public_cache_for_instance, sender=model,
+            dispatch_uid=f'public_cache_delete_{model._meta.model_name}'
+        )
+    content_changed.connect(
+        invalidate_public_cache_for_batch, dispatch_uid='public_cache_batch'
+    )
+
+
+def lock_deleted_reservation(sender, instance, **kwargs):
+    """Lock the row being deleted and remember the seats it actually holds"""
+    from .services.booking import lock_reservation
+
+    stored = lock_reservation(instance.pk)
+    instance._deleted_footprint = stored.booking_footprint() if stored is not None else None
+
+
+def release_deleted_reservation(sender, instance, **kwargs):
+    """Give a deleted reservation's seats back to its slot"""
+    from .services.booking import move_booking
+
+    booked = getattr(instance, '_deleted_footprint', None)
+    if booked is not None:
+        move_booking(booked, None)
+
+
+def connect_slot_inventory():
+    from django.db.models.signals import post_delete, post_save, pre_delete
+    from .models import Reservation, RestaurantInfo, RestaurantSettings
+    from .services.reservation_calendar import invalidate_all
+
+    # pre_delete runs inside the deletion's transaction, so the row stays
+    # locked until post_delete has moved its seats
+    pre_delete.connect(
+        lock_deleted_reservation, sender=Reservation,
+        dispatch_uid='slot_inventory_lock_deleted_reservation'
+    )
+    post_delete.connect(
+        release_deleted_reservation, sender=Reservation,
+        dispatch_uid='slot_inventory_delete_reservation'
+    )
+    # Opening hours and booking limits shape every month of the calendar
+    for model in (RestaurantSettings, RestaurantInfo):
+        post_save.connect(
+            invalidate_all, sender=model,
+            dispatch_uid=f'reservation_calendar_{model._meta.model_name}'
+        )
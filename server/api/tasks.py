@@ -120,3 +120,45 @@ def convert_event_video_to_webm(self, event_id):
             raise self.retry(exc=e)
 
         return {'status': 'error', 'message': str(e)}
+
+
+@shared_task(bind=True)
+def auto_translate_catalog(self, target_locale, source_locale='sq', models=None, include_stale=True):
+    """
+    Background task to auto-translate every missing or stale catalog field.
+
+    Args:
+        target_locale: Locale to translate into (e.g. 'en')
+        source_locale: Locale of the source fields (default 'sq')
+        models: Optional list of model names to limit the run to
+        include_stale: Re-translate auto-translations older than their source
+
+    Returns:
+        dict: Summary of the run (see translate_catalog)
+    """
+    from .services.catalog_translation import translate_catalog
+
+    def report_progress(done, total):
+        self.update_state(state='PROGRESS', meta={
+            'done': done,
+            'total': total,
+            'target_locale': target_locale,
+        })
+
+    return translate_catalog(
+        target_locale,
+        source_locale=source_locale,
+        model_names=models,
+        include_stale=include_stale,
+        progress=report_progress,
+    )
+
+
+@shared_task
+def release_expired_reservation_holds():
+    """
+    Periodic task: cancel unverified guest reservations whose seat hold has
+    expired (see services/booking.py). Scheduled in CELERY_BEAT_SCHEDULE.
+    """
+    from .services.booking import release_expired_holds
+    return release_expired_holds()
@@ -0,0 +1,37 @@
+# server/api/testing.py
+"""
+Test helpers.
+"""
+
+from contextlib import contextmanager
+
+from .services.query_budget import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that fails when a block of code exceeds its query budget.
+
+        with self.assertQueryBudget(max_queries=8, max_repeats=2):
+            self.client.get('/api/public/home-bundle/')
+
+    max_repeats is the number of times any single query shape may run;
+    going over it usually means an N+1 loop.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries=None, max_repeats=None):
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        if max_queries is not None and recorder.count > max_queries:
+            shapes = '\n'.join(
+                f'  {count}x {shape}' for shape, count in recorder.fingerprints.most_common(10)
+            )
+            self.fail(f'{recorder.count} queries executed, budget is {max_queries}:\n{shapes}')
+
+        if max_repeats is not None:
+            repeated = recorder.repeated(max_repeats)
+            if repeated:
+                shapes = '\n'.join(f'  {count}x {shape}' for shape, count in repeated)
+                self.fail(f'Query shapes repeated more than {max_repeats} times:\n{shapes}')
@@ -1,6 +1,58 @@
 import requests
 import json
-from datetime import datetime, timedelta
+import gzip
+import importlib
+import io
+import os
+import runpy
+import shutil
+import tempfile
+import threading
+import time as time_module
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from decimal import Decimal
+from unittest import mock
+
+import brotli
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from api import db_routers
+from api.middleware import CompressionMiddleware
+from api.models import (
+    ClientConversation, ClientMessage, CustomerProfile, Event, HomeSection, MenuCategory, MenuItem, Reservation,
+    RestaurantInfo, RestaurantSettings, SlotInventory, SMSNotification, Translation, TranslationMemory
+)
+from api.renderers import ORJSONRenderer
+from api.testing import QueryBudgetMixin
+from api.throttling import OTPPhoneThrottle, SlidingWindowThrottle
+from api.serializers import CustomerProfileSerializer, HomeSectionSerializer, ReservationSerializer
+from api.signals import content_changed
+from api.services.catalog_translation import translate_catalog
+from api.services import booking, exports, metrics, otp_store, profiling, search
+from api.services.query_budget import fingerprint
+from api.services.translation_coverage import coverage_summary, missing_fields_report, translation_status_map
+from api.services.translation_memory import TranslationMemoryStore, learn_from_translations
+from api.services.translation_service import (
+    LibreTranslateProvider, ProviderHealth, TranslationService, CopyFallbackProvider
+)
 
 BASE_URL = "http://localhost:8000/api"
 
@@ -114,5 +166,1566 @@ def test_api():
     print("2. Start your React frontend and test the full flow")
     print("3. Check the database for the test entries")
 
+
+# =============================================================================
+# TRANSLATION SERVICE TESTS (run with: python manage.py test api)
+# =============================================================================
+
+class FakeLibreTranslateHandler(BaseHTTPRequestHandler):
+    """Minimal LibreTranslate stand-in that upper-cases text"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.calls.append(('GET', self.path))
+        if self.server.healthy and self.path == '/languages':
+            self._send(200, [{'code': 'en'}, {'code': 'sq'}])
+        else:
+            self._send(503, {'error': 'down'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.calls.append(('POST', self.path))
+        if not self.server.healthy:
+            self._send(503, {'error': 'down'})
+            return
+        q = payload['q']
+        if isinstance(q, list):
+            self._send(200, {'translatedText': [text.upper() for text in q]})
+        else:
+            self._send(200, {'translatedText': q.upper()})
+
+
+class TranslationServiceTests(SimpleTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeLibreTranslateHandler)
+        self.server.calls = []
+        self.server.healthy = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_service(self, health=None):
+        service = TranslationService.__new__(TranslationService)
+        service.providers = [
+            LibreTranslateProvider(self.url, health=health or ProviderHealth()),
+            CopyFallbackProvider(),
+        ]
+        return service
+
+    def calls(self, method, path):
+        return [c for c in self.server.calls if c == (method, path)]
+
+    def test_translate_fields_uses_one_request(self):
+        service = self.make_service()
+        results = service.translate_fields(
+            {'name': 'negroni', 'description': 'gin, campari', 'empty': ''}, 'sq', 'en'
+        )
+        self.assertEqual(results['name']['translated_text'], 'NEGRONI')
+        self.assertEqual(results['description']['provider'], 'libretranslate')
+        self.assertEqual(results['empty']['provider'], 'none')
+        self.assertEqual(list(results), ['name', 'description', 'empty'])
+        self.assertEqual(len(self.calls('POST', '/translate')), 1)
+
+    def test_health_probe_is_cached(self):
+        service = self.make_service()
+        service.get_active_provider()
+        for text in ['one', 'two', 'three']:
+            service.translate(text, 'sq', 'en')
+        self.assertEqual(len(self.calls('GET', '/languages')), 1)
+        self.assertEqual(len(self.calls('POST', '/translate')), 3)
+
+    def test_circuit_opens_and_falls_back(self):
+        health = ProviderHealth(ttl=60, failure_threshold=2, cooldown=60)
+        service = self.make_service(health)
+        self.assertEqual(service.get_active_provider(), 'libretranslate')
+        self.server.healthy = False
+
+        for _ in range(2):
+            result = service.translate('hello', 'sq', 'en')
+            self.assertEqual(result['provider'], 'copy_fallback')
+        self.assertTrue(health.is_open)
+
+        requests_before = len(self.server.calls)
+        result = service.translate('hello', 'sq', 'en')
+        self.assertEqual(result['provider'], 'copy_fallback')
+        self.assertEqual(len(self.server.calls), requests_before)
+        self.assertEqual(service.get_active_provider(), 'copy_fallback')
+
+    def test_circuit_half_opens_after_cooldown(self):
+        now = [0.0]
+        health = ProviderHealth(ttl=60, failure_threshold=1, cooldown=10, clock=lambda: now[0])
+        provider = LibreTranslateProvider(self.url, health=health)
+        self.server.healthy = False
+        self.assertFalse(provider.is_available())
+        self.assertTrue(health.is_open)
+
+        self.server.healthy = True
+        now[0] = 11.0
+        self.assertTrue(provider.is_available())
+        self.assertFalse(health.is_open)
+
+
+class UpperCaseProvider(CopyFallbackProvider):
+    """Test provider that records every batch it is asked to translate"""
+    name = 'upper'
+
+    def __init__(self):
+        self.batches = []
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        self.batches.append(list(texts))
+        return [
+            {'translated_text': text.upper(), 'is_auto_translated': True,
+             'needs_review': True, 'provider': self.name, 'error': None}
+            for text in texts
+        ]
+
+
+class CatalogTranslationTests(TestCase):
+
+    def setUp(self):
+        self.provider = UpperCaseProvider()
+        self.service = TranslationService.__new__(TranslationService)
+        self.service.providers = [self.provider]
+        patcher = mock.patch(
+            'api.services.catalog_translation.get_translation_service', return_value=self.service
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.category = MenuCategory.objects.create(name='Kokteje', description='')
+        for name in ['Negroni', 'Boulevardier']:
+            MenuItem.objects.create(
+                category=self.category, name=name,
+                description='Gin, Campari, sweet vermouth', price=Decimal('14.00')
+            )
+
+    def test_duplicate_strings_are_translated_once(self):
+        summary = translate_catalog('en', model_names=['menuitem', 'menucategory'])
+
+        translated = [text for batch in self.provider.batches for text in batch]
+        self.assertEqual(translated.count('Gin, Campari, sweet vermouth'), 1)
+        self.assertEqual(summary['pending_fields'], 5)
+        self.assertEqual(summary['translations_written'], 5)
+        self.assertEqual(
+            Translation.objects.filter(
+                locale='en', field_name='description',
+                translated_text='GIN, CAMPARI, SWEET VERMOUTH'
+            ).count(),
+            2
+        )
+
+    def test_second_run_only_touches_stale_fields(self):
+        translate_catalog('en', model_names=['menuitem'])
+        self.provider.batches.clear()
+
+        summary = translate_catalog('en', model_names=['menuitem'])
+        self.assertEqual(summary['pending_fields'], 0)
+        self.assertEqual(self.provider.batches, [])
+
+        item = MenuItem.objects.get(name='Negroni')
+        item.ingredients = 'Gin'
+        item.save()
+        Translation.objects.filter(object_id=item.pk, field_name='name').update(
+            translated_by='admin', updated_at=item.updated_at.replace(year=2000)
+        )
+
+        summary = translate_catalog('en', model_names=['menuitem'])
+        self.assertEqual(summary['pending_fields'], 2)  # stale description + new ingredients
+        self.assertEqual(
+            Translation.objects.get(object_id=item.pk, field_name='name').translated_by,
+            'admin'
+        )
+
+
+    def test_provider_outage_leaves_fields_pending(self):
+        self.provider.translate_batch = lambda texts, source, target: [
+            {'translated_text': text, 'is_auto_translated': False, 'needs_review': True,
+             'provider': 'copy_fallback', 'error': 'down'}
+            for text in texts
+        ]
+        summary = translate_catalog('en', model_names=['menucategory'])
+        self.assertEqual((summary['translations_written'], summary['untranslated_texts']), (0, 1))
+        self.assertFalse(Translation.objects.filter(locale='en').exists())
+
+        # Copies written before this was fixed are picked up again as well
+        Translation.objects.create(
+            content_object=self.category, locale='en', field_name='name', translated_text='Kokteje',
+            is_auto_translated=False, translated_by='auto:copy_fallback'
+        )
+        del self.provider.translate_batch
+        summary = translate_catalog('en', model_names=['menucategory'])
+        self.assertEqual(summary['translations_written'], 1)
+        self.assertEqual(Translation.objects.get(locale='en', field_name='name').translated_text, 'KOKTEJE')
+
+    def test_stale_published_rows_stay_published(self):
+        translate_catalog('en', model_names=['menucategory'])
+        Translation.objects.filter(locale='en').update(status='published')
+        self.category.name = 'Kokteje klasike'
+        self.category.save()
+
+        events = []
+
+        def receiver(**kwargs):
+            events.append(kwargs)
+        content_changed.connect(receiver)
+        self.addCleanup(content_changed.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True):
+            summary = translate_catalog('en', model_names=['menucategory'])
+        self.assertEqual(summary['published_updated'], 1)
+        translation = Translation.objects.get(locale='en', field_name='name')
+        self.assertEqual((translation.translated_text, translation.status), ('KOKTEJE KLASIKE', 'published'))
+        # The public cache is invalidated for the refreshed rows
+        self.assertEqual([event['models'] for event in events], [[MenuCategory]])
+        self.assertEqual(events[0]['object_ids'], [str(self.category.pk)])
+
+    def test_human_memory_hits_are_written(self):
+        self.service.memory = TranslationMemoryStore()
+        self.service.memory.store_human([('Kokteje', 'Cocktails')], 'sq', 'en')
+
+        summary = translate_catalog('en', model_names=['menucategory'])
+        self.assertEqual((summary['translations_written'], summary['untranslated_texts']), (1, 0))
+        translation = Translation.objects.get(locale='en', field_name='name')
+        self.assertEqual(
+            (translation.translated_text, translation.is_auto_translated, translation.translated_by),
+            ('Cocktails', False, 'memory:human')
+        )
+        self.assertEqual(self.provider.batches, [])
+        # Reviewed rows are not picked up again
+        self.assertEqual(translate_catalog('en', model_names=['menucategory'])['pending_fields'], 0)
+
+    @mock.patch('api.views.LocalizedViews.auto_translate_catalog.delay')
+    def test_include_stale_is_parsed_as_bool(self, delay):
+        delay.return_value.id = 'task-1'
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('editor', is_staff=True))
+        url = '/api/admin/translations/auto_translate_catalog/'
+        self.assertEqual(client.post(url, {'include_stale': 'false'}, format='json').status_code, 202)
+        self.assertIs(delay.call_args.kwargs['include_stale'], False)
+        self.assertEqual(client.post(url, {'include_stale': 'maybe'}, format='json').status_code, 400)
+
+
+class TranslationMemoryTests(TestCase):
+
+    def setUp(self):
+        self.provider = UpperCaseProvider()
+        self.service = TranslationService.__new__(TranslationService)
+        self.service.providers = [self.provider]
+        self.service.memory = TranslationMemoryStore()
+
+    def test_repeat_text_is_served_from_memory(self):
+        first = self.service.translate('Gin, Campari,  sweet vermouth', 'sq', 'en')
+        self.assertEqual(first['provider'], 'upper')
+
+        results = self.service.translate_texts(
+            ['Gin, Campari, sweet vermouth ', 'Tonic'], 'sq', 'en'
+        )
+        self.assertEqual(results[0]['provider'], 'memory')
+        self.assertEqual(results[0]['translated_text'], first['translated_text'])
+        self.assertEqual(self.provider.batches, [['Gin, Campari,  sweet vermouth'], ['Tonic']])
+        self.assertEqual(TranslationMemory.objects.count(), 2)
+
+    def test_approved_human_translation_overrides_memory(self):
+        self.service.translate('Kokteje', 'sq', 'en')
+        category = MenuCategory.objects.create(name='Kokteje', description='')
+        translation = Translation.objects.create(
+            content_object=category, locale='en', field_name='name',
+            translated_text='Cocktails', status='approved', translated_by='admin'
+        )
+
+        self.assertEqual(learn_from_translations([translation]), 1)
+        result = self.service.translate('Kokteje', 'sq', 'en')
+        self.assertEqual(result['translated_text'], 'Cocktails')
+        self.assertFalse(result['needs_review'])
+        self.assertEqual(len(self.provider.batches), 1)
+
+
+class TranslationCoverageTests(TestCase):
+
+    def setUp(self):
+        self.complete = HomeSection.objects.create(section_type='hero', title='Mirë se vini')
+        self.partial = HomeSection.objects.create(
+            section_type='upcoming_events', title='Ngjarje', subtitle='Çdo fundjavë'
+        )
+        self.missing = HomeSection.objects.create(section_type='signature_picks', title='Menu')
+        for section, field_name, status in [
+            (self.complete, 'title', 'published'),
+            (self.partial, 'title', 'published'),
+            (self.partial, 'subtitle', 'draft'),
+        ]:
+            Translation.objects.create(
+                content_object=section, locale='en', field_name=field_name,
+                translated_text='...', status=status
+            )
+
+    def test_status_map_uses_one_query(self):
+        sections = list(HomeSection.objects.all())
+        translation_status_map(sections[:1], 'en')  # warm the content type cache
+        with self.assertNumQueries(1):
+            statuses = translation_status_map(sections, 'en')
+        self.assertEqual(statuses[self.complete.pk], 'complete')
+        self.assertEqual(statuses[self.partial.pk], 'partial')
+        self.assertEqual(statuses[self.missing.pk], 'missing')
+        self.assertEqual(self.partial.translation_status('en'), 'partial')
+
+    def test_list_serializer_and_missing_fields_report(self):
+        data = HomeSectionSerializer(HomeSection.objects.all(), many=True).data
+        self.assertEqual(
+            sorted(item['translation_status_en'] for item in data),
+            ['complete', 'missing', 'partial']
+        )
+
+        report = {row['object_id']: row for row in missing_fields_report(HomeSection, 'en')}
+        self.assertNotIn(str(self.complete.pk), report)
+        self.assertEqual(report[str(self.partial.pk)]['unpublished'], ['subtitle'])
+        self.assertEqual(report[str(self.missing.pk)]['missing'], ['title'])
+
+    def test_only_required_published_fields_count(self):
+        # A published translation of a field without source text does not
+        # stand in for the missing title
+        Translation.objects.create(
+            content_object=self.missing, locale='en', field_name='subtitle',
+            translated_text='...', status='published'
+        )
+        self.assertEqual(translation_status_map([self.missing], 'en')[self.missing.pk], 'missing')
+
+        summary = coverage_summary(HomeSection, 'en')
+        self.assertEqual((summary['complete'], summary['partial'], summary['missing']), (1, 1, 1))
+        self.assertEqual((summary['required_fields'], summary['published_fields']), (4, 2))
+
+
+class BulkPublishTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('editor', password='pass'))
+        self.sections = [
+            HomeSection.objects.create(section_type=section_type, title=section_type)
+            for section_type in ['hero', 'story', 'visit']
+        ]
+        self.events = []
+        content_changed.connect(self._record_event)
+        self.addCleanup(content_changed.disconnect, self._record_event)
+
+    def _record_event(self, sender, **kwargs):
+        self.events.append(kwargs)
+
+    def test_bulk_upsert_then_publish_emits_one_event_per_batch(self):
+        payload = {
+            'locale': 'en',
+            'translations': [
+                {'content_type': 'api.homesection', 'object_id': str(section.pk),
+                 'field_name': 'title', 'translated_text': f'{section.title} (en)'}
+                for section in self.sections
+            ],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/admin/translations/bulk_upsert/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(item['was_created'] for item in response.data['saved']))
+
+        payload['translations'][0]['translated_text'] = 'Welcome'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/admin/translations/bulk_upsert/', payload, format='json')
+        self.assertFalse(response.data['saved'][0]['was_created'])
+        self.assertEqual(Translation.objects.count(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/admin/translations/bulk_status/', {
+                'locale': 'en', 'status': 'published', 'content_type': 'api.homesection',
+                'object_ids': [str(section.pk) for section in self.sections],
+            }, format='json')
+        self.assertEqual(response.data['updated_count'], 3)
+        self.assertEqual(Translation.objects.filter(status='published').count(), 3)
+        self.assertEqual(len(self.events), 3)
+        self.assertEqual(self.events[-1]['models'], [HomeSection])
+
+    def test_status_changes_are_scoped_and_validated(self):
+        section = self.sections[0]
+        category = MenuCategory.objects.create(name='Kokteje', description='')
+        # A translation of another model that happens to share the object id
+        Translation.objects.create(
+            content_type=ContentType.objects.get_for_model(MenuCategory), object_id=section.pk,
+            locale='en', field_name='name', translated_text='Cocktails'
+        )
+        Translation.objects.create(content_object=section, locale='en', field_name='title', translated_text='Hero')
+
+        url = '/api/admin/translations/bulk_status/'
+        payload = {'locale': 'en', 'status': 'published', 'object_ids': [str(section.pk)]}
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, 400)
+        for bad in ({'content_type': 'api.homesection', 'object_ids': ['not-a-uuid']},
+                    {'content_type': 'homesection'}):
+            self.assertEqual(self.client.post(url, {**payload, **bad}, format='json').status_code, 400)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {**payload, 'content_type': 'api.homesection'}, format='json')
+        self.assertEqual(response.data['updated_count'], 1)
+        self.assertEqual(Translation.objects.get(field_name='name').status, 'draft')
+
+        response = self.client.post('/api/admin/translations/publish/', {
+            'locale': 'en', 'object_id': str(category.pk)
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/admin/translations/bulk_upsert/', {
+            'locale': 'en', 'translations': ['api.homesection']
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/admin/home-sections/bulk_publish/', {'ids': ['1']}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_learning_loads_objects_per_content_type(self):
+        for section in self.sections:
+            Translation.objects.create(
+                content_object=section, locale='en', field_name='title',
+                translated_text=f'{section.title} (en)', status='published', translated_by='editor'
+            )
+        translations = list(Translation.objects.all())
+        ContentType.objects.get_for_model(HomeSection)  # warm the content type cache
+        # One query for the sections, one upsert into the memory
+        with self.assertNumQueries(2):
+            self.assertEqual(learn_from_translations(translations), 3)
+
+    def test_bulk_publish_sections(self):
+        ids = [str(section.pk) for section in self.sections[:2]]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/admin/home-sections/bulk_publish/', {'ids': ids}, format='json')
+        self.assertEqual(response.data['updated_count'], 2)
+        self.assertEqual(HomeSection.objects.filter(is_published=True).count(), 2)
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(sorted(self.events[0]['object_ids']), sorted(ids))
+
+
+@override_settings(PUBLIC_CACHE_ENABLED=True)
+class PublicResponseCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.section = HomeSection.objects.create(
+            section_type='hero', title='Mirë se vini', is_active=True, is_published=True
+        )
+
+    def test_etag_revalidation_and_invalidation(self):
+        url = '/api/public/home-sections/?locale=en'
+        first = self.client.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        etag = first['ETag']
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/public/home-sections/?locale=en')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.title = 'Welcome'
+            self.section.save()
+
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed['X-Cache'], 'MISS')
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_locale_is_part_of_the_key(self):
+        self.client.get('/api/public/home-sections/')
+        self.assertEqual(self.client.get('/api/public/home-sections/?locale=sq')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/public/home-sections/?locale=en')['X-Cache'], 'MISS')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'cdn.example.com'])
+    def test_host_and_scheme_are_part_of_the_key(self):
+        url = '/api/public/home-sections/'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(url, HTTP_HOST='cdn.example.com')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url, secure=True)['X-Cache'], 'MISS')
+
+
+@override_settings(PUBLIC_CACHE_ENABLED=False)
+class HomeBundleTests(TestCase):
+
+    def setUp(self):
+        self.category = MenuCategory.objects.create(name='Kokteje', description='')
+        Translation.objects.create(
+            content_object=self.category, locale='en', field_name='name',
+            translated_text='Cocktails', status='published'
+        )
+
+    def _add_content(self, count):
+        for i in range(count):
+            event = Event.objects.create(
+                title=f'Mbrëmje {i}', description='Muzikë live', image='events/x.jpg',
+                is_featured=True, start_date=date.today(),
+                start_time='20:00', end_time='23:00'
+            )
+            Translation.objects.create(
+                content_object=event, locale='en', field_name='title',
+                translated_text=f'Evening {i}', status='published'
+            )
+            MenuItem.objects.create(
+                category=self.category, name=f'Koktej {i}', description='',
+                price=Decimal('9.00'), is_featured=True
+            )
+
+    def _query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/public/home-bundle/?locale=en')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_bundle_is_localized_with_constant_queries(self):
+        self._add_content(1)
+        self._query_count()  # creates RestaurantInfo and warms the content type cache
+        baseline, data = self._query_count()
+        self.assertEqual(data['featured_events'][0]['title'], 'Mbrëmje 0')
+        self.assertEqual(data['featured_menu_items'][0]['category_name'], 'Cocktails')
+        self.assertIn('restaurant_info', data)
+
+        self._add_content(3)
+        queries, data = self._query_count()
+        self.assertEqual(len(data['featured_events']), 4)
+        self.assertEqual(queries, baseline)
+
+    def test_events_match_the_endpoints_they_replace(self):
+        self._add_content(7)
+        Event.objects.create(
+            title='Past', description='', is_featured=True, start_date=date.today() - timedelta(days=3),
+            start_time='20:00', end_time='23:00'
+        )
+        Event.objects.filter(title='Mbrëmje 6').update(display_order=-1)
+
+        _, bundle = self._query_count()
+        self.assertEqual(bundle['featured_events'], self.client.get('/api/events/featured/').json())
+        self.assertEqual(bundle['upcoming_events'], self.client.get('/api/events/upcoming/').json())
+        self.assertEqual(len(bundle['featured_events']), 5)
+        self.assertEqual(bundle['featured_events'][0]['title'], 'Mbrëmje 6')
+        self.assertNotIn('Past', [event['title'] for event in bundle['upcoming_events']])
+
+
+class RenderingAndCompressionTests(SimpleTestCase):
+
+    def test_orjson_output_matches_drf(self):
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'price': Decimal('14.50'),
+            'created_at': datetime(2026, 5, 1, 20, 30, 15, 123456),
+            'date': date(2026, 5, 1),
+            'name': 'Çaj mali \u2028',
+            'tags': ('vegan', 'gluten_free'),
+            1: None,
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_compression_is_negotiated_above_threshold(self):
+        body = b'{"items": "' + b'x' * 4000 + b'"}'
+        middleware = CompressionMiddleware(lambda request: HttpResponse(body, content_type='application/json'))
+        factory = RequestFactory()
+
+        response = middleware(factory.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate, br'))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), body)
+
+        response = middleware(factory.get('/', HTTP_ACCEPT_ENCODING='gzip, br;q=0'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+
+        small = CompressionMiddleware(lambda request: HttpResponse(b'{}', content_type='application/json'))
+        self.assertFalse(small(factory.get('/', HTTP_ACCEPT_ENCODING='gzip')).has_header('Content-Encoding'))
+
+
+@override_settings(PUBLIC_CACHE_ENABLED=False)
+class SparseFieldsetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        parent = MenuCategory.objects.create(name='Pije', description='')
+        for index in range(3):
+            category = MenuCategory.objects.create(name=f'Kokteje {index}', description='', parent=parent)
+            MenuItem.objects.create(
+                category=category, name=f'Negroni {index}',
+                description='Gin, Campari, sweet vermouth', price=Decimal('14.00')
+            )
+
+    def test_fields_limits_keys_and_skips_nested_queries(self):
+        url = '/api/menu/categories/public/'
+        with CaptureQueriesContext(connection) as full:
+            response = self.client.get(url)
+        self.assertIn('subcategories', response.json()[0])
+
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get(url, {'fields': 'id,name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()[0]), {'id', 'name'})
+        self.assertLess(len(sparse), len(full))
+        self.assertEqual(len(sparse), 1)
+
+    def test_omit_drops_fields(self):
+        response = self.client.get('/api/menu/categories/main_categories/', {'omit': 'menu_items,subcategories'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('menu_items', response.json()[0])
+        self.assertNotIn('subcategories', response.json()[0])
+        self.assertIn('items_count', response.json()[0])
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('staff', password='x', is_staff=True))
+        for index in range(25):
+            Reservation.objects.create(
+                first_name='Guest', last_name=str(index), email=f'guest{index}@example.com',
+                phone='+355690000000', date=date(2026, 6, 1), time=time(19, 0), party_size=2
+            )
+        # Identical timestamps force the id tie-breaker to do the work
+        Reservation.objects.update(created_at=datetime(2026, 5, 1, 12, 0, tzinfo=dt_timezone.utc))
+
+    def test_pages_cover_every_row_once(self):
+        seen = []
+        url = '/api/reservations/?page_size=10'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json()['results']), 10)
+            seen.extend(row['id'] for row in response.json()['results'])
+            url = response.json()['next']
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(set(seen), {str(pk) for pk in Reservation.objects.values_list('id', flat=True)})
+
+    def test_invalid_cursor_and_opt_in_lists(self):
+        self.assertEqual(self.client.get('/api/reservations/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+        category = MenuCategory.objects.create(name='Kokteje', description='')
+        for index in range(3):
+            MenuItem.objects.create(
+                category=category, name=f'Negroni {index}',
+                description='Gin, Campari, sweet vermouth', price=Decimal('14.00')
+            )
+        self.assertIsInstance(self.client.get('/api/menu/items/').json(), list)
+
+        page = self.client.get('/api/menu/items/', {'page_size': 2}).json()
+        self.assertEqual(len(page['results']), 2)
+        rest = self.client.get(page['next']).json()
+        self.assertEqual([item['name'] for item in rest['results']], ['Negroni 2'])
+        self.assertIsNone(rest['next'])
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.category = MenuCategory.objects.create(name='Kokteje', description='')
+        for index in range(4):
+            MenuItem.objects.create(
+                category=self.category, name=f'Negroni {index}',
+                description='Gin, Campari, sweet vermouth', price=Decimal('14.00')
+            )
+
+    def test_fingerprint_ignores_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'x' AND k IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id = 7 AND name = 'y''s'  AND k IN (%s)"),
+        )
+
+    def test_budget_flags_repeated_queries(self):
+        with self.assertRaisesRegex(AssertionError, 'repeated more than 2 times'):
+            with self.assertQueryBudget(max_repeats=2):
+                for item in MenuItem.objects.all():
+                    item.category.name
+
+        with self.assertQueryBudget(max_queries=1, max_repeats=1):
+            [item.category.name for item in MenuItem.objects.select_related('category')]
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, PUBLIC_CACHE_ENABLED=False)
+    def test_middleware_adds_server_timing(self):
+        with self.assertLogs('api.middleware', level='WARNING') as logs:
+            with override_settings(QUERY_BUDGET_MAX_QUERIES=0):
+                response = APIClient().get('/api/menu/items/public/')
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+')
+        self.assertIn('/api/menu/items/public/', logs.output[0])
+
+
+class MetricsTests(TestCase):
+
+    def test_histogram_renders_cumulative_buckets_and_merges_snapshots(self):
+        registry = metrics.Registry()
+        histogram = registry.register(metrics.Histogram('job_seconds', 'Job time.', ('job',), buckets=(1, 5)))
+        histogram.observe(0.5, job='a')
+        histogram.observe(3, job='a')
+        other_process = {'job_seconds': {('a',): ([1, 0, 1], 10.5)}}
+
+        text = registry.render([other_process])
+        self.assertIn('# TYPE job_seconds histogram', text)
+        self.assertIn('job_seconds_bucket{job="a",le="1"} 2', text)
+        self.assertIn('job_seconds_bucket{job="a",le="5"} 3', text)
+        self.assertIn('job_seconds_bucket{job="a",le="+Inf"} 4', text)
+        self.assertIn('job_seconds_count{job="a"} 4', text)
+        self.assertIn('job_seconds_sum{job="a"} 14', text)
+
+    @override_settings(METRICS_AUTH_TOKEN='', METRICS_ALLOWED_IPS=['10.0.0.5'], PUBLIC_CACHE_ENABLED=False)
+    def test_metrics_endpoint_reports_requests(self):
+        client = APIClient()
+        client.get('/api/public/info/')
+        # No token configured: closed unless the scraper is allowed by address
+        self.assertEqual(client.get('/metrics').status_code, 403)
+        response = client.get('/metrics', REMOTE_ADDR='10.0.0.5')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertRegex(body, r'http_requests_total\{view="public_restaurant_info",method="GET",status="200"\} \d+')
+        self.assertIn('db_queries_total', body)
+
+        staff = APIClient()
+        staff.force_login(User.objects.create_user('ops', is_staff=True))
+        self.assertEqual(staff.get('/metrics').status_code, 200)
+
+        with override_settings(METRICS_AUTH_TOKEN='secret'):
+            self.assertEqual(client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 401)
+            self.assertEqual(client.get('/metrics').status_code, 401)
+            self.assertEqual(client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+
+class BenchmarkCommandTests(TestCase):
+
+    def test_seed_is_deterministic_and_flushable(self):
+        call_command('seed_benchmark_data', scale=0.01, seed=7, stdout=io.StringIO())
+        first = list(MenuItem.objects.filter(category__name__startswith='bench-').values_list('name', 'price'))
+        self.assertEqual(len(first), 10)
+        self.assertEqual(Reservation.objects.filter(email__startswith='bench-').count(), 100)
+
+        call_command('seed_benchmark_data', scale=0.01, seed=7, flush=True, stdout=io.StringIO())
+        second = list(MenuItem.objects.filter(category__name__startswith='bench-').values_list('name', 'price'))
+        self.assertEqual(first, second)
+        self.assertEqual(User.objects.filter(username__startswith='bench-client-').count(), 5)
+
+    def test_compare_flags_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('run_benchmarks', iterations=1, only='view_menu_items_public', save=path, stdout=io.StringIO())
+            with open(path) as f:
+                baseline = json.load(f)
+            baseline['results']['view_menu_items_public'].update(median_ms=0.0001, queries=0)
+            with open(path, 'w') as f:
+                json.dump(baseline, f)
+
+            with self.assertRaisesMessage(CommandError, 'view_menu_items_public'):
+                call_command('run_benchmarks', iterations=1, only='view_menu_items_public',
+                             compare=path, stdout=io.StringIO())
+
+
+class ProfilingTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.staff = APIClient()
+        self.staff.force_authenticate(User.objects.create_user('profiler', is_staff=True))
+
+    def test_token_profiles_request_and_staff_can_download_trace(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0, PROFILING_DIR=self.directory):
+            token = self.staff.post('/api/admin/profiles/token/').data['token']
+            client = APIClient()
+            self.assertNotIn('X-Profile-Trace', client.get('/api/public/info/'))
+            self.assertNotIn('X-Profile-Trace', client.get('/api/public/info/', {'__profile': 'forged'}))
+
+            response = client.get('/api/public/info/', HTTP_X_PROFILE_TOKEN=token)
+            name = response['X-Profile-Trace']
+            self.assertTrue(name.endswith('.prof'))
+
+            listing = self.staff.get('/api/admin/profiles/')
+            self.assertEqual([trace['name'] for trace in listing.data['profiles']], [name])
+            download = self.staff.get(f'/api/admin/profiles/{name}/')
+            self.assertEqual(download.status_code, 200)
+            self.assertGreater(len(b''.join(download.streaming_content)), 0)
+
+            self.assertEqual(client.get('/api/admin/profiles/').status_code, 401)
+            self.assertEqual(self.staff.get('/api/admin/profiles/..%2Fsettings.py/').status_code, 404)
+
+    def test_disabled_profiler_is_not_installed(self):
+        with override_settings(PROFILING_ENABLED=False, PROFILING_DIR=self.directory):
+            token = profiling.make_profile_token(User.objects.get(username='profiler'))
+            response = APIClient().get('/api/public/info/', HTTP_X_PROFILE_TOKEN=token)
+            self.assertNotIn('X-Profile-Trace', response)
+            self.assertEqual(self.staff.get('/api/admin/profiles/').status_code, 404)
+
+    def test_size_cap_removes_oldest_traces(self):
+        for index, name in enumerate(['a.prof', 'b.prof', 'c.prof']):
+            path = os.path.join(self.directory, name)
+            with open(path, 'wb') as f:
+                f.write(b'x' * 100)
+            os.utime(path, (1000 + index, 1000 + index))
+
+        profiling.enforce_size_cap(self.directory, 250)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['b.prof', 'c.prof'])
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'], REPLICA_MAX_LAG_SECONDS=5, REPLICA_LAG_CHECK_INTERVAL=0)
+class ReplicaRoutingTests(TestCase):
+
+    def setUp(self):
+        self.router = db_routers.ReplicaRouter()
+        db_routers._lag_cache.clear()
+        self.addCleanup(db_routers._lag_cache.clear)
+
+    @mock.patch('api.db_routers.replica_lag', return_value=0.5)
+    def test_only_marked_reads_use_replica_until_a_write(self, lag):
+        with db_routers.primary_scope():
+            self.assertEqual(self.router.db_for_read(Reservation), 'default')
+            with db_routers.read_from_replica():
+                self.assertEqual(self.router.db_for_read(Reservation), 'replica_0')
+                MenuCategory.objects.using('default').create(name='Wine', category_type='wine')
+                self.assertEqual(self.router.db_for_read(Reservation), 'default')
+
+        with db_routers.primary_scope(pinned=True), db_routers.read_from_replica():
+            self.assertEqual(self.router.db_for_read(Reservation), 'default')
+
+    @mock.patch('api.db_routers.replica_lag', return_value=30)
+    def test_lagging_replica_falls_back_to_primary(self, lag):
+        with db_routers.primary_scope(), db_routers.read_from_replica():
+            with self.assertLogs('api.db_routers', level='WARNING'):
+                self.assertEqual(self.router.db_for_read(Reservation), 'default')
+        self.assertFalse(self.router.allow_migrate('replica_0', 'api'))
+
+    def test_write_sets_read_your_writes_cookie(self):
+        client = APIClient()
+        response = client.post('/api/contact/', {
+            'name': 'Ana Leka', 'email': 'ana@example.com', 'phone': '+355691234567',
+            'subject': 'general', 'message': 'Do you have a terrace?',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+        response = client.get('/api/reservations/availability/')
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+
+def reservation_payload(day, at='20:00', party_size=2, **extra):
+    return {
+        'first_name': 'Ana', 'last_name': 'Leka', 'email': 'ana@example.com', 'phone': '+355691234567',
+        'date': day.isoformat(), 'time': at, 'party_size': party_size, **extra,
+    }
+
+
+class BookingTests(TestCase):
+
+    def setUp(self):
+        self.day = date.today() + timedelta(days=3)
+        restaurant = RestaurantSettings.get_settings()
+        restaurant.max_tables_per_slot = 2
+        restaurant.max_capacity = 10
+        restaurant.save()
+
+    def test_slot_limits_tables_and_seats(self):
+        client = APIClient()
+        self.assertEqual(client.post('/api/reservations/', reservation_payload(self.day, '20:00', 6), format='json').status_code, 201)
+        response = client.post('/api/reservations/', reservation_payload(self.day, '20:15', 6), format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['code'], 'slot_unavailable')
+
+        self.assertEqual(client.post('/api/reservations/', reservation_payload(self.day, '20:10', 4), format='json').status_code, 201)
+        self.assertEqual(client.post('/api/reservations/', reservation_payload(self.day, '20:20', 1), format='json').status_code, 409)
+        # The next slot is untouched
+        self.assertEqual(client.post('/api/reservations/', reservation_payload(self.day, '20:30', 1), format='json').status_code, 201)
+
+        client.force_authenticate(User.objects.create_user('host', is_staff=True))
+        availability = client.get('/api/reservations/availability/', {'start_date': self.day.isoformat()}).data[0]
+        slot = next(slot for slot in availability['slots'] if slot['time'] == '20:00')
+        self.assertEqual((slot['available'], slot['existing_reservations'], slot['seats_left']), (False, 2, 0))
+
+    @mock.patch('api.views.GuestReservationViews.send_confirmation_email')
+    @mock.patch('api.views.GuestReservationViews.send_otp_email', return_value=True)
+    def test_expired_guest_hold_releases_seats(self, send_otp, send_confirmation):
+        client = APIClient()
+        response = client.post('/api/reservations/guest/', reservation_payload(self.day, '19:00', 6), format='json')
+        self.assertEqual(response.status_code, 201)
+        held = Reservation.objects.get(id=response.data['reservation_id'])
+        self.assertIsNotNone(held.hold_expires_at)
+        self.assertEqual(client.post('/api/reservations/', reservation_payload(self.day, '19:00', 6), format='json').status_code, 409)
+
+        Reservation.objects.filter(pk=held.pk).update(hold_expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(client.post('/api/reservations/', reservation_payload(self.day, '19:00', 6), format='json').status_code, 201)
+        # The booking released the lapsed hold in its slot
+        self.assertEqual(Reservation.objects.get(pk=held.pk).status, 'cancelled')
+
+        # Verifying the expired hold now has to find room again
+        response = client.post('/api/reservations/verify-otp/', {
+            'reservation_id': str(held.pk), 'otp_code': send_otp.call_args.kwargs['otp_code'],
+        }, format='json')
+        self.assertEqual(response.status_code, 409)
+        # The guest is not marked verified and can ask for a new code
+        self.assertFalse(Reservation.objects.get(pk=held.pk).email_verified)
+        response = client.post('/api/reservations/resend-otp/', {'reservation_id': str(held.pk)}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        # A hold the guest cancelled stays cancelled, even with a valid code
+        response = client.post('/api/reservations/guest/', reservation_payload(self.day, '21:00', 2), format='json')
+        cancelled = Reservation.objects.get(id=response.data['reservation_id'])
+        code = send_otp.call_args.kwargs['otp_code']
+        cancelled.status = 'cancelled'
+        cancelled.save()
+        response = client.post('/api/reservations/verify-otp/', {
+            'reservation_id': str(cancelled.pk), 'otp_code': code,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Reservation.objects.get(pk=cancelled.pk).status, 'cancelled')
+        self.assertEqual(booking.slot_usage(self.day).get(time(21, 0)), {'tables': 0, 'seats': 0})
+        with self.assertRaises(booking.HoldClosed):
+            booking.confirm_hold(cancelled)
+
+        # Holds in slots nobody books are released by the periodic task
+        response = client.post('/api/reservations/guest/', reservation_payload(self.day, '18:00', 4), format='json')
+        Reservation.objects.filter(pk=response.data['reservation_id']).update(hold_expires_at=timezone.now())
+        self.assertEqual(booking.release_expired_holds(), 1)
+        self.assertEqual(booking.slot_usage(self.day)[time(18, 0)], {'tables': 0, 'seats': 0})
+
+        # ... and can still win their seats back when verified
+        released = Reservation.objects.get(pk=response.data['reservation_id'])
+        self.assertIsNotNone(released.hold_released_at)
+        confirmed = booking.confirm_hold(released)
+        self.assertEqual((confirmed.status, confirmed.email_verified, confirmed.hold_released_at), ('confirmed', True, None))
+        self.assertEqual(booking.slot_usage(self.day)[time(18, 0)], {'tables': 1, 'seats': 4})
+
+
+class SlotInventoryTests(TestCase):
+
+    def setUp(self):
+        self.day = date.today() + timedelta(days=4)
+
+    def counters(self, at=time(20, 0)):
+        inventory = SlotInventory.objects.filter(date=self.day, slot_start=at).first()
+        return (inventory.tables_booked, inventory.seats_booked) if inventory else (0, 0)
+
+    def create(self, at='20:00', party_size=2, **extra):
+        serializer = ReservationSerializer(data=reservation_payload(self.day, at, party_size, **extra))
+        serializer.is_valid(raise_exception=True)
+        return booking.book_reservation(serializer)
+
+    def test_counters_follow_reservation_changes(self):
+        first = self.create('20:00', 2)
+        self.create('20:10', 3)
+        self.assertEqual(self.counters(), (2, 5))
+
+        first.party_size = 4
+        first.save()
+        self.assertEqual(self.counters(), (2, 7))
+
+        # Moving to another slot, then cancelling and deleting
+        reservation = Reservation.objects.get(pk=first.pk)
+        reservation.time = time(21, 0)
+        reservation.save()
+        self.assertEqual((self.counters(), self.counters(time(21, 0))), ((1, 3), (1, 4)))
+
+        reservation.status = 'cancelled'
+        reservation.save(update_fields=['status', 'updated_at'])
+        self.assertEqual(self.counters(time(21, 0)), (0, 0))
+
+        Reservation.objects.filter(date=self.day).delete()
+        self.assertEqual(self.counters(), (0, 0))
+
+    def test_stale_instances_move_seats_once(self):
+        self.create('20:00', 2)
+        reservation = self.create('20:10', 3)
+        self.assertEqual(self.counters(), (2, 5))
+
+        # Two requests loaded the same reservation before either saved
+        first, second = Reservation.objects.get(pk=reservation.pk), Reservation.objects.get(pk=reservation.pk)
+        first.status = 'cancelled'
+        first.save()
+        second.status = 'cancelled'
+        second.save()
+        self.assertEqual(self.counters(), (1, 2))
+
+        # A stale delete only gives back what the row still holds
+        stale = Reservation.objects.get(pk=reservation.pk)
+        stale.status = 'confirmed'
+        stale.delete()
+        self.assertEqual(self.counters(), (1, 2))
+
+    def test_edit_within_slot_reuses_own_seats(self):
+        restaurant = RestaurantSettings.get_settings()
+        restaurant.max_capacity = 6
+        restaurant.save()
+        reservation = self.create('20:00', 6)
+
+        serializer = ReservationSerializer(reservation, data={'time': '20:15', 'party_size': 5}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        booking.book_reservation(serializer)
+        self.assertEqual(self.counters(), (1, 5))
+
+    def test_reconcile_command_fixes_drift(self):
+        self.create('20:00', 2)
+        self.create('20:00', 4)
+        SlotInventory.objects.filter(date=self.day).update(tables_booked=7, seats_booked=1)
+        Reservation.objects.bulk_create([Reservation(
+            first_name='Bulk', last_name='Import', email='bulk@example.com', phone='+355690000000',
+            date=self.day, time=time(22, 45), party_size=3, verification_code='BULK0001',
+        )])
+
+        out = io.StringIO()
+        call_command('reconcile_slot_inventory', '--dry-run', stdout=out)
+        self.assertIn('2 slots drifted', out.getvalue())
+        self.assertEqual(self.counters(), (7, 1))
+
+        call_command('reconcile_slot_inventory', '--from', self.day.isoformat(), stdout=io.StringIO())
+        self.assertEqual((self.counters(), self.counters(time(22, 30))), ((2, 6), (1, 3)))
+
+        out = io.StringIO()
+        call_command('reconcile_slot_inventory', stdout=out)
+        self.assertIn('consistent', out.getvalue())
+
+    def test_changing_the_slot_interval_rekeys_counters(self):
+        self.create('20:00', 2)
+        self.create('20:40', 4)
+        self.assertEqual((self.counters(), self.counters(time(20, 30))), ((1, 2), (1, 4)))
+
+        restaurant = RestaurantSettings.get_settings()
+        restaurant.slot_interval_minutes = 60
+        restaurant.save()
+        self.assertEqual((self.counters(), self.counters(time(20, 30))), ((2, 6), (0, 0)))
+        self.assertEqual(booking.slot_usage(self.day)[time(20, 0)], {'tables': 2, 'seats': 6})
+
+        # Later moves use the new keys
+        self.create('20:50', 1)
+        self.assertEqual(self.counters(), (3, 7))
+
+
+class VerificationCodeTests(TestCase):
+
+    def reservation(self, **extra):
+        return Reservation(
+            first_name='Ana', last_name='Leka', email='ana@example.com', phone='+355691234567',
+            date=date.today() + timedelta(days=2), time=time(20, 0), party_size=2, **extra
+        )
+
+    def test_create_runs_no_lookup_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            reservation = self.reservation()
+            reservation.save()
+        self.assertRegex(reservation.verification_code, r'^[A-HJ-NP-Z2-9]{8}$')
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'FROM "api_reservation"' in q['sql']])
+
+    def test_colliding_code_is_drawn_again(self):
+        self.reservation(verification_code='AAAAAAAA').save()
+        with mock.patch('api.models.secrets.choice', side_effect=['A'] * 8 + ['B'] * 8):
+            reservation = self.reservation()
+            reservation.save()
+        self.assertEqual(reservation.verification_code, 'BBBBBBBB')
+        self.assertEqual(Reservation.objects.count(), 2)
+        self.assertEqual(SlotInventory.objects.get().tables_booked, 2)
+
+        # Codes chosen by the caller are never replaced
+        with self.assertRaises(IntegrityError):
+            self.reservation(verification_code='AAAAAAAA').save()
+
+
+class OTPStoreTests(TestCase):
+
+    def test_memory_store_attempts_expiry_and_cooldown(self):
+        store = otp_store.MemoryOTPStore()
+        issued = store.issue('sms', '+355690000001', ttl=60, max_attempts=2)
+        self.assertRegex(issued.code, r'^\d{6}$')
+        self.assertNotIn(issued.code, str(store._entries))
+
+        wrong = '000000' if issued.code != '000000' else '111111'
+        self.assertEqual(store.verify('sms', '+355690000001', wrong), otp_store.INVALID)
+        self.assertEqual(store.verify('sms', '+355690000002', issued.code), otp_store.MISSING)
+        self.assertEqual(store.verify('sms', '+355690000001', issued.code), otp_store.VERIFIED)
+        # Used codes cannot be replayed
+        self.assertEqual(store.verify('sms', '+355690000001', issued.code), otp_store.MISSING)
+
+        issued = store.issue('sms', '+355690000001', ttl=60, max_attempts=1)
+        with self.assertRaises(otp_store.OTPCooldown):
+            store.issue('sms', '+355690000001', ttl=60, max_attempts=1, cooldown=60)
+        self.assertEqual(store.verify('sms', '+355690000001', wrong), otp_store.INVALID)
+        self.assertEqual(store.verify('sms', '+355690000001', issued.code), otp_store.LOCKED)
+
+        issued = store.issue('email', 'reservation', ttl=60, max_attempts=5)
+        with mock.patch('api.services.otp_store.time.monotonic', return_value=time_module.monotonic() + 61):
+            self.assertEqual(store.verify('email', 'reservation', issued.code), otp_store.MISSING)
+
+    def test_memory_store_refused_without_debug(self):
+        def load_settings(debug, argv):
+            env = {'DJANGO_DEBUG': debug, 'OTP_STORE': 'memory'}
+            with mock.patch.dict(os.environ, env), mock.patch('sys.argv', argv):
+                return runpy.run_module('server.settings')
+
+        with self.assertRaises(ImproperlyConfigured):
+            load_settings('False', ['gunicorn'])
+        self.assertEqual(load_settings('False', ['manage.py', 'test'])['OTP_STORE'], 'memory')
+        self.assertEqual(load_settings('True', ['manage.py', 'runserver'])['OTP_STORE'], 'memory')
+
+        with mock.patch.dict(os.environ, {'DJANGO_DEBUG': 'False'}), mock.patch('sys.argv', ['gunicorn']):
+            os.environ.pop('OTP_STORE', None)
+            self.assertEqual(runpy.run_module('server.settings')['OTP_STORE'], 'redis')
+
+    def test_otp_verification_records_are_gone(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('host', is_staff=True))
+        self.assertEqual(client.get('/api/otp-verifications/').status_code, 404)
+
+    def test_phone_flow_uses_store(self):
+        client = APIClient()
+        phone = '+355691110001'
+        response = client.post('/api/auth/request-otp/', {'phone': phone}, format='json')
+        self.assertEqual(response.status_code, 200)
+        code = response.data['otp_code']
+        self.assertEqual(client.post('/api/auth/resend-otp/', {'phone': phone}, format='json').status_code, 400)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/auth/verify-otp/', {'phone': phone, 'otp_code': code}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(client.post('/api/auth/verify-otp/', {'phone': phone, 'otp_code': code}, format='json').status_code, 400)
+
+    @mock.patch('api.views.GuestReservationViews.send_confirmation_email')
+    @mock.patch('api.views.GuestReservationViews.send_otp_email', return_value=True)
+    def test_wrong_email_code_does_not_write_reservation(self, send_otp, send_confirmation):
+        client = APIClient()
+        day = date.today() + timedelta(days=6)
+        response = client.post('/api/reservations/guest/', reservation_payload(day), format='json')
+        reservation_id = response.data['reservation_id']
+        code = send_otp.call_args.kwargs['otp_code']
+        wrong = '000000' if code != '000000' else '111111'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/reservations/verify-otp/', {
+                'reservation_id': reservation_id, 'otp_code': wrong,
+            }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE')])
+
+        response = client.post('/api/reservations/verify-otp/', {
+            'reservation_id': reservation_id, 'otp_code': code,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Reservation.objects.get(pk=reservation_id).status, 'confirmed')
+
+
+class ThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        rates = dict(SlidingWindowThrottle.THROTTLE_RATES, otp_ip='3/hour', otp_phone='2/hour', guest_lookup_email='2/minute')
+        patcher = mock.patch.object(SlidingWindowThrottle, 'THROTTLE_RATES', rates)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_limits_per_phone_and_ip_without_queries(self):
+        client = APIClient()
+        for _ in range(2):
+            self.assertEqual(client.post('/api/auth/request-otp/', {'phone': '+355692220001'}, format='json').status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/auth/request-otp/', {'phone': '+355692220001'}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(len(queries), 0)
+
+        # A new phone still has its own budget, but the IP has used its three
+        self.assertEqual(client.post('/api/auth/request-otp/', {'phone': '+355692220002'}, format='json').status_code, 429)
+        other_ip = APIClient(REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(other_ip.post('/api/auth/request-otp/', {'phone': '+355692220002'}, format='json').status_code, 200)
+
+    def test_spoofed_forwarded_for_does_not_reset_ip_budget(self):
+        client = APIClient()
+        statuses = [
+            client.post(
+                '/api/auth/request-otp/', {'phone': f'+35569222001{attempt}'}, format='json',
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{attempt}'
+            ).status_code
+            for attempt in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+        # Behind one trusted proxy the address it appended is the client's
+        with mock.patch('rest_framework.throttling.api_settings.NUM_PROXIES', 1):
+            forwarded = client.post(
+                '/api/auth/request-otp/', {'phone': '+355692220019'}, format='json',
+                HTTP_X_FORWARDED_FOR='198.51.100.7, 203.0.113.50'
+            )
+        self.assertEqual(forwarded.status_code, 200)
+
+    def test_phone_formatting_variants_share_a_budget(self):
+        phones = ['+355 69 222 0004', '+355692220004', '+355-69-222-0004']
+        statuses = [
+            APIClient(REMOTE_ADDR=f'10.0.1.{index}').post(
+                '/api/auth/request-otp/', {'phone': phone}, format='json'
+            ).status_code
+            for index, phone in enumerate(phones)
+        ]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    def test_lookup_limited_per_email(self):
+        client = APIClient()
+        payload = {'verification_code': 'NOPE2345', 'email': 'Guest@Example.com'}
+        for _ in range(2):
+            self.assertEqual(client.post('/api/reservations/cancel/', payload, format='json').status_code, 404)
+        payload['email'] = 'guest@example.com '
+        self.assertEqual(client.post('/api/reservations/cancel/', payload, format='json').status_code, 429)
+        # The email + phone lookup shares the budget
+        response = client.get('/api/reservations/lookup/', {'email': 'guest@example.com', 'phone': '+355690000000'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_window_slides(self):
+        throttle = OTPPhoneThrottle()
+        factory_request = Request(RequestFactory().get('/', {'phone': '+355692220003'}))
+        with mock.patch.object(throttle, 'timer', return_value=3600 * 10 + 1800):
+            self.assertTrue(throttle.allow_request(factory_request, None))
+            self.assertTrue(throttle.allow_request(factory_request, None))
+            self.assertFalse(throttle.allow_request(factory_request, None))
+        # Half of the next window later the three counted requests weigh 1.5
+        with mock.patch.object(throttle, 'timer', return_value=3600 * 11 + 1800):
+            self.assertFalse(throttle.allow_request(factory_request, None))
+        with mock.patch.object(throttle, 'timer', return_value=3600 * 12 + 1800):
+            self.assertTrue(throttle.allow_request(factory_request, None))
+
+
+class EmailNormalizationTests(TestCase):
+
+    def test_emails_stored_normalized_and_matched_exactly(self):
+        reservation = Reservation.objects.create(
+            first_name='Ana', last_name='Leka', email='  Ana.Leka@Example.COM ', phone='+355691234567',
+            date=date.today() + timedelta(days=2), time=time(20, 0), party_size=2,
+        )
+        self.assertEqual(reservation.email, 'ana.leka@example.com')
+        customer = CustomerProfile.objects.create(
+            email='VIP@Example.com', phone='+355691234567', first_name='Ana', last_name='Leka'
+        )
+        self.assertEqual(customer.email, 'vip@example.com')
+
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/reservations/cancel/', {
+                'verification_code': reservation.verification_code, 'email': 'ANA.LEKA@example.com',
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        lookup = queries.captured_queries[0]['sql']
+        self.assertIn('"email" = ', lookup)
+        self.assertNotIn('LIKE', lookup)
+
+    def test_backfill_migration(self):
+        migration = importlib.import_module('api.migrations.0020_normalize_emails')
+        reservation = Reservation.objects.create(
+            first_name='Ana', last_name='Leka', email='ana@example.com', phone='+355691234567',
+            date=date.today() + timedelta(days=2), time=time(20, 0), party_size=2,
+        )
+        Reservation.objects.filter(pk=reservation.pk).update(email=' Ana@Example.com')
+        CustomerProfile.objects.create(email='taken@example.com', phone='+1', first_name='A', last_name='B')
+        CustomerProfile.objects.filter(phone='+1').update(email='Taken@Example.com')
+        CustomerProfile.objects.create(email='taken@example.com', phone='+2', first_name='C', last_name='D')
+
+        with self.assertLogs(migration.__name__, 'WARNING') as report:
+            migration.normalize_emails(django_apps, None)
+        self.assertEqual(Reservation.objects.get(pk=reservation.pk).email, 'ana@example.com')
+        # The colliding profile is left for a human to merge
+        self.assertEqual(CustomerProfile.objects.get(phone='+1').email, 'Taken@Example.com')
+        self.assertEqual(len(report.records), 1)
+        self.assertIn(f'Customer {CustomerProfile.objects.get(phone="+1").pk}', report.output[0])
+
+    def test_unmerged_duplicate_profile_can_still_be_saved(self):
+        CustomerProfile.objects.create(email='taken@example.com', phone='+1', first_name='A', last_name='B')
+        CustomerProfile.objects.filter(phone='+1').update(email='Taken@Example.com')
+        CustomerProfile.objects.create(email='taken@example.com', phone='+2', first_name='C', last_name='D')
+
+        duplicate = CustomerProfile.objects.get(phone='+1')
+        duplicate.points = 50
+        duplicate.save()
+        self.assertEqual(CustomerProfile.objects.get(phone='+1').email, 'Taken@Example.com')
+
+        serializer = CustomerProfileSerializer(duplicate, data={'email': 'Taken@Example.com'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        # Moving to an email another profile owns is refused instead of a 500
+        serializer = CustomerProfileSerializer(duplicate, data={'email': 'TAKEN@example.com '}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('email', serializer.errors)
+        with self.assertRaises(ValidationError):
+            CustomerProfile(email=' Taken@example.COM', phone='+3', first_name='E', last_name='F').save()
+
+
+class SearchTests(TestCase):
+
+    def reservation(self, first_name, last_name, email, **fields):
+        return Reservation.objects.create(
+            first_name=first_name, last_name=last_name, email=email, phone=fields.pop('phone', '+355691234567'),
+            date=date.today() + timedelta(days=2), time=time(20, 0), party_size=2, **fields
+        )
+
+    def search_ids(self, query):
+        return set(search.search_queryset(Reservation.objects.all(), query).values_list('pk', flat=True))
+
+    def test_document_folds_accents_and_splits_emails(self):
+        self.assertEqual(
+            search.build_document('Ëlira', 'Çela', 'elira.cela@example.com'),
+            'elira cela elira.cela@example.com example com'
+        )
+        self.assertEqual(search.query_terms('  ËLIRA  ce'), ['elira', 'ce'])
+
+    def test_every_term_matches_as_prefix(self):
+        elira = self.reservation('Ëlira', 'Çela', 'elira@example.com')
+        ana = self.reservation('Ana', 'Leka', 'ana.leka@example.com', phone='+355699999999')
+
+        self.assertEqual(self.search_ids('eli'), {elira.pk})
+        self.assertEqual(self.search_ids('ana lek'), {ana.pk})
+        self.assertEqual(self.search_ids('ana cela'), set())
+        self.assertEqual(self.search_ids('3556999'), {ana.pk})
+        self.assertEqual(self.search_ids(ana.verification_code.lower()), {ana.pk})
+        self.assertEqual(self.search_ids('"*'), set())
+
+    def test_document_follows_updates_and_deletes(self):
+        reservation = self.reservation('Ana', 'Leka', 'ana@example.com')
+        reservation.last_name = 'Gashi'
+        reservation.save(update_fields=['last_name'])
+        self.assertEqual(self.search_ids('gashi'), {reservation.pk})
+        self.assertEqual(self.search_ids('leka'), set())
+
+        reservation.delete()
+        self.assertEqual(self.search_ids('gashi'), set())
+
+    def test_admin_search_endpoint(self):
+        self.reservation('Ana', 'Leka', 'ana@example.com')
+        self.reservation('Anabel', 'Hoxha', 'anabel@example.com')
+        CustomerProfile.objects.create(email='ana@example.com', phone='+355691234567', first_name='Ana', last_name='Leka')
+
+        client = APIClient()
+        self.assertEqual(client.get('/api/admin/search/', {'q': 'ana'}).status_code, 401)
+        client.force_authenticate(User.objects.create_user('host', is_staff=True))
+        response = client.get('/api/admin/search/', {'q': 'ana', 'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['reservations']), 1)
+        self.assertEqual(response.data['customers'][0]['email'], 'ana@example.com')
+
+        response = client.get('/api/admin/search/', {'q': 'hox', 'type': 'reservations'})
+        self.assertEqual([r['name'] for r in response.data['reservations']], ['Anabel Hoxha'])
+        self.assertNotIn('customers', response.data)
+        self.assertEqual(client.get('/api/admin/search/', {'q': 'a', 'type': 'tables'}).status_code, 400)
+
+        response = client.get('/api/reservations/', {'search': 'anabel'})
+        self.assertEqual([r['last_name'] for r in response.data['results']], ['Hoxha'])
+
+    def test_django_admin_search_uses_search_document(self):
+        self.reservation('Ana', 'Leka', 'ana@example.com')
+        self.reservation('Anabel', 'Hoxha', 'anabel@example.com')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/admin/api/reservation/', {'q': 'hox'}, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r.last_name for r in response.context['cl'].result_list], ['Hoxha'])
+        self.assertFalse(any('LIKE' in query['sql'] for query in queries.captured_queries))
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('exporter', is_staff=True))
+
+    def reservation(self, first_name, **fields):
+        return Reservation.objects.create(
+            first_name=first_name, last_name='Leka', email=f'{first_name.lower()}@example.com',
+            phone='+355691234567', date=date.today() + timedelta(days=2), time=time(20, 0), party_size=2, **fields
+        )
+
+    def test_reservation_csv_streams_filtered_rows(self):
+        self.reservation('Ana', status='confirmed')
+        self.reservation('=HYPERLINK("x")', status='confirmed')
+        self.reservation('Besa', status='cancelled')
+
+        response = self.client.get('/api/reservations/export/', {'status': 'confirmed'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="reservations-', response['Content-Disposition'])
+
+        chunks = iter(response.streaming_content)
+        # The header goes out on its own, before any row is read
+        self.assertTrue(next(chunks).startswith(b'id,verification_code,date,'))
+        lines = b''.join(chunks).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('+355691234567', lines[0] + lines[1])
+        self.assertIn('\'=HYPERLINK', lines[0] + lines[1])
+
+    def test_customer_ndjson_and_permissions(self):
+        CustomerProfile.objects.create(
+            email='ana@example.com', phone='+1', first_name='Ana', last_name='Leka', lifetime_spent=Decimal('12.50')
+        )
+        CustomerProfile.objects.create(email='besa@example.com', phone='+2', first_name='Besa', last_name='Gashi')
+
+        response = self.client.get('/api/customers/export/', {'output': 'ndjson', 'search': 'ana'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(r['email'], r['lifetime_spent']) for r in records], [('ana@example.com', 12.5)])
+
+        self.assertEqual(self.client.get('/api/customers/export/', {'output': 'xlsx'}).status_code, 400)
+        staff_only = APIClient()
+        staff_only.force_authenticate(User.objects.create_user('member'))
+        self.assertEqual(staff_only.get('/api/customers/export/').status_code, 403)
+        self.assertEqual(staff_only.get('/api/contact/export/').status_code, 403)
+
+    def test_message_and_sms_exports(self):
+        user = User.objects.create_user('guest', email='guest@example.com')
+        conversation = ClientConversation.objects.create(user=user, subject='Birthday')
+        ClientMessage.objects.create(conversation=conversation, content='Hello', sender_type='client', sender_name='G')
+        ClientMessage.objects.create(conversation=conversation, content='Hi!', sender_type='admin', sender_name='A')
+        reservation = self.reservation('Ana')
+        SMSNotification.objects.create(
+            recipient_phone='+355691234567', message='See you', notification_type='reminder', reservation=reservation
+        )
+
+        response = self.client.get('/api/admin/client-messages/export/', {
+            'conversation': str(conversation.id), 'sender_type': 'client', 'date_from': date.today().isoformat(),
+        })
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Birthday,guest@example.com,client', lines[1])
+
+        response = self.client.get('/api/admin/sms-notifications/export/', {'output': 'ndjson', 'status': 'pending'})
+        record = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(record['reservation__verification_code'], reservation.verification_code)
+
+        client = self.client
+        self.assertEqual(client.get('/api/admin/sms-notifications/export/', {'date_to': '19/10'}).status_code, 400)
+        self.assertEqual(client.get('/api/admin/client-messages/export/', {'conversation': 'x'}).status_code, 400)
+
+    def test_buffered_blocks(self):
+        blocks = list(exports.buffered(['head\n'] + ['row\n'] * 10, flush_bytes=16))
+        self.assertEqual(blocks[0], b'head\n')
+        self.assertEqual(b''.join(blocks), b'head\n' + b'row\n' * 10)
+        self.assertTrue(all(len(block) <= 16 for block in blocks))
+
+
+class ReservationCalendarTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        restaurant = RestaurantSettings.get_settings()
+        restaurant.opening_time = time(18, 0)
+        restaurant.closing_time = time(20, 0)
+        restaurant.max_tables_per_slot = 1
+        restaurant.advance_booking_days = 40
+        restaurant.save()
+        # A day in next month, inside the booking window
+        self.day = (date.today().replace(day=1) + timedelta(days=40)).replace(day=10)
+        self.month = self.day.strftime('%Y-%m')
+
+    def days(self, party_size=2):
+        response = APIClient().get('/api/reservations/calendar/', {'month': self.month, 'party_size': party_size})
+        self.assertEqual(response.status_code, 200)
+        return {day['date']: day for day in response.data['days']}
+
+    def book(self, at, party_size=2):
+        serializer = ReservationSerializer(data=reservation_payload(self.day, at, party_size))
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.book_reservation(serializer)
+
+    def test_levels_follow_bookings_and_cache_is_invalidated(self):
+        self.assertEqual(self.days()[self.day.isoformat()], {
+            'date': self.day.isoformat(), 'level': 'available', 'slots_open': 4, 'slots_total': 4,
+        })
+        self.book('18:00')
+        self.book('18:30')
+        self.book('19:10')
+        self.assertEqual(self.days()[self.day.isoformat()]['level'], 'limited')
+        self.book('19:45')
+        self.assertEqual(self.days()[self.day.isoformat()]['level'], 'full')
+
+        # Served from the cache until the next booking in the month
+        with CaptureQueriesContext(connection) as queries:
+            self.days()
+        self.assertFalse([q for q in queries.captured_queries if 'slotinventory' in q['sql']])
+
+    def test_window_opening_hours_and_party_size(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            RestaurantInfo.objects.create(
+                    name='Lounge', address_line1='Rruga 1', city='Tirana',
+                opening_hours={'monday': 'closed', 'friday': {'open': '18:00', 'close': '19:00'}},
+            )
+        days = self.days()
+        for entry in days.values():
+            day = date.fromisoformat(entry['date'])
+            if day < date.today() or day > date.today() + timedelta(days=40):
+                self.assertEqual(entry['level'], 'unavailable')
+            elif day.weekday() == 0:
+                self.assertEqual(entry['level'], 'closed')
+            elif day.weekday() == 4 and day > date.today():
+                self.assertEqual(entry['slots_total'], 2)
+
+        client = APIClient()
+        too_large = RestaurantSettings.get_settings().max_party_size + 1
+        self.assertEqual(client.get('/api/reservations/calendar/', {'party_size': too_large}).status_code, 400)
+        self.assertEqual(client.get('/api/reservations/calendar/', {'month': '2026-13'}).status_code, 400)
+
+
+class BookingStressTests(TransactionTestCase):
+    """
+    Twenty threads race for a five-table slot. Run with DATABASE_URL pointing
+    at PostgreSQL to exercise the row lock; SQLite serialises writers anyway.
+    """
+
+    def test_concurrent_bookings_never_overbook(self):
+        day = date.today() + timedelta(days=5)
+        restaurant = RestaurantSettings.get_settings()
+        restaurant.max_tables_per_slot = 5
+        restaurant.save()
+
+        attempts = 20
+        barrier = threading.Barrier(attempts)
+        outcomes = []
+
+        def book(index):
+            serializer = ReservationSerializer(data=reservation_payload(day, '21:00', 2, last_name=f'Guest {index}'))
+            serializer.is_valid(raise_exception=True)
+            barrier.wait()
+            try:
+                # SQLite's shared-cache test database reports lock conflicts
+                # instead of waiting for them, so retry like a client would
+                for _ in range(200):
+                    try:
+                        booking.book_reservation(serializer)
+                        outcomes.append('booked')
+                        return
+                    except OperationalError as e:
+                        if 'locked' not in str(e):
+                            raise
+                        time_module.sleep(0.005)
+            except booking.SlotUnavailable:
+                outcomes.append('full')
+            except Exception as e:
+                outcomes.append(repr(e))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=book, args=(index,)) for index in range(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(set(outcomes)), ['booked', 'full'])
+        self.assertEqual(outcomes.count('booked'), 5)
+        self.assertEqual(Reservation.objects.filter(date=day).count(), 5)
+        inventory = SlotInventory.objects.get(date=day, slot_start=time(21, 0))
+        self.assertEqual((inventory.tables_booked, inventory.seats_booked), (5, 10))
+
+
 if __name__ == "__main__":
     test_api()
\ No newline at end of file
@@ -0,0 +1,147 @@
+# server/api/throttling.py
+"""
+Sliding-window rate limits for the public OTP, guest reservation and lookup
+endpoints.
+
+Each throttle keeps one counter per fixed window in the default cache
+(Redis when USE_REDIS_CACHE is on, local memory otherwise) and estimates the
+sliding window as the current count plus the previous window's count
+weighted by how much of it still overlaps. Counters are only ever
+incremented (atomic INCR on Redis), and rejected requests count too, so a
+client hammering an endpoint stays limited. Nothing here touches the
+database, and DRF runs throttles before the view, so a rejected request
+costs two cache round trips.
+
+Rates are the REST_FRAMEWORK DEFAULT_THROTTLE_RATES scopes below. Identities
+(phone, email, ...) are normalized, so formatting variants share one budget,
+and hashed before they are used in cache keys.
+"""
+
+import hashlib
+import re
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from .models import normalize_email
+
+_NON_DIGITS_RE = re.compile(r'\D')
+
+
+def normalize_phone(value):
+    """Digits only, with a 00 international prefix read as +: '+355 69-1' -> '355691'"""
+    digits = _NON_DIGITS_RE.sub('', value)
+    return digits[2:] if digits.startswith('00') else digits
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Limits requests per client IP, or per value of ident_field in the request
+    body or query string. Requests without that field are not limited by it.
+    """
+    ident_field = None
+
+    def get_ident_value(self, request):
+        if self.ident_field is None:
+            return self.get_ident(request)
+        try:
+            value = request.data.get(self.ident_field)
+        except AttributeError:
+            value = None
+        value = value or request.query_params.get(self.ident_field)
+        return self.normalize_ident(str(value)) if value else None
+
+    def normalize_ident(self, value):
+        return value.strip().lower()
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.sha256(ident.encode('utf-8')).hexdigest()[:32],
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        elapsed = (now % self.duration) / self.duration
+        current_key, previous_key = f"{key}:{window}", f"{key}:{window - 1}"
+
+        self.cache.add(current_key, 0, timeout=self.duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            self.cache.set(current_key, 1, timeout=self.duration * 2)
+            current = 1
+        previous = self.cache.get(previous_key, 0)
+
+        if previous * (1 - elapsed) + current <= self.num_requests:
+            return True
+        self._wait = self._wait_seconds(current, previous, elapsed)
+        return False
+
+    def _wait_seconds(self, current, previous, elapsed):
+        """Until the previous window has decayed enough (or this one is over)"""
+        if current >= self.num_requests or not previous:
+            return self.duration * (1 - elapsed)
+        needed = 1 - (self.num_requests - current) / previous
+        return max(needed - elapsed, 0) * self.duration
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class OTPIPThrottle(SlidingWindowThrottle):
+    scope = 'otp_ip'
+
+
+class PhoneThrottle(SlidingWindowThrottle):
+    ident_field = 'phone'
+
+    def normalize_ident(self, value):
+        # Input without any digits is still limited, as typed
+        return normalize_phone(value) or super().normalize_ident(value)
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    ident_field = 'email'
+
+    def normalize_ident(self, value):
+        return normalize_email(value)
+
+
+class OTPPhoneThrottle(PhoneThrottle):
+    scope = 'otp_phone'
+
+
+class GuestBookingIPThrottle(SlidingWindowThrottle):
+    scope = 'guest_booking_ip'
+
+
+class GuestBookingEmailThrottle(EmailThrottle):
+    scope = 'guest_booking_email'
+
+
+class GuestOTPIPThrottle(SlidingWindowThrottle):
+    scope = 'guest_otp_ip'
+
+
+class GuestOTPReservationThrottle(SlidingWindowThrottle):
+    scope = 'guest_otp_reservation'
+    ident_field = 'reservation_id'
+
+
+class GuestLookupIPThrottle(SlidingWindowThrottle):
+    scope = 'guest_lookup_ip'
+
+
+class GuestLookupEmailThrottle(EmailThrottle):
+    scope = 'guest_lookup_email'
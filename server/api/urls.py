@@ -26,7 +26,6 @@ from .views import (
     request_otp,
     verify_otp,
     resend_otp,
-    OTPVerificationViewSet,
     CustomerProfileViewSet,
     VIPMembershipViewSet,
     OfferViewSet,
@@ -42,6 +41,7 @@ from .views import (
     RestaurantInfoAdminViewSet,
     public_restaurant_info,
     public_page_content,
+    public_home_bundle,
     # Guest reservation views
     create_guest_reservation,
     verify_reservation_otp,
@@ -70,6 +70,15 @@ from .views import (
     # Moments views
     MomentViewSet,
     PublicMomentViewSet,
+    # Profiling
+    profile_token,
+    profile_list,
+    profile_download,
+    # Search
+    admin_search,
+    # Exports
+    export_client_messages,
+    export_sms_notifications,
 )
 
 # Create router and register viewsets
@@ -94,9 +103,6 @@ router.register(r'vip-memberships', VIPMembershipViewSet, basename='vipmembershi
 router.register(r'offers', OfferViewSet, basename='offer')
 router.register(r'waitlist', WaitlistViewSet, basename='waitlist')
 
-# Phase 5: OTP verification viewset (admin only)
-router.register(r'otp-verifications', OTPVerificationViewSet, basename='otpverification')
-
 # Localized public endpoints (with ?locale=sq|en support)
 router.register(r'public/events', PublicEventViewSet, basename='public-events')
 router.register(r'public/gallery', PublicGalleryViewSet, basename='public-gallery')
@@ -134,6 +140,7 @@ urlpatterns = [
     # Public localized content endpoints
     path('public/info/', public_restaurant_info, name='public_restaurant_info'),
     path('public/pages/<str:page_slug>/', public_page_content, name='public_page_content'),
+    path('public/home-bundle/', public_home_bundle, name='public_home_bundle'),
 
     # Guest reservation endpoints
     path('reservations/guest/', create_guest_reservation, name='create_guest_reservation'),
@@ -164,6 +171,19 @@ urlpatterns = [
     path('admin/client-conversations/<uuid:conversation_id>/messages/', admin_conversation_messages, name='admin_conversation_messages'),
     path('admin/client-conversations/<uuid:conversation_id>/close/', admin_close_conversation, name='admin_close_conversation'),
     path('admin/client-conversations/<uuid:conversation_id>/reopen/', admin_reopen_conversation, name='admin_reopen_conversation'),
+
+    # Staff profiling endpoints
+    path('admin/profiles/', profile_list, name='profile_list'),
+    path('admin/profiles/token/', profile_token, name='profile_token'),
+    path('admin/profiles/<str:name>/', profile_download, name='profile_download'),
+
+    # Staff type-ahead search
+    path('admin/search/', admin_search, name='admin_search'),
+
+    # Staff CSV / NDJSON exports (reservations, customers and contact
+    # messages are exported from their list routes: <list>/export/)
+    path('admin/client-messages/export/', export_client_messages, name='export_client_messages'),
+    path('admin/sms-notifications/export/', export_sms_notifications, name='export_sms_notifications'),
 ]
 
 # Serve media files during development
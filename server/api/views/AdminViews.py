@@ -13,6 +13,7 @@ from django.db.models import Count, Q, Sum, Avg
 from django.core.exceptions import ValidationError
 from datetime import datetime, timedelta, date, time
 
+from api.db_routers import read_from_replica
 from api.models import Reservation, Event, GalleryItem, ContactMessage
 from api.serializers import LoginSerializer, CustomUserSerializer
 
@@ -71,6 +72,7 @@ def admin_logout(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica()
 def dashboard_analytics(request):
     """Get comprehensive dashboard analytics data matching frontend expectations"""
     today = timezone.now().date()
@@ -1,16 +1,18 @@
 # server/api/views/AuthViews.py
-from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework import status
+from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny
 from django.utils import timezone
-from ..models import OTPVerification, CustomerProfile
-from ..serializers import OTPVerificationSerializer, CustomerProfileSerializer
+from ..models import CustomerProfile, normalize_email
+from ..serializers import CustomerProfileSerializer
 from ..services import SMSService
+from ..throttling import OTPIPThrottle, OTPPhoneThrottle
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([OTPIPThrottle, OTPPhoneThrottle])
 def request_otp(request):
     """
     Request OTP for phone verification
@@ -45,7 +47,7 @@ def request_otp(request):
             'expires_at': otp.expires_at,
             'dev_mode': not sms_service.twilio_enabled,
             # Only include OTP in dev mode for testing
-            'otp_code': otp.otp_code if not sms_service.twilio_enabled else None
+            'otp_code': otp.code if not sms_service.twilio_enabled else None
         }, status=status.HTTP_200_OK)
 
     except ValueError as e:
@@ -88,7 +90,7 @@ def verify_otp(request):
 
     try:
         sms_service = SMSService()
-        success, message, otp = sms_service.verify_otp(phone, otp_code)
+        success, message = sms_service.verify_otp(phone, otp_code)
 
         if not success:
             return Response(
@@ -120,15 +122,15 @@ def verify_otp(request):
                 defaults={
                     'first_name': first_name,
                     'last_name': last_name,
-                    'email': email.lower()
+                    'email': normalize_email(email)
                 }
             )
 
             # If customer exists but email doesn't match, update it
-            if not created and customer.email != email.lower():
+            if not created and customer.email != normalize_email(email):
                 # Try to update email if provided email is not already in use
-                if not CustomerProfile.objects.filter(email=email.lower()).exclude(id=customer.id).exists():
-                    customer.email = email.lower()
+                if not CustomerProfile.objects.filter(email=normalize_email(email)).exclude(id=customer.id).exists():
+                    customer.email = normalize_email(email)
                     customer.first_name = first_name
                     customer.last_name = last_name
                     customer.save()
@@ -148,6 +150,7 @@ def verify_otp(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([OTPIPThrottle, OTPPhoneThrottle])
 def resend_otp(request):
     """
     Resend OTP to phone number
@@ -175,7 +178,7 @@ def resend_otp(request):
             'expires_at': otp.expires_at,
             'dev_mode': not sms_service.twilio_enabled,
             # Only include OTP in dev mode for testing
-            'otp_code': otp.otp_code if not sms_service.twilio_enabled else None
+            'otp_code': otp.code if not sms_service.twilio_enabled else None
         }, status=status.HTTP_200_OK)
 
     except ValueError as e:
@@ -188,27 +191,3 @@ def resend_otp(request):
             {'error': f'Failed to resend OTP: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
-
-
-class OTPVerificationViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    ViewSet for OTP verification records (admin only)
-    """
-    queryset = OTPVerification.objects.all()
-    serializer_class = OTPVerificationSerializer
-    permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        queryset = OTPVerification.objects.all()
-
-        # Filter by phone
-        phone = self.request.query_params.get('phone', None)
-        if phone:
-            queryset = queryset.filter(phone=phone)
-
-        # Filter by verification status
-        is_verified = self.request.query_params.get('is_verified', None)
-        if is_verified is not None:
-            queryset = queryset.filter(is_verified=is_verified.lower() == 'true')
-
-        return queryset.order_by('-created_at')
@@ -10,10 +10,12 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.db import transaction
+from django.db.models import Count, Q
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from ..models import UserProfile, Reservation, ClientConversation, ClientMessage
+from ..models import UserProfile, Reservation, ClientConversation, ClientMessage, normalize_email
 from ..serializers import ReservationSerializer
+from ..pagination import KeysetPagination
 
 
 class UserProfileSerializer:
@@ -312,7 +314,7 @@ def link_reservation(request):
     try:
         reservation = Reservation.objects.get(
             verification_code=verification_code,
-            email__iexact=email
+            email=normalize_email(email)
         )
     except Reservation.DoesNotExist:
         return Response({
@@ -511,12 +513,23 @@ def admin_client_conversations(request):
             'message': 'Admin access required'
         }, status=status.HTTP_403_FORBIDDEN)
 
-    conversations = ClientConversation.objects.all().select_related('user')
+    conversations = ClientConversation.objects.all().select_related('user').annotate(
+        client_unread_count=Count(
+            'messages', filter=Q(messages__sender_type='client', messages__is_read=False)
+        )
+    )
+
+    # Keyset pages on request (?cursor= / ?page_size=), the full list otherwise
+    paginator = None
+    if KeysetPagination.is_requested(request):
+        paginator = KeysetPagination()
+        paginator.ordering = ('-updated_at', '-id')
+        conversations = paginator.paginate_queryset(conversations, request)
 
     result = []
     for conv in conversations:
         last_message = conv.messages.order_by('-created_at').first()
-        unread_count = conv.messages.filter(sender_type='client', is_read=False).count()
+        unread_count = conv.client_unread_count
 
         result.append({
             'id': str(conv.id),
@@ -530,10 +543,13 @@ def admin_client_conversations(request):
             'last_message': MessageSerializer.serialize(last_message) if last_message else None,
         })
 
-    return Response({
+    data = {
         'success': True,
         'conversations': result
-    })
+    }
+    if paginator is not None:
+        data['next'] = paginator.get_next_link()
+    return Response(data)
 
 
 @api_view(['GET', 'POST'])
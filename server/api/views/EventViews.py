@@ -4,6 +4,7 @@ import logging
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -21,6 +22,7 @@ import uuid
 
 from api.models import (Event)
 from api.serializers import (EventSerializer, PublicEventSerializer)
+from .ViewMixins import KeysetListMixin, SparseFieldsetMixin
 
 logger = logging.getLogger(__name__)
 
@@ -63,10 +65,31 @@ except ImportError as e:
 
 if not VIDEO_COLUMNS_EXIST:
     logger.warning("Video columns not found in database. Run 'python manage.py migrate' to enable video features.")
-class EventViewSet(viewsets.ModelViewSet):
+
+# Default sizes of /events/featured/ and /events/upcoming/ (also used by the
+# home page bundle)
+FEATURED_EVENTS_LIMIT = 5
+UPCOMING_EVENTS_LIMIT = 20
+
+
+def upcoming_events():
+    """Active events from today on, in public display order"""
+    return Event.objects.filter(
+        is_active=True,
+        start_date__gte=timezone.now().date()
+    ).order_by('display_order', 'start_date', 'start_time')
+
+
+def featured_events():
+    """Upcoming featured events, limited like /events/featured/"""
+    return upcoming_events().filter(is_featured=True)[:FEATURED_EVENTS_LIMIT]
+
+
+class EventViewSet(KeysetListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)
+    keyset_ordering = ('display_order', 'start_date', 'start_time', 'id')
     
     def get_permissions(self):
         """Public access for list/retrieve, admin only for create/update/delete"""
@@ -156,6 +179,11 @@ class EventViewSet(viewsets.ModelViewSet):
             # Order by display_order and start_date
             queryset = queryset.order_by('display_order', 'start_date', 'start_time')
 
+            page = self.paginate_keyset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_keyset_response(serializer.data)
+
             # Apply limit if specified
             limit = request.query_params.get('limit')
             if limit:
@@ -172,6 +200,8 @@ class EventViewSet(viewsets.ModelViewSet):
                 'results': serializer.data,
                 'count': len(serializer.data)
             })
+        except NotFound:
+            raise
         except Exception as e:
             logger.exception(f"Error listing events: {e}")
             return Response(
@@ -182,34 +212,29 @@ class EventViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming events for the public events page"""
-        today = timezone.now().date()
-        queryset = Event.objects.filter(
-            is_active=True,
-            start_date__gte=today
-        ).order_by('display_order', 'start_date', 'start_time')
+        queryset = upcoming_events()
         
         # Limit results for performance
-        limit = request.query_params.get('limit', 20)
+        limit = request.query_params.get('limit', UPCOMING_EVENTS_LIMIT)
         try:
             limit = int(limit)
             queryset = queryset[:limit]
         except (ValueError, TypeError):
-            queryset = queryset[:20]
+            queryset = queryset[:UPCOMING_EVENTS_LIMIT]
         
-        serializer = PublicEventSerializer(queryset, many=True, context={'request': request})
+        serializer = PublicEventSerializer(
+            queryset, many=True, context={'request': request}, **self.get_sparse_fields()
+        )
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get featured events"""
-        today = timezone.now().date()
-        queryset = Event.objects.filter(
-            is_active=True,
-            is_featured=True,
-            start_date__gte=today
-        ).order_by('display_order', 'start_date', 'start_time')[:5]
+        queryset = featured_events()
         
-        serializer = PublicEventSerializer(queryset, many=True, context={'request': request})
+        serializer = PublicEventSerializer(
+            queryset, many=True, context={'request': request}, **self.get_sparse_fields()
+        )
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -236,7 +261,9 @@ class EventViewSet(viewsets.ModelViewSet):
         # Order by featured first, then display order, then date
         queryset = queryset.order_by('-is_featured', 'display_order', 'start_date', 'start_time')
         
-        serializer = PublicEventSerializer(queryset, many=True, context={'request': request})
+        serializer = PublicEventSerializer(
+            queryset, many=True, context={'request': request}, **self.get_sparse_fields()
+        )
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
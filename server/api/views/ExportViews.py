@@ -0,0 +1,104 @@
+# server/api/views/ExportViews.py
+"""
+Staff CSV / NDJSON exports for models without a list viewset (chat messages
+and SMS notifications). Reservations, customers and contact messages are
+exported by their viewsets (ExportMixin).
+"""
+
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..models import ClientMessage, SMSNotification
+from ..services.exports import CONTENT_TYPES, export_response
+
+CLIENT_MESSAGE_COLUMNS = (
+    'id', 'conversation_id', 'conversation__subject', 'conversation__user__email', 'sender_type',
+    'sender_name', 'content', 'is_read', 'created_at',
+)
+SMS_NOTIFICATION_COLUMNS = (
+    'id', 'recipient_phone', 'notification_type', 'status', 'message', 'twilio_sid', 'error_message',
+    'reservation_id', 'reservation__verification_code', 'sent_at', 'created_at',
+)
+
+
+class ExportFilterError(ValueError):
+    pass
+
+
+def filter_created(queryset, params):
+    """?date_from= / ?date_to= (YYYY-MM-DD, inclusive) on created_at"""
+    for param, lookup in (('date_from', 'created_at__date__gte'), ('date_to', 'created_at__date__lte')):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise ExportFilterError(f'{param} must be YYYY-MM-DD')
+        queryset = queryset.filter(**{lookup: day})
+    return queryset
+
+
+def filter_exact(queryset, params, fields):
+    for field in fields:
+        value = params.get(field)
+        if not value:
+            continue
+        try:
+            queryset = queryset.filter(**{field: value})
+        except ValidationError:
+            raise ExportFilterError(f'Invalid {field}')
+    return queryset
+
+
+def stream_export(request, build_queryset, columns, name):
+    """build_queryset(query_params) applies the endpoint's filters"""
+    output = request.query_params.get('output', 'csv')
+    if output not in CONTENT_TYPES:
+        return Response(
+            {'error': f"output must be one of: {', '.join(CONTENT_TYPES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        queryset = filter_created(build_queryset(request.query_params), request.query_params)
+    except ExportFilterError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return export_response(queryset, columns, output, name)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_client_messages(request):
+    """
+    GET /api/admin/client-messages/export/?output=csv|ndjson
+    Filters: conversation, sender_type, is_read (true/false), date_from, date_to.
+    """
+    def build_queryset(params):
+        queryset = filter_exact(ClientMessage.objects.all(), params, ['conversation', 'sender_type'])
+        is_read = params.get('is_read')
+        if is_read is not None:
+            queryset = queryset.filter(is_read=is_read.lower() == 'true')
+        return queryset.order_by('conversation_id', 'created_at')
+
+    return stream_export(request, build_queryset, CLIENT_MESSAGE_COLUMNS, 'client-messages')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_sms_notifications(request):
+    """
+    GET /api/admin/sms-notifications/export/?output=csv|ndjson
+    Filters: status, notification_type, recipient_phone, reservation, date_from, date_to.
+    """
+    def build_queryset(params):
+        return filter_exact(
+            SMSNotification.objects.all(), params,
+            ['status', 'notification_type', 'recipient_phone', 'reservation']
+        ).order_by('-created_at', '-id')
+
+    return stream_export(request, build_queryset, SMS_NOTIFICATION_COLUMNS, 'sms-notifications')
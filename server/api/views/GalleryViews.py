@@ -16,10 +16,12 @@ import json
 
 from api.models import (GalleryItem)
 from api.serializers import (GalleryItemSerializer, PublicGalleryItemSerializer)
-class GalleryItemViewSet(viewsets.ModelViewSet):
+from .ViewMixins import KeysetListMixin, SparseFieldsetMixin
+class GalleryItemViewSet(KeysetListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = GalleryItem.objects.all()
     serializer_class = GalleryItemSerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)
+    keyset_ordering = ('display_order', '-created_at', 'id')
     
     def get_permissions(self):
         """Public access for list/retrieve, admin only for create/update/delete"""
@@ -59,6 +61,11 @@ class GalleryItemViewSet(viewsets.ModelViewSet):
         # Order by display_order and creation date
         queryset = queryset.order_by('display_order', '-created_at')
         
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -80,7 +87,9 @@ class GalleryItemViewSet(viewsets.ModelViewSet):
         # Order by featured first, then display order
         queryset = queryset.order_by('-is_featured', 'display_order', '-created_at')
         
-        serializer = PublicGalleryItemSerializer(queryset, many=True, context={'request': request})
+        serializer = PublicGalleryItemSerializer(
+            queryset, many=True, context={'request': request}, **self.get_sparse_fields()
+        )
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -4,18 +4,24 @@ Guest reservation API views for public reservation flow with OTP verification.
 """
 
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.utils import timezone
 
-from ..models import Reservation
+from ..models import Reservation, normalize_email
 from ..serializers import ReservationSerializer
+from ..services.booking import HoldClosed, SlotUnavailable, book_reservation, can_confirm_hold, confirm_hold
 from ..services.email_service import send_otp_email, send_confirmation_email
+from ..throttling import (
+    GuestBookingEmailThrottle, GuestBookingIPThrottle, GuestLookupEmailThrottle, GuestLookupIPThrottle,
+    GuestOTPIPThrottle, GuestOTPReservationThrottle,
+)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([GuestBookingIPThrottle, GuestBookingEmailThrottle])
 def create_guest_reservation(request):
     """
     Create a guest reservation and send OTP for email verification.
@@ -46,16 +52,24 @@ def create_guest_reservation(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    # Save reservation (will generate verification code)
-    reservation = serializer.save(
-        status='pending',
-        email_verified=False,
-        preferred_locale=locale
-    )
+    # Save reservation (will generate verification code); the seats are
+    # held until the email is verified or the hold expires
+    try:
+        reservation = book_reservation(
+            serializer,
+            hold=True,
+            status='pending',
+            email_verified=False,
+            preferred_locale=locale
+        )
+    except SlotUnavailable as e:
+        return Response({
+            'message': str(e),
+            'code': 'slot_unavailable'
+        }, status=status.HTTP_409_CONFLICT)
 
     # Generate and send OTP
     otp_code = reservation.generate_email_otp()
-    reservation.save()
 
     # Send OTP email
     email_sent = send_otp_email(
@@ -113,6 +127,13 @@ def verify_reservation_otp(request):
             'message': 'Reservation not found'
         }, status=status.HTTP_404_NOT_FOUND)
 
+    # Cancelled or already confirmed reservations have nothing to verify
+    if not can_confirm_hold(reservation):
+        return Response({
+            'success': False,
+            'message': 'This reservation can no longer be verified.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
     # Verify OTP
     success, message = reservation.verify_email_otp(otp_code)
 
@@ -122,6 +143,21 @@ def verify_reservation_otp(request):
             'message': message
         }, status=status.HTTP_400_BAD_REQUEST)
 
+    try:
+        reservation = confirm_hold(reservation)
+    except HoldClosed as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except SlotUnavailable:
+        return Response({
+            'success': False,
+            'message': 'Your hold on this table expired and the slot has since been booked. '
+                       'Please choose another time.',
+            'code': 'slot_unavailable'
+        }, status=status.HTTP_409_CONFLICT)
+
     # Send confirmation email
     send_confirmation_email(reservation)
 
@@ -134,6 +170,7 @@ def verify_reservation_otp(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([GuestOTPIPThrottle, GuestOTPReservationThrottle])
 def resend_reservation_otp(request):
     """
     Resend OTP code for a reservation.
@@ -169,7 +206,6 @@ def resend_reservation_otp(request):
 
     # Generate new OTP
     otp_code = reservation.generate_email_otp()
-    reservation.save()
 
     # Send OTP email
     email_sent = send_otp_email(
@@ -193,6 +229,7 @@ def resend_reservation_otp(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([GuestLookupIPThrottle, GuestLookupEmailThrottle])
 def lookup_reservation(request):
     """
     Look up a reservation by verification code and email.
@@ -217,7 +254,7 @@ def lookup_reservation(request):
     try:
         reservation = Reservation.objects.get(
             verification_code=verification_code,
-            email__iexact=email
+            email=normalize_email(email)
         )
     except Reservation.DoesNotExist:
         return Response({
@@ -233,6 +270,7 @@ def lookup_reservation(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([GuestLookupIPThrottle, GuestLookupEmailThrottle])
 def cancel_reservation(request):
     """
     Cancel a reservation by verification code and email.
@@ -257,7 +295,7 @@ def cancel_reservation(request):
     try:
         reservation = Reservation.objects.get(
             verification_code=verification_code,
-            email__iexact=email
+            email=normalize_email(email)
         )
     except Reservation.DoesNotExist:
         return Response({
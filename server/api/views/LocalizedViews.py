@@ -6,22 +6,47 @@ These endpoints support ?locale=sq|en query parameter.
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 
 from ..models import (
-    Event, GalleryItem, MenuCategory, MenuItem,
-    HomeSection, StaticContent, RestaurantInfo, Translation
+    Event, GalleryItem, MenuCategory, MenuItem, Moment,
+    HomeSection, StaticContent, RestaurantInfo, Translation,
+    PREFETCHED_TRANSLATIONS_ATTR, published_translations_prefetch
 )
 from ..serializers import (
     LocalizedEventSerializer, LocalizedGalleryItemSerializer,
     LocalizedMenuCategorySerializer, LocalizedMenuItemSerializer,
     LocalizedHomeSectionSerializer, HomeSectionSerializer,
-    StaticContentSerializer, RestaurantInfoSerializer, TranslationSerializer
+    StaticContentSerializer, RestaurantInfoSerializer, TranslationSerializer,
+    PublicEventSerializer, PublicMomentSerializer, TranslationBulkUpsertSerializer,
+    TranslationPublishSerializer, TranslationBulkStatusSerializer, IdListSerializer
 )
+from ..db_routers import read_from_replica
 from ..services.translation_service import get_translation_service
+from ..services.catalog_translation import (
+    CATALOG_MODELS, TRANSLATION_UNIQUE_FIELDS, TRANSLATION_UPDATE_FIELDS
+)
+from ..services.translation_memory import learn_from_translations
+from ..services.translation_coverage import coverage_summary, missing_fields_report
+from ..signals import notify_content_changed
+from ..tasks import auto_translate_catalog
+from .EventViews import FEATURED_EVENTS_LIMIT, UPCOMING_EVENTS_LIMIT, featured_events, upcoming_events
+from .ViewMixins import ReplicaReadMixin, SparseFieldsetMixin
+
+
+def parse_content_type(content_type_str):
+    """Resolve an 'app_label.model' string, returning None if invalid"""
+    try:
+        app_label, model = content_type_str.split('.')
+        return ContentType.objects.get(app_label=app_label, model=model)
+    except (AttributeError, ValueError, ContentType.DoesNotExist):
+        return None
 
 
 class LocaleMixin:
@@ -45,7 +70,7 @@ class LocaleMixin:
 # PUBLIC LOCALIZED ENDPOINTS
 # =============================================================================
 
-class PublicEventViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
+class PublicEventViewSet(ReplicaReadMixin, SparseFieldsetMixin, LocaleMixin, viewsets.ReadOnlyModelViewSet):
     """Public events endpoint with locale support"""
     serializer_class = LocalizedEventSerializer
     permission_classes = [AllowAny]
@@ -71,7 +96,7 @@ class PublicEventViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
         return queryset.order_by('display_order', 'start_date')
 
 
-class PublicGalleryViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
+class PublicGalleryViewSet(ReplicaReadMixin, SparseFieldsetMixin, LocaleMixin, viewsets.ReadOnlyModelViewSet):
     """Public gallery endpoint with locale support"""
     serializer_class = LocalizedGalleryItemSerializer
     permission_classes = [AllowAny]
@@ -92,7 +117,7 @@ class PublicGalleryViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
         return queryset.order_by('display_order', '-created_at')
 
 
-class PublicMenuViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
+class PublicMenuViewSet(ReplicaReadMixin, SparseFieldsetMixin, LocaleMixin, viewsets.ReadOnlyModelViewSet):
     """Public menu endpoint with locale support"""
     serializer_class = LocalizedMenuCategorySerializer
     permission_classes = [AllowAny]
@@ -111,12 +136,13 @@ class PublicMenuViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
 
         serializer = LocalizedMenuItemSerializer(
             featured_items, many=True,
-            context={'request': request, 'locale': locale}
+            context={'request': request, 'locale': locale},
+            **self.get_sparse_fields()
         )
         return Response(serializer.data)
 
 
-class PublicHomeSectionViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
+class PublicHomeSectionViewSet(ReplicaReadMixin, SparseFieldsetMixin, LocaleMixin, viewsets.ReadOnlyModelViewSet):
     """Public home sections endpoint with locale support"""
     serializer_class = LocalizedHomeSectionSerializer
     permission_classes = [AllowAny]
@@ -147,7 +173,8 @@ class PublicHomeSectionViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
             )
             serializer = LocalizedHomeSectionSerializer(
                 section,
-                context={'request': request, 'locale': locale}
+                context={'request': request, 'locale': locale},
+                **self.get_sparse_fields()
             )
             return Response(serializer.data)
         except HomeSection.DoesNotExist:
@@ -161,18 +188,9 @@ class PublicHomeSectionViewSet(LocaleMixin, viewsets.ReadOnlyModelViewSet):
 # PUBLIC INFO ENDPOINTS (Function-based)
 # =============================================================================
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def public_restaurant_info(request):
-    """Get restaurant info with locale support"""
-    locale = request.query_params.get('locale', 'sq')
-    if locale not in ['sq', 'en']:
-        locale = 'sq'
-
-    info = RestaurantInfo.get_info()
-
-    # Build response with translations
-    data = {
+def restaurant_info_data(info, locale):
+    """Localized public representation of RestaurantInfo"""
+    return {
         'name': info.get_translation('name', locale) or info.name,
         'tagline': info.get_translation('tagline', locale) or info.tagline,
         'description': info.get_translation('description', locale) or info.description,
@@ -197,11 +215,92 @@ def public_restaurant_info(request):
         }
     }
 
-    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@read_from_replica()
+def public_restaurant_info(request):
+    """Get restaurant info with locale support"""
+    locale = request.query_params.get('locale', 'sq')
+    if locale not in ['sq', 'en']:
+        locale = 'sq'
+
+    info = RestaurantInfo.get_info()
+    return Response(restaurant_info_data(info, locale))
+
+
+# Number of items of each kind included in the home page bundle. Events
+# match /events/featured/ and /events/upcoming/, which the bundle replaces.
+HOME_BUNDLE_LIMITS = {
+    'featured_events': FEATURED_EVENTS_LIMIT,
+    'upcoming_events': UPCOMING_EVENTS_LIMIT,
+    'moments': 12,
+    'featured_menu_items': 8,
+    'gallery_preview': 8,
+}
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@read_from_replica()
+def public_home_bundle(request):
+    """
+    Everything the home page needs in a single response: home sections,
+    featured and upcoming events, moments, featured menu items, a gallery
+    preview and restaurant info. Events are exactly what /events/featured/
+    and /events/upcoming/ return; translations for the other lists are
+    prefetched in one query per model.
+    """
+    locale = request.query_params.get('locale', 'sq')
+    if locale not in ['sq', 'en']:
+        locale = 'sq'
+
+    context = {'request': request, 'locale': locale}
+    translations = published_translations_prefetch(locale)
+    limits = HOME_BUNDLE_LIMITS
+
+    sections = HomeSection.objects.filter(
+        is_active=True, is_published=True
+    ).order_by('display_order').prefetch_related(translations)
+
+    moments = Moment.objects.filter(is_active=True).order_by(
+        'display_order', '-created_at'
+    )[:limits['moments']]
+
+    menu_items = MenuItem.objects.filter(
+        is_available=True, is_featured=True
+    ).select_related('category').prefetch_related(
+        'variants',
+        translations,
+        published_translations_prefetch(locale, 'category__translations'),
+    ).order_by('display_order')[:limits['featured_menu_items']]
+
+    gallery = GalleryItem.objects.filter(is_active=True).order_by(
+        '-is_featured', 'display_order', '-created_at'
+    ).prefetch_related(translations)[:limits['gallery_preview']]
+
+    info = RestaurantInfo.get_info()
+    setattr(info, PREFETCHED_TRANSLATIONS_ATTR, list(
+        info.translations.filter(locale=locale, status='published')
+    ))
+
+    return Response({
+        'locale': locale,
+        'home_sections': LocalizedHomeSectionSerializer(sections, many=True, context=context).data,
+        'featured_events': PublicEventSerializer(featured_events(), many=True, context=context).data,
+        'upcoming_events': PublicEventSerializer(
+            upcoming_events()[:limits['upcoming_events']], many=True, context=context
+        ).data,
+        'moments': PublicMomentSerializer(moments, many=True, context=context).data,
+        'featured_menu_items': LocalizedMenuItemSerializer(menu_items, many=True, context=context).data,
+        'gallery_preview': LocalizedGalleryItemSerializer(gallery, many=True, context=context).data,
+        'restaurant_info': restaurant_info_data(info, locale),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@read_from_replica()
 def public_page_content(request, page_slug):
     """Get static page content with locale support"""
     locale = request.query_params.get('locale', 'sq')
@@ -266,6 +365,20 @@ class TranslationViewSet(viewsets.ModelViewSet):
 
         return queryset.order_by('content_type', 'object_id', 'locale', 'field_name')
 
+    def perform_create(self, serializer):
+        translation = serializer.save()
+        learn_from_translations([translation])
+
+    def perform_update(self, serializer):
+        previous_text = serializer.instance.translated_text
+        translation = serializer.save()
+        # An edited auto-translation becomes a human translation
+        if translation.translated_text != previous_text and translation.translated_by.startswith('auto:'):
+            translation.translated_by = self.request.user.username
+            translation.is_auto_translated = False
+            translation.save(update_fields=['translated_by', 'is_auto_translated', 'updated_at'])
+        learn_from_translations([translation])
+
     @action(detail=False, methods=['post'])
     def bulk_create(self, request):
         """Bulk create translations for an object"""
@@ -280,56 +393,163 @@ class TranslationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        from django.contrib.contenttypes.models import ContentType
-        try:
-            app_label, model = content_type_str.split('.')
-            content_type = ContentType.objects.get(app_label=app_label, model=model)
-        except (ValueError, ContentType.DoesNotExist):
+        content_type = parse_content_type(content_type_str)
+        if content_type is None:
             return Response(
                 {'error': 'Invalid content_type format. Use app_label.model'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        created = []
-        for field_name, translated_text in translations.items():
-            obj, was_created = Translation.objects.update_or_create(
-                content_type=content_type,
-                object_id=object_id,
-                locale=locale,
-                field_name=field_name,
-                defaults={
-                    'translated_text': translated_text,
-                    'status': 'draft',
-                    'translated_by': request.user.username
-                }
-            )
-            created.append({
-                'id': str(obj.id),
+        rows = [
+            {
+                'content_type': content_type,
+                'object_id': object_id,
                 'field_name': field_name,
-                'was_created': was_created
-            })
+                'translated_text': translated_text,
+            }
+            for field_name, translated_text in translations.items()
+        ]
+        created = self._upsert_translations(rows, locale, 'draft', request.user.username)
 
         return Response({'created': created}, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'])
-    def publish(self, request):
-        """Publish translations for an object"""
-        object_id = request.data.get('object_id')
-        locale = request.data.get('locale')
+    def bulk_upsert(self, request):
+        """
+        Create or update translations for many objects in one statement.
+
+        Request body:
+            - locale: str
+            - status: str (default 'draft')
+            - translations: list of {content_type, object_id, field_name, translated_text}
+        """
+        serializer = TranslationBulkUpsertSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        locale = serializer.validated_data['locale']
+        new_status = serializer.validated_data['status']
+        rows = serializer.validated_data['translations']
+
+        saved = self._upsert_translations(rows, locale, new_status, request.user.username)
+        return Response({'saved': saved, 'count': len(saved)})
+
+    def _upsert_translations(self, rows, locale, new_status, translated_by):
+        """
+        Insert or update translation rows with a single upsert inside one
+        transaction and emit one content change event for the batch.
+        """
+        # Keep the last value when the same field is sent twice
+        unique_rows = {}
+        for row in rows:
+            unique_rows[(row['content_type'].pk, str(row['object_id']), row['field_name'])] = row
+        rows = list(unique_rows.values())
+
+        with transaction.atomic():
+            existing = {
+                (content_type_id, str(object_id), field_name): pk
+                for pk, content_type_id, object_id, field_name in Translation.objects.filter(
+                    locale=locale,
+                    content_type__in={row['content_type'] for row in rows},
+                    object_id__in={row['object_id'] for row in rows},
+                    field_name__in={row['field_name'] for row in rows},
+                ).values_list('pk', 'content_type_id', 'object_id', 'field_name')
+            }
 
-        if not all([object_id, locale]):
-            return Response(
-                {'error': 'object_id and locale are required'},
-                status=status.HTTP_400_BAD_REQUEST
+            objs = [
+                Translation(
+                    content_type=row['content_type'],
+                    object_id=row['object_id'],
+                    locale=locale,
+                    field_name=row['field_name'],
+                    translated_text=row['translated_text'],
+                    status=new_status,
+                    is_auto_translated=False,
+                    translated_by=translated_by,
+                )
+                for row in rows
+            ]
+            Translation.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=TRANSLATION_UNIQUE_FIELDS,
+                update_fields=TRANSLATION_UPDATE_FIELDS,
+            )
+
+            notify_content_changed(
+                Translation,
+                [row['content_type'].model_class() for row in rows],
+                object_ids=[row['object_id'] for row in rows],
+                locales=[locale],
             )
 
-        updated = Translation.objects.filter(
-            object_id=object_id,
-            locale=locale
-        ).update(status='published')
+        if new_status in ('approved', 'published'):
+            learn_from_translations(objs)
 
+        saved = []
+        for obj in objs:
+            key = (obj.content_type_id, str(obj.object_id), obj.field_name)
+            saved.append({
+                'id': str(existing.get(key, obj.id)),
+                'content_type': f"{obj.content_type.app_label}.{obj.content_type.model}",
+                'object_id': str(obj.object_id),
+                'field_name': obj.field_name,
+                'was_created': key not in existing
+            })
+        return saved
+
+    @action(detail=False, methods=['post'])
+    def publish(self, request):
+        """Publish the translations of one object (body: content_type, object_id, locale)"""
+        serializer = TranslationPublishSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        updated = self._set_status(data['content_type'], [data['object_id']], data['locale'], 'published')
         return Response({'updated_count': updated})
 
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        Change the status of translations for many objects in one UPDATE.
+
+        Request body:
+            - locale: str
+            - status: str (e.g. 'published' or 'draft' to unpublish)
+            - content_type: str app_label.model
+            - object_ids: list of object ids
+            - fields: list of field names (optional, default all)
+        """
+        serializer = TranslationBulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        updated = self._set_status(
+            data['content_type'], data['object_ids'], data['locale'], data['status'],
+            field_names=data.get('fields')
+        )
+        return Response({'updated_count': updated, 'status': data['status']})
+
+    def _set_status(self, content_type, object_ids, locale, new_status, field_names=None):
+        """Update translation status with a single UPDATE and one change event"""
+        translations = Translation.objects.filter(
+            content_type=content_type, object_id__in=object_ids, locale=locale
+        )
+        if field_names:
+            translations = translations.filter(field_name__in=field_names)
+
+        with transaction.atomic():
+            updated = translations.update(status=new_status, updated_at=timezone.now())
+            if updated:
+                notify_content_changed(
+                    Translation, [content_type.model_class()], object_ids=object_ids, locales=[locale]
+                )
+
+        if updated and new_status in ('approved', 'published'):
+            learn_from_translations(translations)
+        return updated
+
     @action(detail=False, methods=['post'])
     def auto_translate(self, request):
         """Auto-translate content from source to target locale"""
@@ -400,8 +620,138 @@ class TranslationViewSet(viewsets.ModelViewSet):
             'translations': saved
         })
 
+    @action(detail=False, methods=['post'])
+    def auto_translate_catalog(self, request):
+        """
+        Start a background job that auto-translates every missing or stale
+        field of the catalog into target_locale.
+
+        Request body:
+            - target_locale: str (default 'en')
+            - source_locale: str (default 'sq')
+            - models: list of model names (optional, default all catalog models)
+            - include_stale: bool (default true)
+        """
+        source_locale = request.data.get('source_locale', 'sq')
+        target_locale = request.data.get('target_locale', 'en')
+        models = request.data.get('models') or None
+        try:
+            include_stale = BooleanField().to_internal_value(request.data.get('include_stale', True))
+        except ValidationError:
+            return Response(
+                {'error': 'include_stale must be true or false'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        locales = dict(Translation.LOCALE_CHOICES)
+        if source_locale not in locales or target_locale not in locales:
+            return Response(
+                {'error': f"Locales must be one of: {', '.join(locales)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if source_locale == target_locale:
+            return Response(
+                {'error': 'source_locale and target_locale must be different'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if models is not None:
+            unknown = [name for name in models if name not in CATALOG_MODELS]
+            if unknown:
+                return Response(
+                    {'error': f"Unknown models: {', '.join(unknown)}. "
+                              f"Choose from: {', '.join(CATALOG_MODELS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        task = auto_translate_catalog.delay(
+            target_locale,
+            source_locale=source_locale,
+            models=models,
+            include_stale=include_stale
+        )
+
+        return Response({
+            'task_id': task.id,
+            'status': 'queued',
+            'target_locale': target_locale,
+            'models': models or list(CATALOG_MODELS),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'])
+    def auto_translate_catalog_status(self, request):
+        """Report progress of a catalog auto-translation job (?task_id=)"""
+        task_id = request.query_params.get('task_id')
+        if not task_id:
+            return Response(
+                {'error': 'task_id parameter required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = auto_translate_catalog.AsyncResult(task_id)
+        data = {'task_id': task_id, 'status': result.state.lower()}
+
+        if result.state == 'PROGRESS':
+            data['progress'] = result.info
+        elif result.successful():
+            data['result'] = result.result
+        elif result.failed():
+            data['error'] = str(result.result)
+
+        return Response(data)
+
+    def _coverage_params(self, request):
+        """Validate ?locale= and ?model= for the coverage reports"""
+        locale = request.query_params.get('locale', 'en')
+        model_name = request.query_params.get('model')
+
+        if locale not in dict(Translation.LOCALE_CHOICES):
+            return None, None, Response(
+                {'error': f"Locale must be one of: {', '.join(dict(Translation.LOCALE_CHOICES))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if model_name and model_name not in CATALOG_MODELS:
+            return None, None, Response(
+                {'error': f"Unknown model: {model_name}. Choose from: {', '.join(CATALOG_MODELS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        models = [CATALOG_MODELS[model_name]] if model_name else list(CATALOG_MODELS.values())
+        return locale, models, None
+
+    @action(detail=False, methods=['get'])
+    def coverage(self, request):
+        """
+        Translation coverage per model for a locale.
+        Query params: locale (default 'en'), model (optional)
+        """
+        locale, models, error = self._coverage_params(request)
+        if error:
+            return error
+        return Response({
+            'locale': locale,
+            'models': [coverage_summary(model, locale) for model in models],
+        })
+
+    @action(detail=False, methods=['get'])
+    def missing_fields(self, request):
+        """
+        Objects whose translatable fields are missing or unpublished in a locale.
+        Query params: locale (default 'en'), model (optional)
+        """
+        locale, models, error = self._coverage_params(request)
+        if error:
+            return error
+        return Response({
+            'locale': locale,
+            'models': {
+                model._meta.model_name: missing_fields_report(model, locale)
+                for model in models
+            },
+        })
+
 
-class HomeSectionAdminViewSet(viewsets.ModelViewSet):
+class HomeSectionAdminViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Admin viewset for managing home sections"""
     serializer_class = HomeSectionSerializer
     permission_classes = [IsAuthenticated]
@@ -424,8 +774,38 @@ class HomeSectionAdminViewSet(viewsets.ModelViewSet):
         section.save()
         return Response({'status': 'unpublished'})
 
+    @action(detail=False, methods=['post'])
+    def bulk_publish(self, request):
+        """Publish many home sections in one UPDATE (body: {"ids": [...]})"""
+        return self._bulk_set_published(request, True)
+
+    @action(detail=False, methods=['post'])
+    def bulk_unpublish(self, request):
+        """Unpublish many home sections in one UPDATE (body: {"ids": [...]})"""
+        return self._bulk_set_published(request, False)
+
+    def _bulk_set_published(self, request, is_published):
+        serializer = IdListSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data['ids']
+
+        changes = {'is_published': is_published, 'updated_at': timezone.now()}
+        if is_published:
+            changes['published_at'] = timezone.now()
+
+        with transaction.atomic():
+            updated = HomeSection.objects.filter(pk__in=ids).update(**changes)
+            if updated:
+                notify_content_changed(HomeSection, [HomeSection], object_ids=ids)
+
+        return Response({
+            'status': 'published' if is_published else 'unpublished',
+            'updated_count': updated
+        })
+
 
-class StaticContentAdminViewSet(viewsets.ModelViewSet):
+class StaticContentAdminViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Admin viewset for managing static content"""
     serializer_class = StaticContentSerializer
     permission_classes = [IsAuthenticated]
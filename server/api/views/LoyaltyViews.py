@@ -7,19 +7,27 @@ from django.utils import timezone
 from django.db.models import Q, Sum
 from decimal import Decimal
 from ..models import CustomerProfile, VIPMembership, Offer, Waitlist, Reservation
+from ..services.search import search_queryset
+from .ViewMixins import ExportMixin
 from ..serializers import (
     CustomerProfileSerializer, VIPMembershipSerializer, OfferSerializer,
     WaitlistSerializer
 )
 
 
-class CustomerProfileViewSet(viewsets.ModelViewSet):
+class CustomerProfileViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for customer profiles and loyalty management
     """
     queryset = CustomerProfile.objects.all()
     serializer_class = CustomerProfileSerializer
     permission_classes = [IsAuthenticated]
+    export_name = 'customers'
+    export_columns = (
+        'id', 'email', 'phone', 'first_name', 'last_name', 'tier', 'points', 'lifetime_visits',
+        'lifetime_spent', 'is_vip', 'is_blacklisted', 'sms_notifications', 'email_notifications',
+        'dietary_preferences', 'created_at',
+    )
 
     def get_queryset(self):
         queryset = CustomerProfile.objects.all()
@@ -34,15 +42,10 @@ class CustomerProfileViewSet(viewsets.ModelViewSet):
         if is_vip is not None:
             queryset = queryset.filter(is_vip=is_vip.lower() == 'true')
 
-        # Search by email or phone
+        # Search by name, email or phone (prefix match on every term)
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(email__icontains=search) |
-                Q(phone__icontains=search) |
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search)
-            )
+            queryset = search_queryset(queryset, search)
 
         return queryset.order_by('-lifetime_spent', '-lifetime_visits')
 
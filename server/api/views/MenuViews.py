@@ -20,12 +20,14 @@ from api.serializers import (
     MenuItemSerializer, PublicMenuItemSerializer,
     MenuItemVariantSerializer, SubcategorySerializer
 )
+from .ViewMixins import KeysetListMixin, SparseFieldsetMixin
 
 
-class MenuCategoryViewSet(viewsets.ModelViewSet):
+class MenuCategoryViewSet(KeysetListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = MenuCategory.objects.all()
     serializer_class = MenuCategorySerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)
+    keyset_ordering = ('display_order', 'name', 'id')
 
     def get_permissions(self):
         """Public access for list/retrieve, admin only for create/update/delete"""
@@ -66,6 +68,12 @@ class MenuCategoryViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(category_type=category_type)
 
         queryset = queryset.order_by('display_order', 'name')
+
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -76,7 +84,10 @@ class MenuCategoryViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             queryset = queryset.filter(is_active=True)
         queryset = queryset.order_by('display_order', 'name')
-        serializer = MenuCategorySerializer(queryset, many=True, context={'request': request})
+        queryset = queryset.prefetch_related(*self._nested_prefetches())
+        serializer = MenuCategorySerializer(
+            queryset, many=True, context={'request': request}, **self.get_sparse_fields()
+        )
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
@@ -100,7 +111,7 @@ class MenuCategoryViewSet(viewsets.ModelViewSet):
             is_active=True,
             parent__isnull=True  # Only top-level categories
         ).prefetch_related(
-            'menu_items', 'subcategories', 'subcategories__menu_items'
+            *self._nested_prefetches()
         ).order_by('display_order', 'name')
 
         category_type = request.query_params.get('category_type')
@@ -110,10 +121,20 @@ class MenuCategoryViewSet(viewsets.ModelViewSet):
         serializer = PublicMenuCategorySerializer(
             queryset,
             many=True,
-            context={'request': request}
+            context={'request': request},
+            **self.get_sparse_fields()
         )
         return Response(serializer.data)
 
+    def _nested_prefetches(self):
+        """Prefetches for the nested fields this request will render"""
+        prefetches = []
+        if self.wants_field('menu_items'):
+            prefetches.append('menu_items')
+        if self.wants_field('subcategories'):
+            prefetches.extend(['subcategories', 'subcategories__menu_items'])
+        return prefetches
+
     @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated])
     def toggle_active(self, request, pk=None):
         """Toggle active status of menu category"""
@@ -130,10 +151,11 @@ class MenuCategoryViewSet(viewsets.ModelViewSet):
             )
 
 
-class MenuItemViewSet(viewsets.ModelViewSet):
+class MenuItemViewSet(KeysetListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = MenuItem.objects.all()
     serializer_class = MenuItemSerializer
     parser_classes = (MultiPartParser, FormParser, JSONParser)
+    keyset_ordering = ('category__display_order', 'display_order', 'name', 'id')
     
     def get_permissions(self):
         """Public access for list/retrieve, admin only for create/update/delete"""
@@ -194,6 +216,11 @@ class MenuItemViewSet(viewsets.ModelViewSet):
             'category__display_order', 'display_order', 'name'
         )
         
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -203,7 +230,9 @@ class MenuItemViewSet(viewsets.ModelViewSet):
         queryset = MenuItem.objects.filter(
             is_available=True,
             category__is_active=True
-        ).select_related('category').prefetch_related('variants')
+        ).select_related('category')
+        if self.wants_field('variants'):
+            queryset = queryset.prefetch_related('variants')
         
         # Apply same filtering as list
         category_type = request.query_params.get('category_type')
@@ -234,7 +263,8 @@ class MenuItemViewSet(viewsets.ModelViewSet):
         serializer = PublicMenuItemSerializer(
             queryset, 
             many=True, 
-            context={'request': request}
+            context={'request': request},
+            **self.get_sparse_fields()
         )
         return Response(serializer.data)
     
@@ -0,0 +1,34 @@
+# server/api/views/MetricsViews.py
+"""
+Prometheus scrape endpoint.
+"""
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from ..services.metrics import render_metrics
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics_view(request):
+    """
+    GET /metrics
+    Metrics in the Prometheus text format. When METRICS_AUTH_TOKEN is set,
+    scrapers must send it as "Authorization: Bearer <token>". Without a
+    token only METRICS_ALLOWED_IPS and logged-in staff may read them.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+
+    token = settings.METRICS_AUTH_TOKEN
+    if token:
+        if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    elif not (request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS or request.user.is_staff):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
@@ -8,6 +8,7 @@ from django.shortcuts import get_object_or_404
 
 from ..models import Moment
 from ..serializers import MomentSerializer, PublicMomentSerializer
+from .ViewMixins import ReplicaReadMixin, SparseFieldsetMixin
 
 
 class MomentViewSet(viewsets.ModelViewSet):
@@ -87,7 +88,7 @@ class MomentViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Moments reordered successfully'})
 
 
-class PublicMomentViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicMomentViewSet(ReplicaReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public ViewSet for viewing active Moments.
 
@@ -0,0 +1,58 @@
+# server/api/views/ProfilingViews.py
+"""
+Staff endpoints for sampled request profiles (see api/services/profiling.py).
+"""
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..services.profiling import list_traces, make_profile_token, trace_path
+
+
+def ensure_profiling_enabled():
+    if not settings.PROFILING_ENABLED:
+        raise Http404('Profiling is disabled')
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def profile_token(request):
+    """
+    POST /api/admin/profiles/token/
+    Issue a signed token; requests sent with it (X-Profile-Token header or
+    ?__profile=<token>) are profiled until it expires.
+    """
+    ensure_profiling_enabled()
+    return Response({
+        'token': make_profile_token(request.user),
+        'expires_in': settings.PROFILING_TOKEN_MAX_AGE,
+        'header': 'X-Profile-Token',
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_list(request):
+    """
+    GET /api/admin/profiles/
+    Stored traces, newest first.
+    """
+    ensure_profiling_enabled()
+    return Response({'profiles': list_traces()})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_download(request, name):
+    """
+    GET /api/admin/profiles/<name>/
+    Download one trace (.prof for cProfile, .html for pyinstrument).
+    """
+    ensure_profiling_enabled()
+    path = trace_path(name)
+    if path is None:
+        raise Http404('Profile not found')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -2,7 +2,7 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -19,21 +19,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from api.db_routers import read_from_replica
 from api.models import (
-    Reservation,ContactMessage
+    Reservation,ContactMessage,RestaurantSettings,normalize_email
 )
 
 
 from api.serializers import ContactMessageSerializer, ReservationSerializer
-
-class ContactMessageViewSet(viewsets.ModelViewSet):
+from api.pagination import KeysetPagination
+from api.services.search import search_queryset
+from api.services.booking import SlotUnavailable, book_reservation, slot_bounds, slot_usage
+from api.services.reservation_calendar import month_calendar
+from api.throttling import GuestLookupEmailThrottle, GuestLookupIPThrottle
+from api.views.ViewMixins import ExportMixin
+
+class ContactMessageViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
+    export_name = 'contact-messages'
+    export_columns = (
+        'id', 'created_at', 'name', 'email', 'phone', 'subject', 'event_type', 'event_date',
+        'guest_count', 'message', 'is_read', 'is_replied',
+    )
     
     def get_permissions(self):
         """Allow creation without authentication"""
         if self.action == 'create':
             permission_classes = [AllowAny]
+        elif self.action == 'export':
+            permission_classes = [IsAdminUser]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
@@ -54,16 +70,29 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
+    export_name = 'reservations'
+    export_columns = (
+        'id', 'verification_code', 'date', 'time', 'party_size', 'status', 'first_name', 'last_name',
+        'email', 'phone', 'occasion', 'special_requests', 'dietary_restrictions', 'email_verified',
+        'preferred_locale', 'created_at', 'updated_at',
+    )
+    # Only UUIDs are reservation ids, so reservations/guest/, verify-otp/ etc.
+    # reach their own views instead of the detail route
+    lookup_value_regex = '[0-9a-f-]{36}'
     
     def get_permissions(self):
         """Allow creation without authentication, but require auth for other operations"""
         if self.action == 'create':
             permission_classes = [AllowAny]
-        elif self.action in ['lookup', 'retrieve']:
+        elif self.action in ['lookup', 'retrieve', 'calendar']:
             permission_classes = [AllowAny]
+        elif self.action == 'export':
+            permission_classes = [IsAdminUser]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
@@ -106,16 +135,11 @@ class ReservationViewSet(viewsets.ModelViewSet):
         
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(email__icontains=search) |
-                Q(phone__icontains=search)
-            )
+            queryset = search_queryset(queryset, search)
         
         email = self.request.query_params.get('email')
         if email:
-            queryset = queryset.filter(email__iexact=email)
+            queryset = queryset.filter(email=normalize_email(email))
         
         phone = self.request.query_params.get('phone')
         if phone:
@@ -123,11 +147,26 @@ class ReservationViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('-created_at')
 
+    def create(self, request, *args, **kwargs):
+        try:
+            return super().create(request, *args, **kwargs)
+        except SlotUnavailable as e:
+            return Response({'error': str(e), 'code': 'slot_unavailable'}, status=status.HTTP_409_CONFLICT)
+
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except SlotUnavailable as e:
+            return Response({'error': str(e), 'code': 'slot_unavailable'}, status=status.HTTP_409_CONFLICT)
+
     def perform_create(self, serializer):
-        """Create reservation and send confirmation email"""
-        reservation = serializer.save()
+        """Create reservation (if the slot has room) and send confirmation email"""
+        reservation = book_reservation(serializer)
         self.send_confirmation_email(reservation)
 
+    def perform_update(self, serializer):
+        book_reservation(serializer)
+
     def send_confirmation_email(self, reservation):
         """Send reservation confirmation email to customer"""
         try:
@@ -272,6 +311,8 @@ Sunlake Villa Team
                 )
             
             # Generate time slots (example: 5:00 PM to 10:00 PM)
+            restaurant = RestaurantSettings.get_settings()
+            usage = slot_usage(requested_date, restaurant)
             slots = []
             start_hour = 17  # 5 PM
             end_hour = 22    # 10 PM
@@ -284,21 +325,18 @@ Sunlake Villa Team
                     slot_time = time(hour, minute)
                     time_display = slot_time.strftime('%I:%M %p')
                     
-                    # Check existing reservations
-                    existing_reservations = Reservation.objects.filter(
-                        date=requested_date,
-                        time=slot_time,
-                        status__in=['confirmed', 'seated', 'pending']
-                    ).count()
-                    
-                    # Simple availability logic (max 5 tables per slot)
-                    available = existing_reservations < 5
+                    # Same limits the booking path enforces (services/booking.py)
+                    slot_start, _ = slot_bounds(requested_date, slot_time, restaurant.slot_interval_minutes)
+                    booked = usage.get(slot_start, {'tables': 0, 'seats': 0})
+                    seats_left = max(restaurant.max_capacity - booked['seats'], 0)
+                    available = booked['tables'] < restaurant.max_tables_per_slot and seats_left > 0
                     
                     slots.append({
                         'time': slot_time.strftime('%H:%M'),
                         'time_display': time_display,
                         'available': available,
-                        'existing_reservations': existing_reservations
+                        'existing_reservations': booked['tables'],
+                        'seats_left': seats_left
                     })
             
             return Response([{
@@ -313,6 +351,38 @@ Sunlake Villa Team
             )
     
     @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """Availability level of every day in a month for a party size"""
+        restaurant = RestaurantSettings.get_settings()
+        month_str = request.query_params.get('month') or timezone.localdate().strftime('%Y-%m')
+        try:
+            month = datetime.strptime(month_str, '%Y-%m')
+        except ValueError:
+            return Response(
+                {'error': 'Invalid month format. Use YYYY-MM'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            party_size = int(request.query_params.get('party_size', 2))
+        except ValueError:
+            return Response(
+                {'error': 'party_size must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not restaurant.min_party_size <= party_size <= restaurant.max_party_size:
+            return Response(
+                {'error': f'party_size must be between {restaurant.min_party_size} and {restaurant.max_party_size}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'month': month.strftime('%Y-%m'),
+            'party_size': party_size,
+            'days': month_calendar(month.year, month.month, party_size),
+        })
+
+    @action(detail=False, methods=['get'], throttle_classes=[GuestLookupIPThrottle, GuestLookupEmailThrottle])
     def lookup(self, request):
         """Look up reservations by email and phone"""
         email = request.query_params.get('email', '').lower()
@@ -325,7 +395,7 @@ Sunlake Villa Team
             )
         
         reservations = Reservation.objects.filter(
-            email__iexact=email,
+            email=normalize_email(email),
             phone=phone
         ).order_by('-created_at')
         
@@ -351,6 +421,7 @@ Sunlake Villa Team
         return Response(stats)
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    @read_from_replica()
     def dashboard(self, request):
         """Get dashboard data for admin panel"""
         today = timezone.now().date()
@@ -0,0 +1,71 @@
+# server/api/views/SearchViews.py
+"""
+Staff type-ahead search over reservations and customer profiles (see
+api/services/search.py).
+"""
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from ..models import CustomerProfile, Reservation
+from ..services.search import TYPEAHEAD_LIMIT, typeahead
+
+MAX_LIMIT = 50
+SEARCH_TYPES = ('reservations', 'customers', 'all')
+
+
+def reservation_result(reservation):
+    return {
+        'id': str(reservation.id),
+        'name': f"{reservation.first_name} {reservation.last_name}".strip(),
+        'email': reservation.email,
+        'phone': reservation.phone,
+        'date': reservation.date.isoformat(),
+        'time': reservation.time.strftime('%H:%M'),
+        'status': reservation.status,
+        'verification_code': reservation.verification_code,
+    }
+
+
+def customer_result(customer):
+    return {
+        'id': customer.id,
+        'name': f"{customer.first_name} {customer.last_name}".strip(),
+        'email': customer.email,
+        'phone': customer.phone,
+        'tier': customer.tier,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_search(request):
+    """
+    GET /api/admin/search/?q=<text>&type=reservations|customers|all&limit=10
+    Best matches first. Every term of q is matched as a prefix of a name,
+    email, phone number or verification code.
+    """
+    query = request.query_params.get('q', '').strip()
+    search_type = request.query_params.get('type', 'all')
+    if search_type not in SEARCH_TYPES:
+        return Response(
+            {'error': f"type must be one of: {', '.join(SEARCH_TYPES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = min(max(int(request.query_params.get('limit', TYPEAHEAD_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = {}
+    if search_type in ('reservations', 'all'):
+        reservations = Reservation.objects.only(
+            'id', 'first_name', 'last_name', 'email', 'phone', 'date', 'time', 'status', 'verification_code'
+        )
+        results['reservations'] = [reservation_result(r) for r in typeahead(reservations, query, limit)]
+    if search_type in ('customers', 'all'):
+        customers = CustomerProfile.objects.only('id', 'first_name', 'last_name', 'email', 'phone', 'tier')
+        results['customers'] = [customer_result(c) for c in typeahead(customers, query, limit)]
+    return Response({'query': query, **results})
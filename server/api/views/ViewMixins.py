@@ -0,0 +1,106 @@
+# server/api/views/ViewMixins.py
+"""
+Reusable viewset mixins.
+"""
+
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser
+from rest_framework.response import Response
+
+from ..db_routers import read_from_replica
+from ..pagination import KeysetPagination
+from ..serializers import DynamicFieldsMixin
+from ..services.exports import CONTENT_TYPES, export_response
+
+
+class SparseFieldsetMixin:
+    """
+    Support ?fields=a,b and ?omit=c,d on read requests.
+
+    get_serializer() passes them to serializers using DynamicFieldsMixin.
+    Actions that build serializers themselves pass **self.get_sparse_fields(),
+    and can use wants_field() to skip prefetches for fields that are not
+    rendered.
+    """
+
+    def get_sparse_fields(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return {}
+
+        sparse = {}
+        for param in ('fields', 'omit'):
+            value = request.query_params.get(param)
+            if value:
+                sparse[param] = [name.strip() for name in value.split(',') if name.strip()]
+        return sparse
+
+    def wants_field(self, field_name):
+        """Whether field_name will be rendered for this request"""
+        sparse = self.get_sparse_fields()
+        if 'fields' in sparse and field_name not in sparse['fields']:
+            return False
+        return field_name not in sparse.get('omit', [])
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, DynamicFieldsMixin):
+            for key, value in self.get_sparse_fields().items():
+                kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+
+class KeysetListMixin:
+    """
+    Opt-in keyset pagination for list() overrides that return whole tables.
+
+    Clients that send ?cursor= or ?page_size= get a {"next", "results"} page
+    ordered by keyset_ordering; other clients keep the unpaginated response.
+    """
+    keyset_ordering = None
+
+    def paginate_keyset(self, queryset):
+        if not KeysetPagination.is_requested(self.request):
+            return None
+        self.keyset_paginator = KeysetPagination()
+        return self.keyset_paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def get_keyset_response(self, data):
+        return self.keyset_paginator.get_paginated_response(data)
+
+
+class ReplicaReadMixin:
+    """Serve safe requests from a read replica (see api/db_routers.py)"""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ExportMixin:
+    """
+    GET <list url>/export/?output=csv|ndjson streams every row the list
+    filters select (see api/services/exports.py), staff only.
+
+    Viewsets that override get_permissions() must return IsAdminUser for the
+    'export' action themselves.
+    """
+    export_columns = ()
+    export_name = None
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        output = request.query_params.get('output', 'csv')
+        if output not in CONTENT_TYPES:
+            return Response(
+                {'error': f"output must be one of: {', '.join(CONTENT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self, 'keyset_ordering', None)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return export_response(queryset, self.export_columns, output, self.export_name or self.basename)
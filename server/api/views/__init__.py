@@ -13,7 +13,7 @@ from .AdminViews import (
 )
 # Phase 5: New API Views
 from .TableViews import FloorPlanViewSet, TableViewSet, TableAssignmentViewSet
-from .AuthViews import request_otp, verify_otp, resend_otp, OTPVerificationViewSet
+from .AuthViews import request_otp, verify_otp, resend_otp
 from .LoyaltyViews import (
     CustomerProfileViewSet,
     VIPMembershipViewSet,
@@ -32,6 +32,7 @@ from .LocalizedViews import (
     RestaurantInfoAdminViewSet,
     public_restaurant_info,
     public_page_content,
+    public_home_bundle,
 )
 # Guest Reservation Views
 from .GuestReservationViews import (
@@ -64,6 +65,14 @@ from .ClientPortalViews import (
 )
 # Moments Views
 from .MomentViews import MomentViewSet, PublicMomentViewSet
+# Metrics
+from .MetricsViews import metrics_view
+# Profiling
+from .ProfilingViews import profile_token, profile_list, profile_download
+# Search
+from .SearchViews import admin_search
+# Exports
+from .ExportViews import export_client_messages, export_sms_notifications
 
 # Make all imports available when importing from views
 __all__ = [
@@ -85,7 +94,6 @@ __all__ = [
     'request_otp',
     'verify_otp',
     'resend_otp',
-    'OTPVerificationViewSet',
     'CustomerProfileViewSet',
     'VIPMembershipViewSet',
     'OfferViewSet',
@@ -101,6 +109,7 @@ __all__ = [
     'RestaurantInfoAdminViewSet',
     'public_restaurant_info',
     'public_page_content',
+    'public_home_bundle',
     # Client messaging
     'client_conversations',
     'conversation_messages',
@@ -115,4 +124,15 @@ __all__ = [
     # Moments
     'MomentViewSet',
     'PublicMomentViewSet',
+    # Metrics
+    'metrics_view',
+    # Profiling
+    'profile_token',
+    'profile_list',
+    'profile_download',
+    # Search
+    'admin_search',
+    # Exports
+    'export_client_messages',
+    'export_sms_notifications',
 ]
\ No newline at end of file
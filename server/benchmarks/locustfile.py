@@ -0,0 +1,206 @@
+"""
+Friday-night peak load test.
+
+Seed data first, then run against a server started with the raised
+throttle rates from benchmarks/throttles.env:
+
+    python manage.py seed_benchmark_data --scale 1
+    set -a; . benchmarks/throttles.env; set +a
+    python manage.py runserver  # or gunicorn, in the same shell
+    pip install -r benchmarks/requirements.txt
+    locust -f benchmarks/locustfile.py --host http://localhost:8000 \
+        --users 200 --spawn-rate 20 --run-time 5m --headless
+
+Every simulated user comes from the Locust host, so with the default rates
+(guest_booking_ip is 20/hour) the guest booking scenario would mostly
+measure 429 responses. Throttled requests are counted as failures, a
+warning is logged at the end of the run, and the baseline records them
+per endpoint as 'throttled'.
+
+The user mix approximates a busy evening: most visitors browse the home
+page and menu, some check availability, a few book a table (guest
+reservation + OTP) and logged-in clients poll their support chat. When
+LOCUST_BASELINE is set, a JSON summary of every endpoint is written there
+at the end of the run for comparison with earlier baselines.
+"""
+import json
+import logging
+import os
+import random
+from datetime import date, datetime, timedelta
+
+from locust import HttpUser, between, events, task
+
+logger = logging.getLogger(__name__)
+
+API = '/api'
+LOCALES = ['sq', 'en']
+CATEGORY_TYPES = ['cocktails', 'beverages', 'wine', 'shisha', 'food']
+
+# Accounts created by seed_benchmark_data
+CLIENT_ACCOUNTS = int(os.environ.get('LOCUST_CLIENT_ACCOUNTS', '500'))
+CLIENT_PASSWORD = os.environ.get('LOCUST_CLIENT_PASSWORD', 'benchmark')
+
+
+# Requests answered with 429, per (name, method)
+throttled = {}
+
+
+def upcoming_date(max_days=14):
+    return (date.today() + timedelta(days=random.randint(0, max_days))).isoformat()
+
+
+class ClientLoginMixin:
+    """Log in as one of the seeded client accounts"""
+
+    def login(self):
+        email = f'bench-client-{random.randrange(CLIENT_ACCOUNTS)}@example.com'
+        with self.client.post(
+            f'{API}/client/login/', json={'email': email, 'password': CLIENT_PASSWORD},
+            name='client login', catch_response=True
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f'login failed: {response.status_code}')
+                return
+            token = response.json()['tokens']['access']
+            self.client.headers['Authorization'] = f'Bearer {token}'
+
+
+class MenuBrowser(HttpUser):
+    """Anonymous visitor browsing the site on their phone"""
+    weight = 12
+    wait_time = between(2, 8)
+
+    def on_start(self):
+        self.locale = random.choice(LOCALES)
+
+    @task(4)
+    def home(self):
+        self.client.get(f'{API}/public/home-bundle/', params={'locale': self.locale}, name='home bundle')
+
+    @task(6)
+    def menu(self):
+        self.client.get(f'{API}/public/menu/', params={'locale': self.locale}, name='public menu')
+
+    @task(3)
+    def menu_by_type(self):
+        self.client.get(
+            f'{API}/menu/items/public/', params={'category_type': random.choice(CATEGORY_TYPES)},
+            name='menu items by type'
+        )
+
+    @task(2)
+    def events(self):
+        self.client.get(
+            f'{API}/public/events/', params={'locale': self.locale, 'upcoming': 'true'},
+            name='public events'
+        )
+
+    @task(1)
+    def gallery(self):
+        self.client.get(f'{API}/public/gallery/', params={'locale': self.locale}, name='public gallery')
+
+
+class AvailabilityChecker(ClientLoginMixin, HttpUser):
+    """Client flicking through dates looking for a free table"""
+    weight = 4
+    wait_time = between(1, 4)
+
+    def on_start(self):
+        self.login()
+
+    @task
+    def availability(self):
+        self.client.get(
+            f'{API}/reservations/availability/', params={'start_date': upcoming_date()},
+            name='availability'
+        )
+
+
+class GuestBooker(HttpUser):
+    """Guest booking a table and confirming the emailed code"""
+    weight = 2
+    wait_time = between(5, 15)
+
+    @task
+    def book(self):
+        index = random.randrange(10 ** 9)
+        with self.client.post(f'{API}/reservations/guest/', json={
+            'first_name': 'Load',
+            'last_name': f'Test {index}',
+            'email': f'bench-guest-{index}@example.com',
+            'phone': f'+35568{index % 10 ** 7:07d}',
+            'date': upcoming_date(),
+            'time': random.choice(['19:00', '19:30', '20:00', '20:30', '21:00']),
+            'party_size': random.randint(2, 6),
+            'preferred_locale': random.choice(LOCALES),
+        }, name='guest reservation', catch_response=True) as response:
+            if response.status_code != 201:
+                response.failure(f'{response.status_code}: {response.text[:200]}')
+                return
+            reservation_id = response.json()['reservation_id']
+
+        # The real code is only in the email, so this exercises the
+        # verification path with a wrong code; 400 is the expected answer.
+        with self.client.post(f'{API}/reservations/verify-otp/', json={
+            'reservation_id': reservation_id, 'otp_code': '000000',
+        }, name='verify reservation otp', catch_response=True) as response:
+            if response.status_code in (200, 400):
+                response.success()
+
+
+class ChatPoller(ClientLoginMixin, HttpUser):
+    """Logged-in client with the support chat open (polls every few seconds)"""
+    weight = 2
+    wait_time = between(3, 5)
+
+    def on_start(self):
+        self.login()
+
+    @task(10)
+    def poll(self):
+        self.client.get(f'{API}/client/support-chat/messages/', name='support chat poll')
+
+    @task(1)
+    def send(self):
+        self.client.post(
+            f'{API}/client/support-chat/messages/', json={'content': 'Is the terrace open tonight?'},
+            name='support chat send'
+        )
+
+
+@events.request.add_listener
+def count_throttled(request_type, name, response, **kwargs):
+    if response is not None and getattr(response, 'status_code', None) == 429:
+        key = (name, request_type)
+        throttled[key] = throttled.get(key, 0) + 1
+
+
+@events.test_stop.add_listener
+def warn_if_throttled(environment, **kwargs):
+    if throttled:
+        logger.warning(
+            f"{sum(throttled.values())} requests were throttled (429); start the server "
+            "with benchmarks/throttles.env so the run measures the endpoints, not the limits"
+        )
+
+
+@events.quitting.add_listener
+def write_baseline(environment, **kwargs):
+    path = os.environ.get('LOCUST_BASELINE')
+    if not path:
+        return
+
+    results = {}
+    for (name, method), entry in environment.stats.entries.items():
+        results[f'{method} {name}'] = {
+            'requests': entry.num_requests,
+            'failures': entry.num_failures,
+            'rps': round(entry.total_rps, 2),
+            'median_ms': entry.get_response_time_percentile(0.5),
+            'p95_ms': entry.get_response_time_percentile(0.95),
+            'p99_ms': entry.get_response_time_percentile(0.99),
+            'throttled': throttled.get((name, method), 0),
+        }
+    with open(path, 'w') as f:
+        json.dump({'created_at': datetime.now().isoformat(), 'results': results}, f, indent=2, sort_keys=True)
@@ -8,6 +8,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 
+from api.views import metrics_view
+
 def api_root(request):
     return JsonResponse({
         'message': 'Restaurant API',
@@ -25,6 +27,7 @@ def api_root(request):
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),
     path('', api_root),
 ]
 